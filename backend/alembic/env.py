@@ -26,7 +26,8 @@ from app.modules.itineraries.models import Itinerary, ItineraryItem
 from app.modules.discounts.models import Discount
 from app.modules.pricing.models import PlatformPricingConfig
 from app.modules.employees.models import Business_Employee
-from app.modules.availability.models import ListingHours, ServiceSlots
+from app.modules.availability.models import ListingHours, ServiceSlots, SlotOccupancy
+from app.modules.recommendations.models import UserTasteSignal, UserTasteVector
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
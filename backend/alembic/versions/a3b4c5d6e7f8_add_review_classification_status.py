@@ -0,0 +1,49 @@
+"""Queue review classification behind a pending status
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, Sequence[str], None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+classification_statuses = postgresql.ENUM(
+    "pending", "classified", name="review_classification_statuses"
+)
+
+
+def upgrade() -> None:
+    classification_statuses.create(op.get_bind(), checkfirst=True)
+    # Existing reviews were classified inline when they were written
+    op.add_column(
+        "reviews",
+        sa.Column(
+            "classification_status",
+            postgresql.ENUM(name="review_classification_statuses", create_type=False),
+            nullable=False,
+            server_default="classified",
+        ),
+    )
+    op.alter_column("reviews", "classification_status", server_default="pending")
+    op.create_index(
+        "ix_reviews_classification_pending",
+        "reviews",
+        ["created_at"],
+        postgresql_where=sa.text("classification_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reviews_classification_pending", table_name="reviews")
+    op.drop_column("reviews", "classification_status")
+    classification_statuses.drop(op.get_bind(), checkfirst=True)
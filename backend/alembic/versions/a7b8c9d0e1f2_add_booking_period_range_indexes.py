@@ -0,0 +1,74 @@
+"""Add generated tsrange periods with GiST overlap indexes
+
+Revision ID: a7b8c9d0e1f2
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, Sequence[str], None] = "f1a2b3c4d5e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BOOKING_PERIOD_SQL = (
+    "CASE WHEN booking_from_time < booking_to_time "
+    "THEN tsrange(booking_from_time, booking_to_time, '[)') END"
+)
+OCCUPANCY_WINDOW_SQL = (
+    "CASE WHEN window_start < window_end "
+    "THEN tsrange(window_start, window_end, '[)') END"
+)
+
+
+def upgrade() -> None:
+    # btree_gist lets the uuid service_id share a GiST index with the range
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.add_column(
+        "bookings",
+        sa.Column(
+            "booking_period",
+            postgresql.TSRANGE(),
+            sa.Computed(BOOKING_PERIOD_SQL, persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_bookings_service_period_gist",
+        "bookings",
+        ["service_id", "booking_period"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+    op.add_column(
+        "slot_occupancy",
+        sa.Column(
+            "window_period",
+            postgresql.TSRANGE(),
+            sa.Computed(OCCUPANCY_WINDOW_SQL, persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_slot_occupancy_service_period_gist",
+        "slot_occupancy",
+        ["service_id", "window_period"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_slot_occupancy_service_period_gist", table_name="slot_occupancy"
+    )
+    op.drop_column("slot_occupancy", "window_period")
+    op.drop_index("ix_bookings_service_period_gist", table_name="bookings")
+    op.drop_column("bookings", "booking_period")
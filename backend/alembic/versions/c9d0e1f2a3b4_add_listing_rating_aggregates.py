@@ -0,0 +1,82 @@
+"""Add stored review aggregates to listings and backfill them
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "listings", sa.Column("avg_rating", sa.Numeric(3, 2), nullable=True)
+    )
+    op.add_column(
+        "listings",
+        sa.Column(
+            "review_count", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+    op.add_column(
+        "listings",
+        sa.Column(
+            "rating_sum", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+    op.add_column(
+        "listings",
+        sa.Column(
+            "rating_histogram",
+            postgresql.ARRAY(sa.Integer()),
+            nullable=False,
+            server_default=sa.text("'{0,0,0,0,0}'"),
+        ),
+    )
+    op.create_index(
+        "ix_listings_avg_rating", "listings", ["avg_rating"], unique=False
+    )
+
+    op.execute(
+        """
+        UPDATE listings AS l
+        SET review_count = t.review_count,
+            rating_sum = t.rating_sum,
+            rating_histogram = t.rating_histogram,
+            avg_rating = round(t.rating_sum::numeric / t.review_count, 2)
+        FROM (
+            SELECT
+                listing_id,
+                count(*)::int AS review_count,
+                sum(rating)::int AS rating_sum,
+                ARRAY[
+                    count(*) FILTER (WHERE rating = 1)::int,
+                    count(*) FILTER (WHERE rating = 2)::int,
+                    count(*) FILTER (WHERE rating = 3)::int,
+                    count(*) FILTER (WHERE rating = 4)::int,
+                    count(*) FILTER (WHERE rating = 5)::int
+                ] AS rating_histogram
+            FROM reviews
+            GROUP BY listing_id
+        ) AS t
+        WHERE t.listing_id = l.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_avg_rating", table_name="listings")
+    op.drop_column("listings", "rating_histogram")
+    op.drop_column("listings", "rating_sum")
+    op.drop_column("listings", "review_count")
+    op.drop_column("listings", "avg_rating")
@@ -0,0 +1,27 @@
+"""Track the content each listing embedding was computed from
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "listings", sa.Column("embedding_content_hash", sa.Text(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("listings", "embedding_content_hash")
@@ -0,0 +1,41 @@
+"""Fix listing embeddings at 384 dimensions and index them with HNSW
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # HNSW needs a fixed width. Embeddings of any other width cannot come from
+    # all-MiniLM-L6-v2, so clear them and let the worker re-encode.
+    op.execute(
+        """
+        UPDATE listings
+        SET embedding = NULL, embedding_content_hash = NULL
+        WHERE embedding IS NOT NULL AND vector_dims(embedding) <> 384
+        """
+    )
+    op.execute("ALTER TABLE listings ALTER COLUMN embedding TYPE vector(384)")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_listings_embedding_hnsw
+        ON listings USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_listings_embedding_hnsw")
+    op.execute("ALTER TABLE listings ALTER COLUMN embedding TYPE vector")
@@ -0,0 +1,56 @@
+"""Add slot occupancy ledger and backfill it from approved bookings
+
+Revision ID: f1a2b3c4d5e6
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "f1a2b3c4d5e6"
+down_revision: Union[str, Sequence[str], None] = "e8f9a0b1c2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "slot_occupancy",
+        sa.Column("service_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=False), nullable=False),
+        sa.Column("window_end", sa.DateTime(timezone=False), nullable=False),
+        sa.Column(
+            "booked_people", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"],
+            ["services.service_id"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("service_id", "window_start", "window_end"),
+    )
+    op.execute(
+        """
+        INSERT INTO slot_occupancy (service_id, window_start, window_end, booked_people)
+        SELECT service_id, booking_from_time, booking_to_time, COALESCE(SUM(amount_of_people), 0)
+        FROM bookings
+        WHERE status = 'approved' AND service_id IS NOT NULL
+        GROUP BY service_id, booking_from_time, booking_to_time
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("slot_occupancy")
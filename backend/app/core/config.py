@@ -82,6 +82,13 @@ class AppSettings(BaseSettings):
     MAX_UPLOAD_FILE_SIZE_MB: int = 10
     ALLOWED_IMAGE_MIME_TYPES: str = ",".join(DEFAULT_ALLOWED_IMAGE_MIME_TYPES)
 
+    SERVICE_CACHE_TTL_SECONDS: int = 300
+    CITIES_CACHE_TTL_SECONDS: int = 600
+    LISTING_FACETS_CACHE_TTL_SECONDS: int = 60
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 600
+    PERSONALIZATION_INDEX_REFRESH_SECONDS: int = 300
+    VECTOR_INDEX_REFRESH_SECONDS: int = 300
+
     model_config = SettingsConfigDict(env_file=ENV_FILES, extra="ignore")
 
     @property
@@ -10,6 +10,7 @@ from app.modules.interests import models as interests_models
 from app.modules.itineraries import models as itineraries_models
 from app.modules.listings import models as listings_models
 from app.modules.pricing import models as pricing_models
+from app.modules.recommendations import models as recommendations_models
 from app.modules.reviews import models as reviews_models
 from app.modules.services import models as services_models
 from app.modules.stripe_payment import models as stripe_payment_models
@@ -26,6 +27,7 @@ __all__ = [
     "itineraries_models",
     "listings_models",
     "pricing_models",
+    "recommendations_models",
     "reviews_models",
     "services_models",
     "stripe_payment_models",
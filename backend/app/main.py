@@ -27,6 +27,7 @@ from app.modules.users.models import User
 from app.modules.favourites.router import router as favourites_router
 from app.modules.interests.router import router as interests_router
 from app.modules.listings.router import router as listings_router
+from app.modules.recommendations.router import router as recommendations_router
 from app.modules.calendar.router import router as calendar_router
 from app.modules.reviews.router import router as reviews_router
 from app.modules.users.router import router as profile_router
@@ -35,6 +36,7 @@ from app.modules.services.router import router as services_router
 from app.modules.availability.router import router as availability_router
 from app.modules.stripe_payment.router import router as stripe_payment_router
 from app.shared.dependencies.permissions import get_current_user
+from app.shared.pagination import NEXT_CURSOR_HEADER
 
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
@@ -58,6 +60,7 @@ def include_routers(app: FastAPI) -> None:
     app.include_router(discounts_router)
     app.include_router(availability_router)
     app.include_router(stripe_payment_router)
+    app.include_router(recommendations_router)
 
 
 class UploadCleanupRequest(BaseModel):
@@ -162,6 +165,7 @@ def create_app(*, background_jobs_enabled: bool | None = None) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     if FRONTEND_DIST.exists():
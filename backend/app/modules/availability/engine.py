@@ -0,0 +1,150 @@
+"""Range availability engine - set-based loading and in-memory capacity sweeps.
+
+The per-day helpers in ``service.py`` used to issue one SUM over ``Booking`` per
+slot per day. The loaders here fetch slots, listing hours and overlapping
+bookings for a whole window at once; ``BookingLoadIndex`` then answers every
+"people booked in [start, end)" question with two bisects over sorted bounds.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlmodel import Session, col
+
+from app.modules.availability.models import ListingHours, ServiceSlots
+from app.modules.availability.occupancy import load_occupancy_rows
+
+ALL_DAY_START_TIME = time(0, 0, 0)
+ALL_DAY_END_TIME = time(23, 59, 59)
+DEFAULT_SERVICE_CAPACITY = 999
+
+
+def to_db_day_of_week(value: date) -> int:
+    """Convert Python weekday() (Mon=0) to DB weekday (Sun=0)."""
+    return (value.weekday() + 1) % 7
+
+
+def iter_dates(start_date: date, end_date: date):
+    current = start_date
+    while current <= end_date:
+        yield current
+        current = current + timedelta(days=1)
+
+
+class BookingLoadIndex:
+    """
+    Overlap sums over a fixed set of booking intervals.
+
+    A booking overlaps [start, end) when from < end AND to > start. Because
+    from < to, every booking with to <= start also has from < end, so the
+    overlap sum is sum(from < end) - sum(to <= start): two prefix-sum lookups.
+    """
+
+    __slots__ = ("starts", "start_totals", "ends", "end_totals")
+
+    def __init__(self, intervals: list[tuple[datetime, datetime, int]] | None = None):
+        intervals = intervals or []
+        by_start = sorted((start, people) for start, _, people in intervals)
+        by_end = sorted((end, people) for _, end, people in intervals)
+        self.starts = [start for start, _ in by_start]
+        self.start_totals = [0, *accumulate(people for _, people in by_start)]
+        self.ends = [end for end, _ in by_end]
+        self.end_totals = [0, *accumulate(people for _, people in by_end)]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def booked_between(self, start_dt: datetime, end_dt: datetime) -> int:
+        started = self.start_totals[bisect_left(self.starts, end_dt)]
+        finished = self.end_totals[bisect_right(self.ends, start_dt)]
+        return started - finished
+
+    def remaining(self, capacity: int, start_dt: datetime, end_dt: datetime) -> int:
+        return max(0, capacity - self.booked_between(start_dt, end_dt))
+
+
+def load_booking_loads(
+    db: Session,
+    service_ids: list[UUID],
+    start_dt: datetime,
+    end_dt: datetime,
+) -> dict[UUID, BookingLoadIndex]:
+    """Load booked windows overlapping [start, end), per service."""
+    return load_booking_loads_for_windows(
+        db, {service_id: (start_dt, end_dt) for service_id in service_ids}
+    )
+
+
+def load_booking_loads_for_windows(
+    db: Session,
+    windows: dict[UUID, tuple[datetime, datetime]],
+) -> dict[UUID, BookingLoadIndex]:
+    """
+    Load booked windows for several services in one statement, each service
+    restricted to its own [start, end) window. Reads the ``slot_occupancy``
+    ledger, so a slot is one interval however many bookings it holds.
+    """
+    if not windows:
+        return {}
+
+    rows = load_occupancy_rows(db, windows)
+
+    intervals: dict[UUID, list[tuple[datetime, datetime, int]]] = defaultdict(list)
+    for service_id, from_time, to_time, people in rows:
+        intervals[service_id].append((from_time, to_time, int(people or 0)))
+
+    return {
+        service_id: BookingLoadIndex(intervals.get(service_id))
+        for service_id in windows
+    }
+
+
+def load_weekly_slots(
+    db: Session, service_ids: list[UUID]
+) -> dict[UUID, dict[int, list[ServiceSlots]]]:
+    """Load all slots for the given services, bucketed by day_of_week."""
+    if not service_ids:
+        return {}
+
+    slots = (
+        db.exec(
+            select(ServiceSlots)
+            .where(col(ServiceSlots.service_id).in_(service_ids))
+            .order_by(ServiceSlots.day_of_week, ServiceSlots.start_time)
+        )
+        .scalars()
+        .all()
+    )
+
+    weekly: dict[UUID, dict[int, list[ServiceSlots]]] = {
+        service_id: defaultdict(list) for service_id in service_ids
+    }
+    for slot in slots:
+        weekly[slot.service_id][slot.day_of_week].append(slot)
+    return weekly
+
+
+def load_weekly_listing_hours(
+    db: Session, listing_ids: list[UUID]
+) -> dict[UUID, dict[int, ListingHours]]:
+    """Load listing hours for the given listings, keyed by day_of_week."""
+    listing_ids = [listing_id for listing_id in listing_ids if listing_id is not None]
+    if not listing_ids:
+        return {}
+
+    rows = (
+        db.exec(select(ListingHours).where(col(ListingHours.listing_id).in_(listing_ids)))
+        .scalars()
+        .all()
+    )
+
+    weekly: dict[UUID, dict[int, ListingHours]] = {
+        listing_id: {} for listing_id in listing_ids
+    }
+    for hours in rows:
+        weekly[hours.listing_id][hours.day_of_week] = hours
+    return weekly
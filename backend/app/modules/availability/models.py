@@ -1,9 +1,21 @@
-from datetime import time
+from datetime import datetime, time
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Column, ForeignKey, Integer, Time, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Time,
+    UniqueConstraint,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSRANGE, UUID as PGUUID
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -57,4 +69,62 @@ class ServiceSlots(SQLModel, table=True):
         UniqueConstraint("service_id", "day_of_week", "start_time", name="uq_service_slots_service_day_start"),
     )
 
-    service_rel: "Service" = Relationship(back_populates="service_slots")
\ No newline at end of file
+    service_rel: "Service" = Relationship(back_populates="service_slots")
+
+
+class SlotOccupancy(SQLModel, table=True):
+    """People booked per (service, booking window), maintained from approved bookings."""
+
+    __tablename__ = "slot_occupancy"
+
+    service_id: UUID = Field(
+        sa_column=Column(
+            PGUUID(as_uuid=True),
+            ForeignKey("services.service_id", onupdate="CASCADE", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+    )
+    window_start: datetime = Field(
+        sa_column=Column(DateTime(timezone=False), primary_key=True, nullable=False),
+    )
+    window_end: datetime = Field(
+        sa_column=Column(DateTime(timezone=False), primary_key=True, nullable=False),
+    )
+    booked_people: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default=text("0")),
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=text("now()"),
+            onupdate=text("now()"),
+        )
+    )
+
+
+# Generated [window_start, window_end) range, GiST-indexed with service_id for
+# overlap sums. Table-only, like ``bookings.booking_period``.
+OCCUPANCY_WINDOW_SQL = (
+    "CASE WHEN window_start < window_end "
+    "THEN tsrange(window_start, window_end, '[)') END"
+)
+
+SlotOccupancy.__table__.append_column(
+    Column("window_period", TSRANGE, Computed(OCCUPANCY_WINDOW_SQL, persisted=True))
+)
+Index(
+    "ix_slot_occupancy_service_period_gist",
+    SlotOccupancy.__table__.c.service_id,
+    SlotOccupancy.__table__.c.window_period,
+    postgresql_using="gist",
+)
+
+
+def occupancy_window_overlaps(start_dt: datetime, end_dt: datetime):
+    """``window_period && [start_dt, end_dt)``."""
+    return SlotOccupancy.__table__.c.window_period.overlaps(
+        func.tsrange(start_dt, end_dt, literal_column("'[)'"), type_=TSRANGE)
+    )
@@ -0,0 +1,415 @@
+"""Slot occupancy ledger - approved bookings folded per (service, window).
+
+Slot bookings share their slot's window, so the people booked on a slot for a
+date live in a single ``slot_occupancy`` row and overlap sums touch one row per
+window instead of one per booking. Every write path that changes an approved
+booking calls ``sync_booking_occupancy`` inside its own transaction, and every
+ledger write holds at least a shared lock on its service rows until commit.
+``reconcile_slot_occupancy`` compares the ledger with ``bookings`` and repairs
+drift under an exclusive lock on the affected services, so it never races a
+booking on them.
+
+Bookings that must not oversell go through ``reserve_overlapping_occupancy``
+instead, which checks and increments in one step under an exclusive lock on
+the service. Slot windows get no cheaper path: one service can hold slot,
+virtual-slot and free-form bookings whose windows overlap without being
+equal, so only an overlap sum over the whole service is a safe check.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, col
+
+from app.modules.availability.models import SlotOccupancy, occupancy_window_overlaps
+from app.modules.bookings.models import Booking, BookingStatus
+from app.modules.services.models import Service
+
+logger = logging.getLogger(__name__)
+
+OccupancyKey = tuple[UUID, datetime, datetime]
+
+
+@dataclass(frozen=True)
+class OccupancyContribution:
+    service_id: UUID
+    window_start: datetime
+    window_end: datetime
+    people: int
+
+    @property
+    def key(self) -> OccupancyKey:
+        return self.service_id, self.window_start, self.window_end
+
+    def overlaps(self, service_id: UUID, start_dt: datetime, end_dt: datetime) -> bool:
+        return (
+            self.service_id == service_id
+            and self.window_start < end_dt
+            and self.window_end > start_dt
+        )
+
+
+def booking_contribution(booking: Booking | None) -> OccupancyContribution | None:
+    """What a booking currently adds to the ledger (only approved bookings count)."""
+    if (
+        booking is None
+        or booking.status != BookingStatus.approved
+        or booking.service_id is None
+        or booking.booking_from_time is None
+        or booking.booking_to_time is None
+    ):
+        return None
+
+    return OccupancyContribution(
+        service_id=booking.service_id,
+        window_start=booking.booking_from_time,
+        window_end=booking.booking_to_time,
+        people=int(booking.amount_of_people or 0),
+    )
+
+
+def apply_occupancy_deltas(db: Session, deltas: dict[OccupancyKey, int]) -> None:
+    """Add people to (or remove them from) ledger rows with a single upsert."""
+    rows = [
+        {
+            "service_id": service_id,
+            "window_start": window_start,
+            "window_end": window_end,
+            "booked_people": delta,
+        }
+        for (service_id, window_start, window_end), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    lock_services(db, [row["service_id"] for row in rows], exclusive=False)
+    table = SlotOccupancy.__table__
+    statement = pg_insert(table).values(rows)
+    db.exec(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.service_id, table.c.window_start, table.c.window_end],
+            set_={
+                "booked_people": table.c.booked_people + statement.excluded.booked_people,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def sync_booking_occupancy(
+    db: Session,
+    before: OccupancyContribution | None,
+    booking: Booking,
+) -> None:
+    """Move a booking's ledger contribution from its previous state to its current one."""
+    after = booking_contribution(booking)
+    if before == after:
+        return
+
+    deltas: dict[OccupancyKey, int] = defaultdict(int)
+    if before is not None:
+        deltas[before.key] -= before.people
+    if after is not None:
+        deltas[after.key] += after.people
+    apply_occupancy_deltas(db, deltas)
+
+
+def release_occupancy(db: Session, contributions: list[OccupancyContribution]) -> None:
+    deltas: dict[OccupancyKey, int] = defaultdict(int)
+    for contribution in contributions:
+        deltas[contribution.key] -= contribution.people
+    apply_occupancy_deltas(db, deltas)
+
+
+# ============================================================================
+# Capacity reservation
+# ============================================================================
+
+
+def lock_services(db: Session, service_ids, *, exclusive: bool) -> None:
+    """
+    Lock service rows until the transaction ends, in id order so that lockers
+    of several services cannot deadlock each other.
+    """
+    db.exec(
+        select(Service.service_id)
+        .where(col(Service.service_id).in_(sorted(set(service_ids))))
+        .order_by(Service.service_id)
+        .with_for_update(read=not exclusive)
+    )
+
+
+def lock_service_capacity(db: Session, service_id: UUID, *, exclusive: bool) -> None:
+    """
+    Lock the service row until the transaction ends.
+
+    Ledger writes take a shared lock; reservations take it exclusively so no
+    other write on the service can slip in between their read and their write.
+    """
+    lock_services(db, [service_id], exclusive=exclusive)
+
+
+def reserve_overlapping_occupancy(
+    db: Session,
+    contribution: OccupancyContribution,
+    capacity: int,
+    *,
+    exclude: OccupancyContribution | None = None,
+) -> bool:
+    """
+    Add a booking if everything overlapping its window stays within capacity.
+
+    Slot, virtual-slot and free-form windows alike, under an exclusive service
+    lock. ``exclude`` is moved out of the ledger in the same step, for bookings
+    that change window or party size.
+    """
+    lock_service_capacity(db, contribution.service_id, exclusive=True)
+
+    booked = get_overlapping_occupancy(
+        db,
+        contribution.service_id,
+        contribution.window_start,
+        contribution.window_end,
+    )
+    if exclude is not None and exclude.overlaps(
+        contribution.service_id, contribution.window_start, contribution.window_end
+    ):
+        booked -= exclude.people
+    if booked + contribution.people > capacity:
+        return False
+
+    deltas: dict[OccupancyKey, int] = defaultdict(int)
+    if exclude is not None:
+        deltas[exclude.key] -= exclude.people
+    deltas[contribution.key] += contribution.people
+    apply_occupancy_deltas(db, deltas)
+    return True
+
+
+# ============================================================================
+# Ledger reads
+# ============================================================================
+
+
+def get_window_occupancy(
+    db: Session,
+    service_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+) -> int:
+    """People booked on exactly this window (primary-key lookup)."""
+    booked = db.exec(
+        select(SlotOccupancy.booked_people)
+        .where(SlotOccupancy.service_id == service_id)
+        .where(SlotOccupancy.window_start == window_start)
+        .where(SlotOccupancy.window_end == window_end)
+    ).scalar_one_or_none()
+    return int(booked or 0)
+
+
+def get_overlapping_occupancy(
+    db: Session,
+    service_id: UUID,
+    start_dt: datetime,
+    end_dt: datetime,
+) -> int:
+    """People booked on any window overlapping [start_dt, end_dt)."""
+    booked = db.exec(
+        select(func.coalesce(func.sum(SlotOccupancy.booked_people), 0))
+        .where(SlotOccupancy.service_id == service_id)
+        .where(occupancy_window_overlaps(start_dt, end_dt))
+    ).scalar_one()
+    return int(booked)
+
+
+def load_occupancy_rows(
+    db: Session,
+    windows: dict[UUID, tuple[datetime, datetime]],
+) -> list[tuple[UUID, datetime, datetime, int]]:
+    """Ledger rows for several services, each restricted to its own window."""
+    if not windows:
+        return []
+
+    return db.exec(
+        select(
+            SlotOccupancy.service_id,
+            SlotOccupancy.window_start,
+            SlotOccupancy.window_end,
+            SlotOccupancy.booked_people,
+        )
+        .where(col(SlotOccupancy.service_id).in_(list(windows)))
+        .where(SlotOccupancy.booked_people != 0)
+        .where(
+            or_(
+                *[
+                    and_(
+                        SlotOccupancy.service_id == service_id,
+                        occupancy_window_overlaps(start_dt, end_dt),
+                    )
+                    for service_id, (start_dt, end_dt) in windows.items()
+                ]
+            )
+        )
+    ).all()
+
+
+# ============================================================================
+# Reconciliation
+# ============================================================================
+
+
+def load_expected_occupancy(
+    db: Session, service_ids: list[UUID] | None = None
+) -> dict[OccupancyKey, int]:
+    """People per window according to approved bookings."""
+    query = (
+        select(
+            Booking.service_id,
+            Booking.booking_from_time,
+            Booking.booking_to_time,
+            func.coalesce(func.sum(Booking.amount_of_people), 0),
+        )
+        .where(Booking.status == BookingStatus.approved)
+        .where(Booking.service_id.isnot(None))
+        .group_by(
+            Booking.service_id,
+            Booking.booking_from_time,
+            Booking.booking_to_time,
+        )
+    )
+    if service_ids is not None:
+        query = query.where(col(Booking.service_id).in_(service_ids))
+    return {
+        (service_id, window_start, window_end): int(people)
+        for service_id, window_start, window_end, people in db.exec(query).all()
+    }
+
+
+def load_ledger_occupancy(
+    db: Session, service_ids: list[UUID] | None = None
+) -> dict[OccupancyKey, int]:
+    """People per window according to the ledger."""
+    query = select(
+        SlotOccupancy.service_id,
+        SlotOccupancy.window_start,
+        SlotOccupancy.window_end,
+        SlotOccupancy.booked_people,
+    )
+    if service_ids is not None:
+        query = query.where(col(SlotOccupancy.service_id).in_(service_ids))
+    return {
+        (service_id, window_start, window_end): int(people)
+        for service_id, window_start, window_end, people in db.exec(query).all()
+    }
+
+
+@dataclass
+class OccupancyDrift:
+    """
+    - missing: windows with approved bookings but no (or a zero) ledger row
+    - stale: ledger rows with no approved bookings behind them
+    - mismatched: rows whose count disagrees with the bookings
+    """
+
+    expected: dict[OccupancyKey, int]
+    actual: dict[OccupancyKey, int]
+    missing: list[OccupancyKey]
+    stale: list[OccupancyKey]
+    mismatched: list[OccupancyKey]
+
+    @classmethod
+    def compare(
+        cls, expected: dict[OccupancyKey, int], actual: dict[OccupancyKey, int]
+    ) -> "OccupancyDrift":
+        return cls(
+            expected,
+            actual,
+            missing=[key for key, people in expected.items() if people and not actual.get(key)],
+            stale=[key for key in actual if key not in expected],
+            mismatched=[
+                key
+                for key, people in expected.items()
+                if actual.get(key) and actual[key] != people
+            ],
+        )
+
+    @property
+    def keys(self) -> list[OccupancyKey]:
+        return [*self.missing, *self.stale, *self.mismatched]
+
+    @property
+    def people(self) -> int:
+        return sum(
+            abs(self.expected.get(key, 0) - self.actual.get(key, 0)) for key in self.keys
+        )
+
+
+def reconcile_slot_occupancy(db: Session, *, repair: bool = True) -> dict:
+    """
+    Compare the ledger with approved bookings and report (and repair) drift.
+
+    The first pass reads both sides without locks, in two statements, so a
+    booking committing in between shows up as drift that is not there. Only
+    the services it flags are then locked exclusively - which waits out, and
+    holds off, every booking, cancellation and expiry on them - and re-read;
+    what still disagrees under that lock is reported and repaired.
+    """
+    scan = OccupancyDrift.compare(load_expected_occupancy(db), load_ledger_occupancy(db))
+    drift = scan
+    if scan.keys:
+        service_ids = sorted({service_id for service_id, _, _ in scan.keys})
+        lock_services(db, service_ids, exclusive=True)
+        drift = OccupancyDrift.compare(
+            load_expected_occupancy(db, service_ids),
+            load_ledger_occupancy(db, service_ids),
+        )
+
+    repaired = bool(repair and drift.keys)
+    if repaired:
+        if drift.stale:
+            db.exec(
+                delete(SlotOccupancy).where(
+                    tuple_(
+                        SlotOccupancy.service_id,
+                        SlotOccupancy.window_start,
+                        SlotOccupancy.window_end,
+                    ).in_(drift.stale)
+                )
+            )
+        apply_occupancy_deltas(
+            db,
+            {
+                key: drift.expected[key] - drift.actual.get(key, 0)
+                for key in (*drift.missing, *drift.mismatched)
+            },
+        )
+        db.commit()
+    else:
+        db.rollback()
+
+    if drift.keys:
+        logger.warning(
+            "slot_occupancy drift: %s missing, %s stale, %s mismatched (%s people)%s",
+            len(drift.missing),
+            len(drift.stale),
+            len(drift.mismatched),
+            drift.people,
+            "; repaired" if repaired else "",
+        )
+
+    return {
+        "windows": len(scan.expected),
+        "missing": len(drift.missing),
+        "stale": len(drift.stale),
+        "mismatched": len(drift.mismatched),
+        "drift_people": drift.people,
+        "repaired": repaired,
+    }
@@ -18,9 +18,11 @@ from app.shared.dependencies.permissions import (
 from .schemas import (
     BulkServiceAvailabilityRequest,
     BulkServiceAvailabilityResponse,
+    ListingAvailabilityHeatmapResponse,
     ListingHoursCreate,
     ListingHoursResponse,
     ListingHoursUpdate,
+    NextAvailableResponse,
     ServiceAvailableResponse,
     ServiceSlotsCreate,
     ServiceSlotsResponse,
@@ -180,6 +182,37 @@ def get_service_availability_endpoint(
         raise HTTPException(500, "Unable to load service availability")
 
 
+@router.get(
+    "/services/{service_id}/next-available", response_model=NextAvailableResponse
+)
+def get_next_available_dates_endpoint(
+    service_id: UUID,
+    start_date: date_class = Query(..., description="Start date in YYYY-MM-DD format"),
+    people: int = Query(1, ge=1, description="Number of people"),
+    limit: int = Query(5, ge=1, le=31, description="Number of open dates to return"),
+    horizon_days: int = Query(
+        90,
+        ge=1,
+        le=availability_service.MAX_NEXT_AVAILABLE_HORIZON_DAYS,
+        description="How many days ahead of start_date to search",
+    ),
+    db: Session = Depends(get_db),
+):
+    """Find the next open dates (and their open slots) for a party size."""
+    try:
+        return availability_service.find_next_available_dates(
+            db, service_id, start_date, people, limit, horizon_days
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception(
+            "Unexpected failure while searching next available dates for service %s",
+            service_id,
+        )
+        raise HTTPException(500, "Unable to search service availability")
+
+
 # ============================================================================
 # Mass Availability Endpoint (Lightweight, no slot details)
 # ============================================================================
@@ -208,3 +241,40 @@ def get_mass_availability_endpoint(
             service_id,
         )
         raise HTTPException(500, "Unable to load mass availability")
+
+
+# ============================================================================
+# Listing Availability Heatmap Endpoint
+# ============================================================================
+
+
+@router.get(
+    "/listings/{listing_id}/heatmap",
+    response_model=ListingAvailabilityHeatmapResponse,
+)
+def get_listing_availability_heatmap_endpoint(
+    listing_id: UUID,
+    start_date: date_class = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: date_class = Query(..., description="End date in YYYY-MM-DD format"),
+    db: Session = Depends(get_db),
+):
+    """Remaining capacity per active service and date, for a listing calendar."""
+    if end_date < start_date:
+        raise HTTPException(400, "end_date must be on or after start_date")
+    if (end_date - start_date).days + 1 > availability_service.MAX_HEATMAP_DAYS:
+        raise HTTPException(
+            400,
+            f"Date range cannot exceed {availability_service.MAX_HEATMAP_DAYS} days",
+        )
+    try:
+        return availability_service.get_listing_availability_heatmap(
+            db, listing_id, start_date, end_date
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception(
+            "Unexpected failure while loading availability heatmap for listing %s",
+            listing_id,
+        )
+        raise HTTPException(500, "Unable to load listing availability")
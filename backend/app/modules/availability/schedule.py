@@ -0,0 +1,208 @@
+"""Compiled weekly schedules - the slots that apply on each weekday, per service.
+
+Resolving a day used to mean querying ``ServiceSlots`` for the weekday and
+falling back to ``ListingHours``. A ``WeeklySchedule`` holds the outcome of that
+resolution for all seven days, so availability checks index a tuple instead.
+
+Schedules are cached per process and invalidated by slot and listing-hours
+writes. They also record the capacity and listing they were compiled against
+and are rebuilt whenever the service descriptor disagrees, so service edits
+need no extra hook.
+"""
+
+from __future__ import annotations
+
+from datetime import time
+from typing import Iterable
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.modules.availability.engine import (
+    ALL_DAY_END_TIME,
+    ALL_DAY_START_TIME,
+    DEFAULT_SERVICE_CAPACITY,
+    load_weekly_listing_hours,
+    load_weekly_slots,
+)
+from app.modules.availability.models import ListingHours, ServiceSlots
+from app.modules.services.cache import ServiceDescriptor
+from app.shared.cache import VersionedTTLCache
+
+VIRTUAL_SLOT_ID = -1
+
+
+class ScheduleSlot:
+    __slots__ = (
+        "id",
+        "service_id",
+        "day_of_week",
+        "start_time",
+        "end_time",
+        "capacity",
+        "is_virtual",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        service_id: UUID,
+        day_of_week: int,
+        start_time: time,
+        end_time: time,
+        capacity: int,
+        is_virtual: bool,
+    ):
+        self.id = id
+        self.service_id = service_id
+        self.day_of_week = day_of_week
+        self.start_time = start_time
+        self.end_time = end_time
+        self.capacity = capacity
+        self.is_virtual = is_virtual
+
+    @classmethod
+    def from_service_slot(cls, slot: ServiceSlots) -> "ScheduleSlot":
+        return cls(
+            slot.id,
+            slot.service_id,
+            slot.day_of_week,
+            slot.start_time,
+            slot.end_time,
+            slot.capacity,
+            False,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduleSlot(id={self.id}, day_of_week={self.day_of_week}, "
+            f"{self.start_time}-{self.end_time}, capacity={self.capacity})"
+        )
+
+
+class WeeklySchedule:
+    """Seven day buckets indexed by DB day_of_week (0 = Sunday)."""
+
+    __slots__ = ("service_id", "listing_id", "capacity", "days")
+
+    def __init__(
+        self,
+        service_id: UUID,
+        listing_id: UUID | None,
+        capacity: int,
+        days: tuple[tuple[ScheduleSlot, ...], ...],
+    ):
+        self.service_id = service_id
+        self.listing_id = listing_id
+        self.capacity = capacity
+        self.days = days
+
+    def slots_for(self, day_of_week: int) -> tuple[ScheduleSlot, ...]:
+        return self.days[day_of_week]
+
+    def max_capacity(self, day_of_week: int) -> int:
+        """Upper bound on the party size any slot of the weekday can take."""
+        return max((slot.capacity for slot in self.days[day_of_week]), default=0)
+
+    def matches(self, service: ServiceDescriptor) -> bool:
+        return (
+            self.listing_id == service.listing_id
+            and self.capacity == get_schedule_capacity(service)
+        )
+
+
+def get_schedule_capacity(service: ServiceDescriptor) -> int:
+    return service.capacity if service.capacity is not None else DEFAULT_SERVICE_CAPACITY
+
+
+def compile_weekly_schedule(
+    service_id: UUID,
+    listing_id: UUID | None,
+    capacity: int,
+    slots_by_day: dict[int, list[ServiceSlots]],
+    hours_by_day: dict[int, ListingHours],
+) -> WeeklySchedule:
+    """
+    Resolve every weekday once: real slots first, then a virtual slot built
+    from listing hours, and finally an all-day virtual slot.
+    """
+    days = []
+    for day_of_week in range(7):
+        slots = slots_by_day.get(day_of_week)
+        if slots:
+            days.append(tuple(ScheduleSlot.from_service_slot(slot) for slot in slots))
+            continue
+
+        listing_hours = hours_by_day.get(day_of_week)
+        if listing_hours:
+            start_time, end_time = listing_hours.open_time, listing_hours.close_time
+        else:
+            start_time, end_time = ALL_DAY_START_TIME, ALL_DAY_END_TIME
+        days.append(
+            (
+                ScheduleSlot(
+                    VIRTUAL_SLOT_ID,
+                    service_id,
+                    day_of_week,
+                    start_time,
+                    end_time,
+                    capacity,
+                    True,
+                ),
+            )
+        )
+    return WeeklySchedule(service_id, listing_id, capacity, tuple(days))
+
+
+def load_weekly_schedules(
+    db: Session, services: list[ServiceDescriptor]
+) -> dict[UUID, WeeklySchedule]:
+    """Compile schedules for several services with two statements."""
+    if not services:
+        return {}
+
+    weekly_slots = load_weekly_slots(db, [service.service_id for service in services])
+    weekly_hours = load_weekly_listing_hours(
+        db, list({service.listing_id for service in services})
+    )
+    return {
+        service.service_id: compile_weekly_schedule(
+            service.service_id,
+            service.listing_id,
+            get_schedule_capacity(service),
+            weekly_slots.get(service.service_id, {}),
+            weekly_hours.get(service.listing_id, {}),
+        )
+        for service in services
+    }
+
+
+weekly_schedule_cache: VersionedTTLCache[UUID, WeeklySchedule] = VersionedTTLCache(
+    settings.SERVICE_CACHE_TTL_SECONDS
+)
+
+
+def get_weekly_schedules(
+    db: Session, services: Iterable[ServiceDescriptor]
+) -> dict[UUID, WeeklySchedule]:
+    by_id = {service.service_id: service for service in services}
+    return weekly_schedule_cache.get_many(
+        by_id,
+        lambda missing: load_weekly_schedules(db, [by_id[sid] for sid in missing]),
+        is_fresh=lambda service_id, schedule: schedule.matches(by_id[service_id]),
+    )
+
+
+def get_weekly_schedule(db: Session, service: ServiceDescriptor) -> WeeklySchedule:
+    return get_weekly_schedules(db, [service])[service.service_id]
+
+
+def invalidate_service_schedules(*service_ids: UUID) -> None:
+    weekly_schedule_cache.invalidate(service_ids or None)
+
+
+def invalidate_listing_schedules(listing_id: UUID) -> None:
+    weekly_schedule_cache.invalidate_where(
+        lambda _, schedule: schedule.listing_id == listing_id
+    )
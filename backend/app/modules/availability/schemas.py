@@ -65,6 +65,40 @@ class MassAvailabilityResponse(BaseModel):
     availability: list[MassAvailabilityItem]
 
 
+class NextAvailableDate(BaseModel):
+    date: str
+    remaining_capacity: int
+    slots: list[SlotAvailability]
+
+
+class NextAvailableResponse(BaseModel):
+    """First open dates for a party size, scanning forward from start_date."""
+
+    service_id: UUID
+    people: int
+    start_date: str
+    searched_until: str
+    dates: list[NextAvailableDate]
+
+
+class ListingAvailabilityHeatmapResponse(BaseModel):
+    """
+    Remaining capacity for every active service of a listing over a date range.
+
+    ``remaining[i][j]`` is the best remaining capacity of ``service_ids[i]`` on
+    ``start_date + j`` days (largest across the day's slots, or the night for
+    hotels); past dates report 0. Arrays instead of per-day objects keep
+    six-month ranges small.
+    """
+
+    listing_id: UUID
+    start_date: str
+    end_date: str
+    service_ids: list[UUID]
+    capacities: list[int]
+    remaining: list[list[int]]
+
+
 class ListingHoursBase(BaseModel):
     day_of_week: int = Field(ge=0, le=6, description="0=Sunday, 6=Saturday")
     open_time: time
@@ -1,7 +1,5 @@
 """Service layer for availability module - CRUD and business logic."""
 
-from collections import namedtuple
-from dataclasses import dataclass
 from datetime import datetime, time, date, timedelta
 from uuid import UUID
 
@@ -9,11 +7,33 @@ from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlmodel import Session, col
 
+from app.modules.availability.engine import (
+    DEFAULT_SERVICE_CAPACITY,
+    BookingLoadIndex,
+    iter_dates,
+    load_booking_loads,
+    load_booking_loads_for_windows,
+    to_db_day_of_week,
+)
 from app.modules.availability.models import ListingHours, ServiceSlots
+from app.modules.availability.occupancy import (
+    OccupancyContribution,
+    get_overlapping_occupancy,
+)
+from app.modules.availability.schedule import (
+    WeeklySchedule,
+    get_weekly_schedule,
+    get_weekly_schedules,
+    invalidate_listing_schedules,
+    invalidate_service_schedules,
+)
 from app.modules.availability.schemas import (
     BulkServiceAvailabilityRequestItem,
     BulkServiceAvailabilityResponse,
     BulkServiceAvailabilityResult,
+    ListingAvailabilityHeatmapResponse,
+    NextAvailableDate,
+    NextAvailableResponse,
     ListingHoursCreate,
     ListingHoursUpdate,
     ListingHoursResponse,
@@ -26,9 +46,13 @@ from app.modules.availability.schemas import (
     MassAvailabilityResponse,
 )
 from app.modules.bookings.models import Booking, BookingStatus
-from app.modules.businesses.models import BusinessType
-from app.modules.listings.models import Listing
-from app.modules.services.models import Service
+from app.modules.services.cache import (
+    ServiceDescriptor,
+    get_service_descriptor,
+    get_service_descriptors,
+    invalidate_service_descriptors,
+)
+from app.modules.services.models import Service, StatusTypes
 
 HOTEL_DEFAULT_CHECK_IN_TIME = time(14, 0, 0)
 HOTEL_DEFAULT_CHECK_OUT_TIME = time(11, 0, 0)
@@ -76,6 +100,7 @@ def create_listing_hours(db: Session, data: ListingHoursCreate) -> ListingHours:
     db.add(hours)
     db.commit()
     db.refresh(hours)
+    invalidate_listing_schedules(hours.listing_id)
     return hours
 
 
@@ -92,6 +117,7 @@ def update_listing_hours(
 
     db.commit()
     db.refresh(hours)
+    invalidate_listing_schedules(listing_id)
     return hours
 
 
@@ -103,6 +129,7 @@ def delete_listing_hours(db: Session, listing_id: UUID, day: int) -> None:
 
     db.delete(hours)
     db.commit()
+    invalidate_listing_schedules(listing_id)
 
 
 # ============================================================================
@@ -180,6 +207,8 @@ def create_service_slot(db: Session, data: ServiceSlotsCreate) -> ServiceSlots:
     db.add(slot)
     db.commit()
     db.refresh(slot)
+    invalidate_service_descriptors(slot.service_id)
+    invalidate_service_schedules(slot.service_id)
     return slot
 
 
@@ -274,6 +303,8 @@ def update_service_slot(
     db.add(slot)
     db.commit()
     db.refresh(slot)
+    invalidate_service_descriptors(service_id)
+    invalidate_service_schedules(service_id)
     return slot
 
 
@@ -285,6 +316,8 @@ def delete_service_slot(db: Session, service_id: UUID, slot_id: int) -> None:
 
     db.delete(slot)
     db.commit()
+    invalidate_service_descriptors(service_id)
+    invalidate_service_schedules(service_id)
 
 
 # ============================================================================
@@ -351,24 +384,18 @@ def get_booked_count(
     service_id: UUID,
     start_dt: datetime,
     end_dt: datetime,
+    exclude: OccupancyContribution | None = None,
 ) -> int:
-    """Count confirmed bookings that overlap the requested window."""
-    result = db.exec(
-        select(func.coalesce(func.sum(Booking.amount_of_people), 0))
-        .where(Booking.service_id == service_id)
-        .where(
-            col(Booking.status).notin_(
-                [
-                    BookingStatus.cancelled,
-                    BookingStatus.pending,
-                    BookingStatus.completed,
-                ]
-            )
-        )
-        .where(Booking.booking_from_time < end_dt)
-        .where(Booking.booking_to_time > start_dt)
-    ).scalar_one()
-    return int(result)
+    """
+    Count confirmed bookings that overlap the requested window.
+
+    Reads the slot occupancy ledger; pass ``exclude`` to leave one booking's
+    own contribution out (e.g. when re-validating an update).
+    """
+    booked = get_overlapping_occupancy(db, service_id, start_dt, end_dt)
+    if exclude is not None and exclude.overlaps(service_id, start_dt, end_dt):
+        booked -= exclude.people
+    return max(0, booked)
 
 
 def get_slot_remaining_capacity(
@@ -439,34 +466,11 @@ def is_available(
 
 def is_hotel_service(db: Session, service_id: UUID) -> bool:
     """
-    Traverse Service → Listing → BusinessType to determine if this is a hotel service.
-    Returns True if BusinessType.name contains 'hotel' (case-insensitive).
+    Whether the service's listing has the 'hotel' business type.
+    Answered from the shared service descriptor cache.
     """
-    service = (
-        db.exec(select(Service).where(Service.service_id == service_id))
-        .scalars()
-        .first()
-    )
-    if not service or not service.listing_id:
-        return False
-
-    listing = (
-        db.exec(select(Listing).where(Listing.id == service.listing_id))
-        .scalars()
-        .first()
-    )
-    if not listing or not listing.business_type:
-        return False
-
-    business_type = (
-        db.exec(select(BusinessType).where(BusinessType.id == listing.business_type))
-        .scalars()
-        .first()
-    )
-    if not business_type or not business_type.name:
-        return False
-
-    return business_type.name.lower() == "hotel"
+    descriptor = get_service_descriptor(db, service_id)
+    return descriptor is not None and descriptor.is_hotel
 
 
 def get_service_record(db: Session, service_id: UUID) -> Service | None:
@@ -487,53 +491,104 @@ def ensure_service_supports_slots(db: Session, service: Service) -> None:
 # ============================================================================
 
 
-def get_service_availability(
+def get_availability_window(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    """Booking window that covers every slot and hotel night in the date range."""
+    return (
+        datetime.combine(start_date, time.min),
+        datetime.combine(end_date + timedelta(days=1), HOTEL_DEFAULT_CHECK_OUT_TIME),
+    )
+
+
+def load_service_availability_inputs(
     db: Session,
-    service_id: UUID,
-    date: date,
-    people: int,
-) -> ServiceAvailableResponse:
-    """
-    Get availability for a service on a specific date for a party size.
-    Returns is_open=False with closed_reason='no_listing_hours' if no slots found.
-    For hotels, checks remaining >= 1; for non-hotels, checks remaining >= people.
-    If all slots are unavailable, sets closed_reason='fully_booked'.
-    """
-    # 1. Fetch Service to get listing_id
-    service = get_service_record(db, service_id)
-    python_weekday = date.weekday()
-    db_day_of_week = (python_weekday + 1) % 7  # Convert Monday-based to Sunday-based
-    if not service:
-        # Return empty availability instead of 404 - treats deleted service as "unavailable"
-        return ServiceAvailableResponse(
-            service_id=service_id,
-            date=date.isoformat(),
-            day_of_week=db_day_of_week,
-            is_available=False,
-            is_open=False,
-            slots=[],
-            closed_reason="service_not_found",
+    service: ServiceDescriptor,
+    is_hotel: bool,
+    start_date: date,
+    end_date: date,
+) -> tuple[WeeklySchedule | None, BookingLoadIndex]:
+    """Weekly schedule (cached; none for hotels) and booking load for one service and range."""
+    window_start, window_end = get_availability_window(start_date, end_date)
+    loads = load_booking_loads(db, [service.service_id], window_start, window_end)
+    schedule = None if is_hotel else get_weekly_schedule(db, service)
+    return schedule, loads[service.service_id]
+
+
+def get_service_capacity(service: ServiceDescriptor) -> int:
+    return service.capacity if service.capacity is not None else DEFAULT_SERVICE_CAPACITY
+
+
+def get_hotel_night_window(day: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(day, HOTEL_DEFAULT_CHECK_IN_TIME),
+        datetime.combine(day + timedelta(days=1), HOTEL_DEFAULT_CHECK_OUT_TIME),
+    )
+
+
+def compute_day_slot_capacity(
+    schedule: WeeklySchedule,
+    day: date,
+    loads: BookingLoadIndex,
+) -> list[tuple[object, int]]:
+    """Pair every slot that applies on ``day`` with its remaining capacity."""
+    return [
+        (
+            slot,
+            loads.remaining(
+                slot.capacity,
+                datetime.combine(day, slot.start_time),
+                datetime.combine(day, slot.end_time),
+            ),
         )
+        for slot in schedule.slots_for(to_db_day_of_week(day))
+    ]
 
-    # 2. Determine if hotel via is_hotel_service()
-    is_hotel = is_hotel_service(db, service_id)
-    service_capacity = service.capacity if service.capacity is not None else 999
+
+def get_day_remaining_capacity(
+    service: ServiceDescriptor,
+    is_hotel: bool,
+    day: date,
+    schedule: WeeklySchedule | None,
+    loads: BookingLoadIndex,
+) -> int:
+    """Largest party that still fits on ``day`` (best slot, or the hotel night)."""
+    if is_hotel:
+        start_dt, end_dt = get_hotel_night_window(day)
+        return loads.remaining(get_service_capacity(service), start_dt, end_dt)
+
+    return max(
+        (remaining for _, remaining in compute_day_slot_capacity(schedule, day, loads)),
+        default=0,
+    )
+
+
+def is_service_open_on(
+    service: ServiceDescriptor,
+    is_hotel: bool,
+    day: date,
+    people: int,
+    schedule: WeeklySchedule | None,
+    loads: BookingLoadIndex,
+) -> bool:
+    return get_day_remaining_capacity(service, is_hotel, day, schedule, loads) >= people
+
+
+def build_service_day_availability(
+    service: ServiceDescriptor,
+    is_hotel: bool,
+    day: date,
+    people: int,
+    schedule: WeeklySchedule | None,
+    loads: BookingLoadIndex,
+) -> ServiceAvailableResponse:
+    """Assemble the single-day response from the weekly schedule and booking load."""
+    db_day_of_week = to_db_day_of_week(day)
 
     if is_hotel:
-        start_dt = datetime.combine(date, HOTEL_DEFAULT_CHECK_IN_TIME)
-        end_dt = datetime.combine(date + timedelta(days=1), HOTEL_DEFAULT_CHECK_OUT_TIME)
-        remaining = get_available_slots(
-            db,
-            service_id,
-            service_capacity,
-            start_dt,
-            end_dt,
-        )
         # For hotels, people represents number of rooms needed
-        is_open = remaining >= people
+        is_open = is_service_open_on(service, True, day, people, schedule, loads)
         return ServiceAvailableResponse(
-            service_id=service_id,
-            date=date.isoformat(),
+            service_id=service.service_id,
+            date=day.isoformat(),
             day_of_week=db_day_of_week,
             is_available=is_open,
             is_open=is_open,
@@ -541,129 +596,68 @@ def get_service_availability(
             closed_reason=None if is_open else "fully_booked",
         )
 
-    # 3. Get day-of-week from date (Python: 0=Monday, 6=Sunday; DB: 0=Sunday, 6=Saturday)
-    # Convert: Python weekday() returns 0=Monday, DB wants 0=Sunday
-    # 4. Fetch ServiceSlots for that service + day-of-week
-    slots = (
-        db.exec(
-            select(ServiceSlots)
-            .where(ServiceSlots.service_id == service_id)
-            .where(ServiceSlots.day_of_week == db_day_of_week)
+    slot_availabilities = [
+        SlotAvailability(
+            slot_id=slot.id,
+            day_of_week=db_day_of_week,
+            start_time=slot.start_time,
+            end_time=slot.end_time,
+            capacity=slot.capacity,
+            remaining_capacity=remaining,
+            is_available=remaining >= people,
         )
-        .scalars()
-        .all()
-    )
-
-    # 5. If no slots found, try falling back to listing hours
-    if not slots:
-        # Get listing hours for this day
-        listing_hours = get_listing_hours(db, service.listing_id, db_day_of_week)
-        if listing_hours:
-            # Create virtual slot from listing hours using namedtuple
-            VirtualSlot = namedtuple(
-                "VirtualSlot",
-                [
-                    "id",
-                    "service_id",
-                    "day_of_week",
-                    "start_time",
-                    "end_time",
-                    "capacity",
-                    "is_virtual",
-                ],
-            )
-            slots = [
-                VirtualSlot(
-                    id=-1,  # Virtual slot ID
-                    service_id=service_id,
-                    day_of_week=db_day_of_week,
-                    start_time=listing_hours.open_time,
-                    end_time=listing_hours.close_time,
-                    capacity=service_capacity,  # Use service capacity
-                    is_virtual=True,  # Mark as virtual slot
-                )
-            ]
-        else:
-            # No slots and no listing hours - service is available anytime (24h)
-            from datetime import time as time_class
-
-            VirtualSlot = namedtuple(
-                "VirtualSlot",
-                [
-                    "id",
-                    "service_id",
-                    "day_of_week",
-                    "start_time",
-                    "end_time",
-                    "capacity",
-                    "is_virtual",
-                ],
-            )
-            slots = [
-                VirtualSlot(
-                    id=-1,  # Virtual slot ID
-                    service_id=service_id,
-                    day_of_week=db_day_of_week,
-                    start_time=time_class(0, 0, 0),  # 00:00:00
-                    end_time=time_class(23, 59, 59),  # 23:59:59
-                    capacity=service_capacity,  # Use service capacity
-                    is_virtual=True,
-                )
-            ]
+        for slot, remaining in compute_day_slot_capacity(schedule, day, loads)
+    ]
 
-    # 6. For each slot, call get_slot_remaining_capacity()
-    slot_availabilities = []
-    all_unavailable = True
+    # If ALL slots are unavailable, the day is fully booked
+    any_available = any(slot.is_available for slot in slot_availabilities)
+    return ServiceAvailableResponse(
+        service_id=service.service_id,
+        date=day.isoformat(),
+        day_of_week=db_day_of_week,
+        is_available=any_available,
+        is_open=any_available,
+        slots=slot_availabilities,
+        closed_reason=None if any_available else "fully_booked",
+    )
 
-    for slot in slots:
-        slot_date = datetime.combine(date, slot.start_time)
 
-        start_dt = datetime.combine(date, slot.start_time)
-        end_dt = datetime.combine(date, slot.end_time)
+def build_service_not_found_availability(
+    service_id: UUID, day: date
+) -> ServiceAvailableResponse:
+    # Return empty availability instead of 404 - treats deleted service as "unavailable"
+    return ServiceAvailableResponse(
+        service_id=service_id,
+        date=day.isoformat(),
+        day_of_week=to_db_day_of_week(day),
+        is_available=False,
+        is_open=False,
+        slots=[],
+        closed_reason="service_not_found",
+    )
 
-        # For virtual slots (from listing hours fallback), use service capacity minus overlapping bookings
-        if getattr(slot, "is_virtual", False):
-            remaining = get_available_slots(
-                db,
-                service_id,
-                slot.capacity,
-                start_dt,
-                end_dt,
-            )
-        else:
-            remaining = get_slot_remaining_capacity(db, service_id, slot.id, slot_date)
-
-        # 7. Set is_available: remaining >= people (for both hotels and non-hotels)
-        required = people
-        is_available = remaining >= required
-
-        if is_available:
-            all_unavailable = False
-
-        slot_availabilities.append(
-            SlotAvailability(
-                slot_id=slot.id,
-                day_of_week=db_day_of_week,
-                start_time=slot.start_time,
-                end_time=slot.end_time,
-                capacity=slot.capacity,
-                remaining_capacity=remaining,
-                is_available=is_available,
-            )
-        )
 
-    # 8. If ALL slots have is_available: false, set closed_reason: 'fully_booked'
-    closed_reason = "fully_booked" if all_unavailable else None
+def get_service_availability(
+    db: Session,
+    service_id: UUID,
+    date: date,
+    people: int,
+) -> ServiceAvailableResponse:
+    """
+    Get availability for a service on a specific date for a party size.
+    Slots fall back to listing hours, then to an all-day virtual slot.
+    For hotels, checks remaining rooms >= people; for non-hotels, each slot
+    checks remaining >= people.
+    If all slots are unavailable, sets closed_reason='fully_booked'.
+    """
+    service = get_service_descriptor(db, service_id)
+    if not service:
+        return build_service_not_found_availability(service_id, date)
 
-    # 9. Return ServiceAvailableResponse
-    return ServiceAvailableResponse(
-        service_id=service_id,
-        date=date.isoformat(),
-        day_of_week=db_day_of_week,
-        is_available=not all_unavailable,
-        is_open=not all_unavailable,
-        slots=slot_availabilities,
-        closed_reason=closed_reason,
+    is_hotel = service.is_hotel
+    schedule, loads = load_service_availability_inputs(db, service, is_hotel, date, date)
+    return build_service_day_availability(
+        service, is_hotel, date, people, schedule, loads
     )
 
 
@@ -671,18 +665,64 @@ def get_bulk_service_availability(
     db: Session,
     requests: list[BulkServiceAvailabilityRequestItem],
 ) -> BulkServiceAvailabilityResponse:
-    results = [
-        BulkServiceAvailabilityResult(
-            key=request.key,
-            availability=get_service_availability(
-                db,
-                request.service_id,
+    """
+    Answer many (service, date, people) requests with a fixed query plan:
+    service descriptors and weekly schedules come from the process caches and
+    bookings are fetched once for the whole batch (one statement, windowed per
+    service).
+    """
+    if not requests:
+        return BulkServiceAvailabilityResponse(results=[])
+
+    service_ids = list(dict.fromkeys(request.service_id for request in requests))
+    services = get_service_descriptors(db, service_ids)
+    hotel_service_ids = {
+        service_id for service_id, service in services.items() if service.is_hotel
+    }
+
+    date_ranges: dict[UUID, tuple[date, date]] = {}
+    for request in requests:
+        if request.service_id not in services:
+            continue
+        first, last = date_ranges.get(request.service_id, (request.date, request.date))
+        date_ranges[request.service_id] = (
+            min(first, request.date),
+            max(last, request.date),
+        )
+
+    loads = load_booking_loads_for_windows(
+        db,
+        {
+            service_id: get_availability_window(first, last)
+            for service_id, (first, last) in date_ranges.items()
+        },
+    )
+    slot_service_ids = [
+        service_id for service_id in date_ranges if service_id not in hotel_service_ids
+    ]
+    schedules = get_weekly_schedules(
+        db, [services[service_id] for service_id in slot_service_ids]
+    )
+
+    results = []
+    for request in requests:
+        service = services.get(request.service_id)
+        if service is None:
+            availability = build_service_not_found_availability(
+                request.service_id, request.date
+            )
+        else:
+            availability = build_service_day_availability(
+                service,
+                service.service_id in hotel_service_ids,
                 request.date,
                 request.people,
-            ),
+                schedules.get(service.service_id),
+                loads[service.service_id],
+            )
+        results.append(
+            BulkServiceAvailabilityResult(key=request.key, availability=availability)
         )
-        for request in requests
-    ]
     return BulkServiceAvailabilityResponse(results=results)
 
 
@@ -695,44 +735,196 @@ def get_mass_availability(
 ) -> MassAvailabilityResponse:
     """
     Get availability for a service across a date range (lightweight, no slot details).
-    For each date, checks if the service has any availability (open slots or capacity).
+    Loads the service, its weekly schedule and overlapping bookings once for
+    the whole range and evaluates each day in memory.
     Returns is_open=false for past dates or dates with no availability.
     """
-    availability_items = []
-    current_date = start_date
     today = date.today()
+    first_open_date = max(start_date, today)
+    service = get_service_descriptor(db, service_id)
+
+    open_dates: set[date] = set()
+    if service is not None and first_open_date <= end_date:
+        is_hotel = service.is_hotel
+        schedule, loads = load_service_availability_inputs(
+            db, service, is_hotel, first_open_date, end_date
+        )
+        open_dates = {
+            current_date
+            for current_date in iter_dates(first_open_date, end_date)
+            if is_service_open_on(
+                service, is_hotel, current_date, people, schedule, loads
+            )
+        }
 
-    while current_date <= end_date:
-        if current_date < today:
-            availability_items.append(
-                MassAvailabilityItem(
-                    date=current_date.isoformat(),
-                    is_open=False,
-                )
+    return MassAvailabilityResponse(
+        service_id=service_id,
+        start_date=start_date.isoformat(),
+        end_date=end_date.isoformat(),
+        availability=[
+            MassAvailabilityItem(
+                date=current_date.isoformat(),
+                is_open=current_date in open_dates,
             )
+            for current_date in iter_dates(start_date, end_date)
+        ],
+    )
+
+
+# ============================================================================
+# Listing Availability Heatmap
+# ============================================================================
+
+MAX_HEATMAP_DAYS = 186
+
+
+def get_listing_availability_heatmap(
+    db: Session,
+    listing_id: UUID,
+    start_date: date,
+    end_date: date,
+) -> ListingAvailabilityHeatmapResponse:
+    """
+    Remaining capacity for every active service of a listing across a date
+    range. Bookings for all services come from one ledger read over the whole
+    window; schedules and descriptors come from the process caches.
+    """
+    service_ids = (
+        db.exec(
+            select(Service.service_id)
+            .where(Service.listing_id == listing_id)
+            .where(Service.status == StatusTypes.active)
+            .order_by(Service.created_at)
+        )
+        .scalars()
+        .all()
+    )
+    services = get_service_descriptors(db, service_ids)
+    ordered = [services[service_id] for service_id in service_ids if service_id in services]
+
+    window_start, window_end = get_availability_window(start_date, end_date)
+    loads = load_booking_loads(
+        db, [service.service_id for service in ordered], window_start, window_end
+    )
+    schedules = get_weekly_schedules(
+        db, [service for service in ordered if not service.is_hotel]
+    )
+
+    today = date.today()
+    days = list(iter_dates(start_date, end_date))
+    remaining = [
+        [
+            0
+            if day < today
+            else get_day_remaining_capacity(
+                service,
+                service.is_hotel,
+                day,
+                schedules.get(service.service_id),
+                loads[service.service_id],
+            )
+            for day in days
+        ]
+        for service in ordered
+    ]
+
+    return ListingAvailabilityHeatmapResponse(
+        listing_id=listing_id,
+        start_date=start_date.isoformat(),
+        end_date=end_date.isoformat(),
+        service_ids=[service.service_id for service in ordered],
+        capacities=[get_service_capacity(service) for service in ordered],
+        remaining=remaining,
+    )
+
+
+# ============================================================================
+# Next Available Dates
+# ============================================================================
+
+MAX_NEXT_AVAILABLE_HORIZON_DAYS = 365
+NEXT_AVAILABLE_FIRST_CHUNK_DAYS = 7
+
+
+def iter_date_chunks(start_date: date, end_date: date):
+    """Consecutive (first, last) ranges that double in length: 7, 14, 28, ... days."""
+    chunk_days = NEXT_AVAILABLE_FIRST_CHUNK_DAYS
+    first = start_date
+    while first <= end_date:
+        last = min(first + timedelta(days=chunk_days - 1), end_date)
+        yield first, last
+        first = last + timedelta(days=1)
+        chunk_days *= 2
+
+
+def find_next_available_dates(
+    db: Session,
+    service_id: UUID,
+    start_date: date,
+    people: int,
+    limit: int,
+    horizon_days: int,
+) -> NextAvailableResponse:
+    """
+    Scan forward from ``start_date`` for the first ``limit`` dates that fit
+    ``people``. Weekdays whose schedule cannot take the party are skipped
+    without touching bookings; the rest are checked against ledger reads over
+    growing chunks, so a near opening costs one small query.
+    """
+    first_date = max(start_date, date.today())
+    last_date = start_date + timedelta(days=horizon_days - 1)
+    service = get_service_descriptor(db, service_id)
+
+    found: list[NextAvailableDate] = []
+    searched_until = last_date
+    if service is not None and first_date <= last_date:
+        is_hotel = service.is_hotel
+        schedule = None if is_hotel else get_weekly_schedule(db, service)
+        if is_hotel:
+            can_fit = [get_service_capacity(service) >= people] * 7
         else:
-            try:
-                service_avail = get_service_availability(
-                    db, service_id, current_date, people
-                )
-                availability_items.append(
-                    MassAvailabilityItem(
-                        date=current_date.isoformat(),
-                        is_open=service_avail.is_open,
-                    )
+            can_fit = [schedule.max_capacity(day) >= people for day in range(7)]
+
+        for chunk_first, chunk_last in iter_date_chunks(first_date, last_date):
+            candidates = [
+                day
+                for day in iter_dates(chunk_first, chunk_last)
+                if can_fit[to_db_day_of_week(day)]
+            ]
+            if not candidates:
+                continue
+
+            window_start, window_end = get_availability_window(
+                candidates[0], candidates[-1]
+            )
+            loads = load_booking_loads(db, [service_id], window_start, window_end)[
+                service_id
+            ]
+            for day in candidates:
+                availability = build_service_day_availability(
+                    service, is_hotel, day, people, schedule, loads
                 )
-            except Exception:
-                availability_items.append(
-                    MassAvailabilityItem(
-                        date=current_date.isoformat(),
-                        is_open=False,
+                if not availability.is_open:
+                    continue
+                found.append(
+                    NextAvailableDate(
+                        date=availability.date,
+                        remaining_capacity=get_day_remaining_capacity(
+                            service, is_hotel, day, schedule, loads
+                        ),
+                        slots=[slot for slot in availability.slots if slot.is_available],
                     )
                 )
-        current_date = current_date + timedelta(days=1)
+                if len(found) == limit:
+                    searched_until = day
+                    break
+            if len(found) == limit:
+                break
 
-    return MassAvailabilityResponse(
+    return NextAvailableResponse(
         service_id=service_id,
+        people=people,
         start_date=start_date.isoformat(),
-        end_date=end_date.isoformat(),
-        availability=availability_items,
+        searched_until=searched_until.isoformat(),
+        dates=found,
     )
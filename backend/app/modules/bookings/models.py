@@ -3,8 +3,8 @@ from typing import Optional
 from uuid import UUID
 from enum import Enum
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, Text, text, Numeric
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import BigInteger, Column, Computed, DateTime, ForeignKey, Index, Integer, Text, func, literal_column, text, Numeric
+from sqlalchemy.dialects.postgresql import TSRANGE, UUID as PGUUID
 from sqlalchemy import Enum as SAEnum
 from sqlmodel import Field, SQLModel, Relationship
 
@@ -159,6 +159,33 @@ class Booking(SQLModel, table=True):
     )
 
 
+# ``booking_period`` is generated by Postgres as [booking_from_time, booking_to_time)
+# and GiST-indexed with service_id, so overlap lookups are a single index probe.
+# It lives on the table only, not as a model field: the ORM never selects or
+# writes it, and queries reach it through ``booking_period_overlaps``.
+BOOKING_PERIOD_SQL = (
+    "CASE WHEN booking_from_time < booking_to_time "
+    "THEN tsrange(booking_from_time, booking_to_time, '[)') END"
+)
+
+Booking.__table__.append_column(
+    Column("booking_period", TSRANGE, Computed(BOOKING_PERIOD_SQL, persisted=True))
+)
+Index(
+    "ix_bookings_service_period_gist",
+    Booking.__table__.c.service_id,
+    Booking.__table__.c.booking_period,
+    postgresql_using="gist",
+)
+
+
+def booking_period_overlaps(from_time: datetime, to_time: datetime):
+    """``booking_period && [from_time, to_time)`` - back-to-back periods do not overlap."""
+    return Booking.__table__.c.booking_period.overlaps(
+        func.tsrange(from_time, to_time, literal_column("'[)'"), type_=TSRANGE)
+    )
+
+
 from app.modules.stripe_payment.models import PaymentEvent
 
 
@@ -10,7 +10,9 @@ from apscheduler.schedulers.background import BackgroundScheduler
 
 from app.infrastructure.database.engine import get_engine
 from app.infrastructure.database.session import get_db
+from app.modules.availability.occupancy import reconcile_slot_occupancy
 from app.modules.bookings.service import update_expired_bookings
+from app.modules.recommendations.taste import rebuild_user_tastes
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,36 @@ def run_update_expired_bookings() -> None:
             db.close()
 
 
+def run_reconcile_slot_occupancy() -> None:
+    """Rebuild the slot occupancy ledger from bookings and log any drift."""
+    logger.info("Running reconcile_slot_occupancy job")
+    for db in get_db():
+        try:
+            result = reconcile_slot_occupancy(db)
+            logger.info("reconcile_slot_occupancy job completed: %s", result)
+            return
+        except Exception:
+            logger.exception("reconcile_slot_occupancy job failed")
+            raise
+        finally:
+            db.close()
+
+
+def run_rebuild_user_tastes() -> None:
+    """Recompute taste vectors from history, picking up newly (re-)embedded listings."""
+    logger.info("Running rebuild_user_tastes job")
+    for db in get_db():
+        try:
+            result = rebuild_user_tastes(db)
+            logger.info("rebuild_user_tastes job completed: %s", result)
+            return
+        except Exception:
+            logger.exception("rebuild_user_tastes job failed")
+            raise
+        finally:
+            db.close()
+
+
 def init_scheduler() -> None:
     """Start the scheduler if not already running, and register jobs."""
     if not scheduler.running:
@@ -81,3 +113,22 @@ def init_scheduler() -> None:
         name="Update expired booking statuses",
         replace_existing=True,
     )
+
+    scheduler.add_job(
+        run_reconcile_slot_occupancy,
+        trigger="cron",
+        minute=17,
+        id="reconcile_slot_occupancy",
+        name="Reconcile slot occupancy ledger",
+        replace_existing=True,
+    )
+
+    scheduler.add_job(
+        run_rebuild_user_tastes,
+        trigger="cron",
+        hour=3,
+        minute=41,
+        id="rebuild_user_tastes",
+        name="Rebuild user taste vectors",
+        replace_existing=True,
+    )
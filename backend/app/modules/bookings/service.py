@@ -8,7 +8,7 @@ from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy import func
-from sqlmodel import Session, col, select, update
+from sqlmodel import Session, select, update
 
 from app.modules.availability.service import (
     get_available_slots as availability_get_available_slots,
@@ -17,6 +17,13 @@ from app.modules.availability.service import (
     is_available as availability_is_available,
 )
 from app.modules.availability.models import ServiceSlots
+from app.modules.availability.occupancy import (
+    OccupancyContribution,
+    booking_contribution,
+    release_occupancy,
+    reserve_overlapping_occupancy,
+    sync_booking_occupancy,
+)
 from app.modules.bookings.schemas import BookingCreate, BookingResponse
 from app.modules.businesses.models import BusinessType
 from app.modules.discounts.service import (
@@ -27,18 +34,22 @@ from app.modules.discounts.service import (
 from app.modules.itineraries.models import Itinerary, ItineraryItem
 from app.modules.listings.models import Listing
 from app.modules.pricing.models import PlatformPricingConfig
+from app.modules.recommendations.taste import (
+    record_booking_status_changed,
+)
 from app.modules.pricing.service import (
     calculate_display_price,
     normalize_fractional_percent as normalize_pricing_percent,
     query_active_config,
 )
+from app.modules.services.cache import get_service_descriptor, get_service_descriptors
 from app.modules.services.models import Service, StatusTypes
 from app.modules.stripe_payment.models import PaymentEvent
 from app.shared.domain import (
     get_owned_itinerary_item_context_or_404,
     get_service_or_404,
 )
-from .models import Booking, BookingStatus
+from .models import Booking, BookingStatus, booking_period_overlaps
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +58,6 @@ logger = logging.getLogger(__name__)
 class BookingCreationContext:
     services: dict[UUID, Service] = field(default_factory=dict)
     listings: dict[UUID, Listing | None] = field(default_factory=dict)
-    business_types: dict[UUID, BusinessType | None] = field(default_factory=dict)
     itinerary_items: dict[UUID, ItineraryItem] = field(default_factory=dict)
     itineraries: dict[UUID, Itinerary] = field(default_factory=dict)
     display_prices: dict[tuple[UUID, UUID | None], dict] = field(default_factory=dict)
@@ -55,7 +65,6 @@ class BookingCreationContext:
         default_factory=dict
     )
     package_discounts: dict[UUID, object | None] = field(default_factory=dict)
-    slot_selection_required: dict[tuple[UUID, int], bool] = field(default_factory=dict)
 
 
 def get_service_for_booking_or_404(
@@ -90,23 +99,6 @@ def get_listing_for_booking(
     return listing
 
 
-def get_business_type_for_booking(
-    db: Session,
-    business_type_id: UUID | None,
-    *,
-    context: BookingCreationContext | None = None,
-) -> BusinessType | None:
-    if business_type_id is None:
-        return None
-    if context is not None and business_type_id in context.business_types:
-        return context.business_types[business_type_id]
-
-    business_type = db.get(BusinessType, business_type_id)
-    if context is not None:
-        context.business_types[business_type_id] = business_type
-    return business_type
-
-
 def get_owned_itinerary_item_context_cached_or_404(
     db: Session,
     itinerary_item_id: UUID,
@@ -124,48 +116,19 @@ def get_owned_itinerary_item_context_cached_or_404(
     return get_owned_itinerary_item_context_or_404(db, itinerary_item_id, user_id)
 
 
-def get_service_business_type_name(
-    db: Session,
-    service: Service,
-    *,
-    context: BookingCreationContext | None = None,
-) -> str | None:
-    if not service.listing_id:
-        return None
-
-    listing = get_listing_for_booking(db, service.listing_id, context=context)
-    if not listing or not listing.business_type:
-        return None
-
-    business_type = get_business_type_for_booking(
-        db,
-        listing.business_type,
-        context=context,
-    )
-    if not business_type or not business_type.name:
-        return None
-
-    return business_type.name.lower()
+def get_service_business_type_name(db: Session, service: Service) -> str | None:
+    descriptor = get_service_descriptor(db, service.service_id)
+    return descriptor.business_type_name if descriptor is not None else None
 
 
-def is_hotel_service(
-    db: Session,
-    service: Service,
-    *,
-    context: BookingCreationContext | None = None,
-) -> bool:
+def is_hotel_service(db: Session, service: Service) -> bool:
     """Check if a service belongs to a hotel business type."""
-    return get_service_business_type_name(db, service, context=context) == "hotel"
+    return get_service_business_type_name(db, service) == "hotel"
 
 
-def is_restaurant_service(
-    db: Session,
-    service: Service,
-    *,
-    context: BookingCreationContext | None = None,
-) -> bool:
+def is_restaurant_service(db: Session, service: Service) -> bool:
     """Check if a service belongs to a restaurant business type."""
-    return get_service_business_type_name(db, service, context=context) == "restaurant"
+    return get_service_business_type_name(db, service) == "restaurant"
 
 
 def get_pricing_config_cached(
@@ -193,7 +156,7 @@ def calculate_display_price_for_booking(
     context: BookingCreationContext | None = None,
 ) -> dict:
     if context is None:
-        return calculate_display_price(db, listing_id, service_id)
+        return calculate_display_price(db, listing_id, service_id, cached=False)
 
     cache_key = (listing_id, service_id)
     if cache_key in context.display_prices:
@@ -281,20 +244,8 @@ def build_booking_creation_context(
             listings = db.exec(select(Listing).where(Listing.id.in_(listing_ids))).all()
             context.listings = {listing.id: listing for listing in listings}
 
-            business_type_ids = list(
-                {
-                    listing.business_type
-                    for listing in listings
-                    if getattr(listing, "business_type", None) is not None
-                }
-            )
-            if business_type_ids:
-                business_types = db.exec(
-                    select(BusinessType).where(BusinessType.id.in_(business_type_ids))
-                ).all()
-                context.business_types = {
-                    business_type.id: business_type for business_type in business_types
-                }
+        # Warm the shared descriptor cache for the whole batch in one query
+        get_service_descriptors(db, service_ids)
 
     itinerary_item_ids = list(
         {item.itinerary_item_id for item in items if item.itinerary_item_id is not None}
@@ -540,26 +491,11 @@ def booking_requires_slot_selection(
     if booking_from_time is None:
         return False
 
-    day_of_week = get_booking_day_of_week(booking_from_time)
-    cache_key = (service_id, day_of_week)
-    if context is not None and cache_key in context.slot_selection_required:
-        return context.slot_selection_required[cache_key]
-
-    service = get_service_for_booking_or_404(db, service_id, context=context)
-    if service and is_hotel_service(db, service, context=context):
-        if context is not None:
-            context.slot_selection_required[cache_key] = False
+    descriptor = get_service_descriptor(db, service_id)
+    if descriptor is None:
+        get_service_for_booking_or_404(db, service_id, context=context)
         return False
-
-    slot = db.exec(
-        select(ServiceSlots.id)
-        .where(ServiceSlots.service_id == service_id)
-        .where(ServiceSlots.day_of_week == day_of_week)
-    ).first()
-    requires_slot = slot is not None
-    if context is not None:
-        context.slot_selection_required[cache_key] = requires_slot
-    return requires_slot
+    return descriptor.requires_slot(get_booking_day_of_week(booking_from_time))
 
 
 def resolve_booking_slot_context(
@@ -630,26 +566,20 @@ def validate_slot_capacity(
     booking_to_time: datetime,
     amount_of_people: int,
     *,
-    exclude_booking_id: UUID | None = None,
+    exclude: OccupancyContribution | None = None,
 ) -> None:
     if amount_of_people < 1:
         raise HTTPException(
             status_code=400, detail="Amount of people must be at least 1"
         )
 
-    booked_count_query = (
-        select(func.coalesce(func.sum(Booking.amount_of_people), 0))
-        .where(Booking.service_id == slot.service_id)
-        .where(
-            col(Booking.status).notin_([BookingStatus.cancelled, BookingStatus.pending])
-        )
-        .where(Booking.booking_from_time < booking_to_time)
-        .where(Booking.booking_to_time > booking_from_time)
+    booked_count = availability_get_booked_count(
+        db,
+        slot.service_id,
+        booking_from_time,
+        booking_to_time,
+        exclude=exclude,
     )
-    if exclude_booking_id is not None:
-        booked_count_query = booked_count_query.where(Booking.id != exclude_booking_id)
-
-    booked_count = int(db.exec(booked_count_query).one())
     available_capacity = slot.capacity - booked_count
     if available_capacity < amount_of_people:
         raise HTTPException(
@@ -661,6 +591,42 @@ def validate_slot_capacity(
         )
 
 
+def reserve_booking_capacity(
+    db: Session,
+    booking: Booking,
+    capacity: int | None,
+    *,
+    previous: OccupancyContribution | None = None,
+) -> bool:
+    """
+    Claim capacity for a booking that consumes it, atomically.
+
+    The read-then-insert checks above are advisory; this is the step that
+    decides under concurrency, summing every overlapping window of the service
+    under its exclusive lock. Returns False when the capacity is gone, leaving
+    the ledger untouched.
+    """
+    contribution = booking_contribution(booking)
+    if contribution == previous:
+        return True
+    if contribution is None or capacity is None:
+        sync_booking_occupancy(db, previous, booking)
+        return True
+    return reserve_overlapping_occupancy(db, contribution, capacity, exclude=previous)
+
+
+def get_booking_capacity(db: Session, booking: Booking) -> int | None:
+    """Capacity the booking draws from: its slot's, else the service's."""
+    if booking.service_slot_id is not None:
+        slot = db.get(ServiceSlots, booking.service_slot_id)
+        if slot is not None:
+            return slot.capacity
+    if booking.service_id is None:
+        return None
+    service = db.get(Service, booking.service_id)
+    return service.capacity if service is not None else None
+
+
 def validate_service_for_booking(
     db: Session,
     service_id: UUID,
@@ -756,11 +722,7 @@ def price_booking_from_itinerary_item(
     base_price = float(price_info.get("base_price", 0.0))
 
     # Apply per-person pricing for non-hotel services
-    is_hotel = (
-        is_hotel_service(db, service)
-        if context is None
-        else is_hotel_service(db, service, context=context)
-    )
+    is_hotel = is_hotel_service(db, service)
     if not is_hotel:
         base_price = base_price * amount_of_people
     else:
@@ -834,7 +796,7 @@ def price_booking_by_id(db: Session, booking_id: UUID, user_id: UUID) -> dict:
 
     # Standalone booking: recalculate from per-person/night price
     # This ensures price reflects current amount_of_people and hotel days
-    price_info = calculate_display_price(db, listing_id, booking.service_id)
+    price_info = calculate_display_price(db, listing_id, booking.service_id, cached=False)
     per_person_base = float(price_info.get("base_price", 0.0))
     service_fee_percent = float(price_info.get("service_fee_percent", 0.10))
     
@@ -952,11 +914,7 @@ def create_booking_record(
     # Virtual slots (id=-1) have no real ServiceSlots record - store NULL instead
     if is_virtual_slot:
         booking_record.service_slot_id = None
-    if (
-        is_restaurant_service(db, service)
-        if context is None
-        else is_restaurant_service(db, service, context=context)
-    ):
+    if is_restaurant_service(db, service):
         booking_record.status = BookingStatus.approved
 
     # If booking is tied to an itinerary item, calculate price accordingly
@@ -989,11 +947,7 @@ def create_booking_record(
             context=context,
         )
         # Determine if this is a hotel service for per-person pricing
-        is_hotel = (
-            is_hotel_service(db, service)
-            if context is None
-            else is_hotel_service(db, service, context=context)
-        )
+        is_hotel = is_hotel_service(db, service)
         people = booking.amount_of_people or 1
 
         # base_price from pricing service is per-person (or per-room for hotels)
@@ -1018,7 +972,17 @@ def create_booking_record(
         booking_record.display_price = display_price
         booking_record.final_price = final_price
 
+    if not reserve_booking_capacity(
+        db,
+        booking_record,
+        slot.capacity if slot is not None else service.capacity,
+    ):
+        raise HTTPException(
+            status_code=409,
+            detail="Selected time slot is no longer available for the requested party size",
+        )
     db.add(booking_record)
+    record_booking_status_changed(db, booking_record, None, service.listing_id)
     if commit:
         db.commit()
         db.refresh(booking_record)
@@ -1059,6 +1023,9 @@ def create_bulk_bookings(
 
 
 def update_booking(db: Session, booking: Booking, update_data: dict) -> Booking:
+    previous_occupancy = booking_contribution(booking)
+    previous_status = booking.status
+    service = db.get(Service, booking.service_id) if booking.service_id is not None else None
     slot: ServiceSlots | None = None
     new_service_slot_id = update_data.get("service_slot_id", booking.service_slot_id)
     new_from_time = update_data.get("booking_from_time", booking.booking_from_time)
@@ -1115,7 +1082,7 @@ def update_booking(db: Session, booking: Booking, update_data: dict) -> Booking:
                 )
 
         # Capacity check - count approved bookings overlapping with new time, excluding self
-        if booking.service_id is not None and booking.service is not None:
+        if service is not None:
             if slot is not None:
                 validate_slot_capacity(
                     db,
@@ -1123,19 +1090,18 @@ def update_booking(db: Session, booking: Booking, update_data: dict) -> Booking:
                     new_from_time,
                     new_to_time,
                     update_data.get("amount_of_people", booking.amount_of_people or 1),
-                    exclude_booking_id=booking.id,
+                    exclude=previous_occupancy,
                 )
-            elif booking.service.capacity is not None:
-                booked_count = db.exec(
-                    select(func.coalesce(func.sum(Booking.amount_of_people), 0))
-                    .where(Booking.service_id == booking.service_id)
-                    .where(Booking.status == BookingStatus.approved)
-                    .where(Booking.id != booking.id)
-                    .where(Booking.booking_from_time < new_to_time)
-                    .where(Booking.booking_to_time > new_from_time)
-                ).one_or_none()
-
-                available = booking.service.capacity - int(booked_count)
+            elif service.capacity is not None:
+                booked_count = availability_get_booked_count(
+                    db,
+                    booking.service_id,
+                    new_from_time,
+                    new_to_time,
+                    exclude=previous_occupancy,
+                )
+
+                available = service.capacity - int(booked_count)
                 if available < (
                     update_data.get("amount_of_people", booking.amount_of_people or 1)
                 ):
@@ -1156,6 +1122,22 @@ def update_booking(db: Session, booking: Booking, update_data: dict) -> Booking:
     for key, value in update_data.items():
         setattr(booking, key, value)
 
+    if slot is not None:
+        capacity = slot.capacity
+    else:
+        capacity = service.capacity if service is not None else None
+    if not reserve_booking_capacity(
+        db,
+        booking,
+        capacity,
+        previous=previous_occupancy,
+    ):
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Not enough capacity for requested time",
+        )
+    record_booking_status_changed(db, booking, previous_status)
     db.commit()
     db.refresh(booking)
     return booking
@@ -1194,11 +1176,15 @@ def cancel_booking(
         # Refund succeeded - now cancel the booking
 
     # Update booking status to cancelled
+    previous_occupancy = booking_contribution(booking)
+    previous_status = booking.status
     booking.status = BookingStatus.cancelled
     booking.cancelled_by_role = cancelled_by_role
     booking.cancellation_reason = cancellation_reason
     booking.cancelled_at = datetime.utcnow()
 
+    sync_booking_occupancy(db, previous_occupancy, booking)
+    record_booking_status_changed(db, booking, previous_status)
     db.commit()
     db.refresh(booking)
     return booking
@@ -1286,8 +1272,8 @@ def check_booking_conflict(
     Only `approved` bookings block - `completed` does NOT block because the booking
     period has passed. `cancelled` and `pending` also do not block.
 
-    Overlap formula: (booking_from_time < to_time) AND (booking_to_time > from_time)
-    Back-to-back bookings (A ends at 11:00, B starts at 11:00) do NOT conflict.
+    Overlap is ``booking_period && [from_time, to_time)`` on the GiST-indexed
+    generated range column. Back-to-back bookings (A ends at 11:00, B starts at 11:00) do NOT conflict.
 
     Returns True if conflict exists, False otherwise.
     """
@@ -1295,8 +1281,7 @@ def check_booking_conflict(
         select(Booking)
         .where(Booking.service_id == service_id)
         .where(Booking.status == BookingStatus.approved)
-        .where(Booking.booking_from_time < to_time)
-        .where(Booking.booking_to_time > from_time)
+        .where(booking_period_overlaps(from_time, to_time))
     )
 
     if exclude_booking_id is not None:
@@ -1316,15 +1301,29 @@ def update_expired_bookings(db: Session) -> dict:
     """
     now = datetime.utcnow()
 
-    # Bulk update approved bookings to completed
-    approved_result = db.exec(
+    # Bulk update approved bookings to completed and release their occupancy
+    completed_rows = db.exec(
         update(Booking)
         .where(Booking.status == BookingStatus.approved)
         .where(Booking.booking_to_time.isnot(None))
         .where(Booking.booking_to_time < now)
         .values(status=BookingStatus.completed)
+        .returning(
+            Booking.service_id,
+            Booking.booking_from_time,
+            Booking.booking_to_time,
+            Booking.amount_of_people,
+        )
+    ).all()
+    approved_count = len(completed_rows)
+    release_occupancy(
+        db,
+        [
+            OccupancyContribution(service_id, from_time, to_time, int(people or 0))
+            for service_id, from_time, to_time, people in completed_rows
+            if service_id is not None and from_time is not None
+        ],
     )
-    approved_count = approved_result.rowcount
 
     # Bulk update pending bookings to cancelled
     pending_result = db.exec(
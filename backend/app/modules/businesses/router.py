@@ -1,11 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import Session
 
 from app.infrastructure.database import get_db
 from app.modules.listings.service import get_business_listings as get_business_listings_service
 from app.shared.dependencies.permissions import require_business_owner, require_roles
+from app.shared.pagination import set_next_cursor_header
 
 from .models import Business
 from .schemas import BusinessCreate, BusinessUpdate, BusinessResponse
@@ -50,11 +51,16 @@ def get_my_business(
 
 @router.get("/listings", response_model=List[dict])
 def get_business_listings(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    cursor: str | None = Query(default=None),
     current_user=Depends(require_roles("business", "admin")),
     db: Session = Depends(get_db),
 ):
     require_user_id(current_user.id)
-    return get_business_listings_service(db, current_user.id)
+    page = get_business_listings_service(db, current_user.id, limit=limit, cursor=cursor)
+    set_next_cursor_header(response, page)
+    return page.items
 
 
 @router.get("/types", response_model=List[dict])
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from app.modules.businesses.models import Business, BusinessType
 from app.modules.listings.models import EmployeeListings, Listing
+from app.modules.listings.suggest import rename_business_suggestions
 from app.modules.users.models import User
 from app.modules.users.schemas import UserCreate
 from app.modules.users.service import create_user
@@ -86,6 +87,7 @@ def update_business(
         setattr(business, key, value)
     db.commit()
     db.refresh(business)
+    rename_business_suggestions(business.id, business.business_name)
     return serialize_business(business)
 
 def get_business_employees(db: Session, user_id: UUID) -> list[dict]:
@@ -1,12 +1,11 @@
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from app.modules.businesses.models import Business
 from app.modules.listings.models import EmployeeListings, Listing
-from app.modules.listings.service import serialize_listings
+from app.modules.listings.service import select_listing_cards, serialize_listing_rows
 from app.modules.users.models import User
 from app.shared.domain import (
     get_employee_business_link_or_404,
@@ -20,14 +19,13 @@ from .models import Business_Employee
 def get_employee_listings(db: Session, employee_id: UUID):
     get_employee_business_link_or_404(db, employee_id)
 
-    listings = db.exec(
-        select(Listing)
+    rows = db.exec(
+        select_listing_cards()
         .join(EmployeeListings, EmployeeListings.listing_id == Listing.id)
         .where(EmployeeListings.employee_id == employee_id)
-        .options(selectinload(Listing.business_type_rel))
     ).all()
 
-    return serialize_listings(db, listings)
+    return serialize_listing_rows(db, rows)
 
 
 def get_employees_for_listing(db: Session, listing_id: UUID, business_owner_id: UUID):
@@ -1,35 +1,46 @@
 from fastapi import HTTPException
+from sqlalchemy.orm import undefer_group
 from sqlmodel import Session, select
 
-from app.modules.listings.models import Listing
-from app.modules.listings.service import serialize_listings
+from app.modules.listings.models import LISTING_PAYLOAD_GROUP, Listing
+from app.modules.listings.service import (
+    select_listing_cards,
+    serialize_listing_rows,
+    serialize_listings,
+)
+from app.modules.recommendations.taste import (
+    record_favourite_added,
+    record_favourite_removed,
+)
 
 from .models import Favourites
 
 
 def list_favourites(db: Session, user_id):
     query = (
-        select(Favourites, Listing)
-        .join(Listing, Favourites.listing_id == Listing.id)
+        select_listing_cards(
+            Favourites.id.label("favourite_id"),
+            Favourites.created_at.label("favourited_at"),
+        )
+        .join(Favourites, Favourites.listing_id == Listing.id)
         .where(Favourites.user_id == user_id)
     )
     rows = db.exec(query).all()
-    serialized_listings = serialize_listings(db, [listing for _, listing in rows])
-    listings_by_id = {listing["id"]: listing for listing in serialized_listings}
+    serialized_listings = serialize_listing_rows(db, rows)
     return [
         {
-            "id": favourite.id,
-            "user_id": favourite.user_id,
-            "listing_id": favourite.listing_id,
-            "created_at": favourite.created_at,
-            "listing": listings_by_id.get(favourite.listing_id),
+            "id": row.favourite_id,
+            "user_id": user_id,
+            "listing_id": row.id,
+            "created_at": row.favourited_at,
+            "listing": listing,
         }
-        for favourite, listing in rows
+        for row, listing in zip(rows, serialized_listings)
     ]
 
 
 def add_favourite(db: Session, user_id, listing_id):
-    listing = db.get(Listing, listing_id)
+    listing = db.get(Listing, listing_id, options=[undefer_group(LISTING_PAYLOAD_GROUP)])
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
 
@@ -44,6 +55,7 @@ def add_favourite(db: Session, user_id, listing_id):
 
     favourite = Favourites(user_id=user_id, listing_id=listing_id)
     db.add(favourite)
+    record_favourite_added(db, user_id, listing_id)
     db.commit()
     db.refresh(favourite)
     serialized_listing = serialize_listings(db, [listing])[0]
@@ -66,5 +78,6 @@ def remove_favourite(db: Session, user_id, listing_id):
     if not favourite:
         raise HTTPException(status_code=404, detail="Favourite not found")
 
+    record_favourite_removed(db, favourite)
     db.delete(favourite)
     db.commit()
@@ -6,7 +6,7 @@ from math import atan2, cos, radians, sin, sqrt
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 from sqlmodel import Session, select
 
 from app.modules.interests.models import Interests, UserInterest
@@ -99,6 +99,7 @@ def load_candidates(db: Session, request: ItineraryPlanRequest) -> list[Candidat
         .options(
             selectinload(Listing.business_type_rel),
             selectinload(Listing.interests),
+            undefer(Listing.details),
         )
         .order_by(Listing.created_at.desc(), Listing.id)
     )
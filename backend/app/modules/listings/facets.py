@@ -0,0 +1,112 @@
+"""Facet counts for listing browse and search.
+
+Counts per business type, price bucket and city come from one GROUPING SETS
+statement over the same WHERE clauses as the result page, so the browse UI no
+longer needs extra calls or client-side tallies. Results are cached per filter
+combination for ``LISTING_FACETS_CACHE_TTL_SECONDS``; counts may lag listing
+writes by that long.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable
+
+from sqlalchemy import case, func, select, tuple_
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.modules.businesses.models import BusinessType
+from app.shared.cache import VersionedTTLCache
+
+from .models import Listing
+
+# Upper bounds of the price buckets; the last bucket is open-ended
+PRICE_FACET_EDGES = (50, 100, 200, 500)
+LISTING_FACETS_CACHE_MAX_ENTRIES = 1024
+
+# GROUPING(business_type, price_bucket, city) sets a bit per column left out
+BUSINESS_TYPE_SET, PRICE_SET, CITY_SET = 0b011, 0b101, 0b110
+
+
+def price_bucket_expr():
+    return case(
+        (Listing.base_price.is_(None), None),
+        *(
+            (Listing.base_price < edge, index)
+            for index, edge in enumerate(PRICE_FACET_EDGES)
+        ),
+        else_=len(PRICE_FACET_EDGES),
+    )
+
+
+def price_bucket_bounds(index: int) -> tuple[int, int | None]:
+    low = PRICE_FACET_EDGES[index - 1] if index else 0
+    high = PRICE_FACET_EDGES[index] if index < len(PRICE_FACET_EDGES) else None
+    return low, high
+
+
+def select_listing_facets(filters: list):
+    faceted = (
+        select(
+            Listing.business_type.label("business_type"),
+            BusinessType.name.label("business_type_name"),
+            price_bucket_expr().label("price_bucket"),
+            func.coalesce(Listing.address["city"].astext, "Unknown").label("city"),
+        )
+        .outerjoin(BusinessType, BusinessType.id == Listing.business_type)
+        .where(*filters)
+        .subquery("faceted")
+    )
+    return select(
+        faceted.c.business_type,
+        faceted.c.business_type_name,
+        faceted.c.price_bucket,
+        faceted.c.city,
+        func.grouping(
+            faceted.c.business_type, faceted.c.price_bucket, faceted.c.city
+        ).label("grouping_set"),
+        func.count().label("count"),
+    ).group_by(
+        func.grouping_sets(
+            tuple_(faceted.c.business_type, faceted.c.business_type_name),
+            faceted.c.price_bucket,
+            faceted.c.city,
+        )
+    )
+
+
+def load_listing_facets(db: Session, filters: list) -> dict:
+    facets = {"business_type": [], "price": [], "city": []}
+    for row in db.exec(select_listing_facets(filters)).all():
+        count = int(row.count)
+        if row.grouping_set == BUSINESS_TYPE_SET and row.business_type is not None:
+            facets["business_type"].append(
+                {
+                    "value": str(row.business_type),
+                    "label": row.business_type_name,
+                    "count": count,
+                }
+            )
+        elif row.grouping_set == PRICE_SET and row.price_bucket is not None:
+            low, high = price_bucket_bounds(row.price_bucket)
+            facets["price"].append({"min": low, "max": high, "count": count})
+        elif row.grouping_set == CITY_SET:
+            facets["city"].append({"value": row.city, "count": count})
+
+    facets["business_type"].sort(key=lambda item: (-item["count"], item["label"] or ""))
+    facets["price"].sort(key=lambda item: item["min"])
+    facets["city"].sort(key=lambda item: (-item["count"], item["value"]))
+    return facets
+
+
+listing_facets_cache: VersionedTTLCache[Hashable, dict] = VersionedTTLCache(
+    settings.LISTING_FACETS_CACHE_TTL_SECONDS,
+    max_entries=LISTING_FACETS_CACHE_MAX_ENTRIES,
+)
+
+
+def get_listing_facets(db: Session, key: Hashable, filters: list) -> dict:
+    """``key`` identifies the filter combination that produced ``filters``."""
+    return listing_facets_cache.get_many(
+        [key], lambda _: {key: load_listing_facets(db, filters)}
+    )[key]
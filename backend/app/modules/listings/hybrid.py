@@ -0,0 +1,216 @@
+"""Hybrid listing search.
+
+Three retrievers each return their best candidates: full-text (``ts_rank``
+over ``search_vector``), vector similarity of the query embedding, and geo
+proximity (GiST KNN). They run in parallel on their own sessions, and their
+rankings are merged with reciprocal rank fusion, so a listing scores
+``sum(1 / (RRF_K + rank))`` over the legs that found it. Only ranks matter,
+so the legs' incomparable scores (ts_rank, cosine, metres) need no tuning.
+
+Pages walk the fused list with a keyset cursor on ``(score, id)``. Every page
+reruns the legs, so the fused list is bounded by ``HYBRID_CANDIDATES`` per leg.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import time
+from typing import Callable
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import Float, func
+from sqlmodel import Session, select
+
+from app.modules.recommendations.service import embed_query, nearest_listing_ids
+from app.shared.pagination import decode_cursor, encode_cursor
+
+from .models import Listing
+from .service import (
+    ACTIVE_LIKE_STATUSES,
+    ListingPage,
+    search_filters,
+    search_point,
+    select_listing_cards,
+    serialize_listing_rows,
+)
+
+# Candidates each leg contributes to the fusion
+HYBRID_CANDIDATES = 100
+# The usual RRF constant; damps the gap between the first few ranks
+RRF_K = 60
+HYBRID_SEARCH_ORDERING = "rrf:desc"
+
+SearchLeg = Callable[[Session], list[UUID]]
+
+_leg_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="hybrid-search")
+
+
+@dataclass
+class HybridListingPage(ListingPage):
+    """A fused page, with how long each stage took in milliseconds."""
+
+    timings: dict[str, float] | None = None
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def select_text_candidates(q: str, lat, lng, radius_km: float, limit: int):
+    search_vector = Listing.__table__.c.search_vector
+    rank = func.ts_rank(search_vector, func.plainto_tsquery("english", q))
+    return (
+        select(Listing.id)
+        .where(*search_filters(q, lat, lng, radius_km, fuzzy=False))
+        .order_by(rank.desc(), Listing.id)
+        .limit(limit)
+    )
+
+
+def select_geo_candidates(lat: float, lng: float, radius_km: float, limit: int):
+    distance = Listing.location.op("<->", return_type=Float)(search_point(lat, lng))
+    return (
+        select(Listing.id)
+        .where(*search_filters(None, lat, lng, radius_km, fuzzy=False))
+        .order_by(distance, Listing.id)
+        .limit(limit)
+    )
+
+
+def search_legs(
+    q: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float,
+    timings: dict[str, float],
+) -> dict[str, SearchLeg]:
+    """The retrievers that apply to a request, by name."""
+    legs: dict[str, SearchLeg] = {}
+    has_point = lat is not None and lng is not None
+    if q:
+        legs["text"] = lambda db: list(
+            db.exec(select_text_candidates(q, lat, lng, radius_km, HYBRID_CANDIDATES)).all()
+        )
+
+        def vector_leg(db: Session) -> list[UUID]:
+            started = time.perf_counter()
+            vector = embed_query(q)
+            timings["embed"] = _elapsed_ms(started)
+            if vector is None:
+                return []
+            hits = nearest_listing_ids(
+                db,
+                vector,
+                HYBRID_CANDIDATES,
+                center=(lat, lng) if has_point else None,
+                radius_km=radius_km if has_point else None,
+            )
+            return [listing_id for listing_id, _ in hits]
+
+        legs["vector"] = vector_leg
+    if has_point:
+        legs["geo"] = lambda db: list(
+            db.exec(select_geo_candidates(lat, lng, radius_km, HYBRID_CANDIDATES)).all()
+        )
+    return legs
+
+
+def run_search_legs(
+    open_session: Callable[[], Session],
+    legs: dict[str, SearchLeg],
+    timings: dict[str, float],
+) -> dict[str, list[UUID]]:
+    """Run every leg at once, each on its own session, timing each one."""
+
+    def run(leg: SearchLeg) -> tuple[list[UUID], float]:
+        started = time.perf_counter()
+        with open_session() as db:
+            ranked = leg(db)
+        return ranked, _elapsed_ms(started)
+
+    futures = {name: _leg_pool.submit(run, leg) for name, leg in legs.items()}
+    rankings = {}
+    for name, future in futures.items():
+        rankings[name], timings[name] = future.result()
+    return rankings
+
+
+def reciprocal_rank_fusion(
+    rankings: dict[str, list[UUID]], k: int = RRF_K
+) -> list[tuple[UUID, float]]:
+    """``(listing_id, score)`` best first; ties go to the higher id, as the cursor expects."""
+    scores: dict[UUID, float] = {}
+    for ranked in rankings.values():
+        for rank, listing_id in enumerate(ranked, start=1):
+            scores[listing_id] = scores.get(listing_id, 0.0) + 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+
+def hybrid_search_listings(
+    db: Session,
+    q: str | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float = 25,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> HybridListingPage:
+    """
+    Listings ranked by fusing full-text, query-embedding and proximity
+    candidates. A radius around ``lat``/``lng`` bounds every leg. Cards carry
+    their fused ``score``; ``timings`` holds each stage's milliseconds.
+    """
+    if not q and (lat is None or lng is None):
+        raise HTTPException(
+            status_code=400, detail="Hybrid search needs q or lat and lng"
+        )
+    started = time.perf_counter()
+    after = decode_cursor(cursor, HYBRID_SEARCH_ORDERING) if cursor else None
+    if after is not None and (
+        isinstance(after[0], bool) or not isinstance(after[0], (int, float))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    timings: dict[str, float] = {}
+    bind = db.get_bind()
+    rankings = run_search_legs(
+        lambda: Session(bind),
+        search_legs(q, lat, lng, radius_km, timings),
+        timings,
+    )
+
+    stage = time.perf_counter()
+    fused = reciprocal_rank_fusion(rankings)
+    if after is not None:
+        score, last_id = after[0], UUID(after[1])
+        fused = [item for item in fused if (item[1], item[0]) < (score, last_id)]
+    window, more = fused[:limit], len(fused) > limit
+    timings["fuse"] = _elapsed_ms(stage)
+
+    stage = time.perf_counter()
+    rows_by_id = (
+        {
+            row.id: row
+            for row in db.exec(
+                select_listing_cards()
+                .where(Listing.id.in_([listing_id for listing_id, _ in window]))
+                .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
+            ).all()
+        }
+        if window
+        else {}
+    )
+    hits = [(listing_id, score) for listing_id, score in window if listing_id in rows_by_id]
+    items = serialize_listing_rows(db, [rows_by_id[listing_id] for listing_id, _ in hits])
+    for item, (_, score) in zip(items, hits):
+        item["score"] = round(score, 6)
+    timings["fetch"] = _elapsed_ms(stage)
+    timings["total"] = _elapsed_ms(started)
+
+    next_cursor = None
+    if more:
+        last_id, last_score = window[-1]
+        next_cursor = encode_cursor(HYBRID_SEARCH_ORDERING, last_score, last_id)
+    return HybridListingPage(items, next_cursor, timings=timings)
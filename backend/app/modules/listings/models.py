@@ -6,8 +6,20 @@ from uuid import UUID
 
 from geoalchemy2 import Geography
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, DateTime, Enum as SAEnum, ForeignKey, Numeric, Text, text
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PGUUID
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID as PGUUID
+from sqlalchemy.orm import deferred
 from sqlmodel import Field, Relationship, SQLModel
 from app.modules.interests.models import ListingInterest
 
@@ -18,6 +30,10 @@ if TYPE_CHECKING:
     from app.modules.availability.models import ListingHours
 
 
+# Width of the all-MiniLM-L6-v2 sentence embeddings stored on listings
+EMBEDDING_DIMENSIONS = 384
+
+
 class Statuses(str, Enum):
     active = "active"
     inactive = "inactive"
@@ -102,11 +118,35 @@ class Listing(SQLModel, table=True):
     )
     embedding: Optional[list[float]] = Field(
         default=None,
-        sa_column=Column(Vector(), nullable=True),
+        sa_column=Column(Vector(EMBEDDING_DIMENSIONS), nullable=True),
+    )
+    # Hash of the text the embedding was computed from; see recommendations.worker
+    embedding_content_hash: Optional[str] = Field(
+        default=None, sa_column=Column(Text, nullable=True)
     )
     details: Optional[dict] = Field(
         default=None, sa_column=Column(JSONB, nullable=True)
     )
+    # Review aggregates, maintained by app.modules.reviews.ratings
+    avg_rating: Optional[Decimal] = Field(
+        default=None, sa_column=Column(Numeric(3, 2), nullable=True, index=True)
+    )
+    review_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default=text("0")),
+    )
+    rating_sum: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default=text("0")),
+    )
+    rating_histogram: list[int] = Field(
+        default_factory=lambda: [0] * 5,
+        sa_column=Column(
+            ARRAY(Integer),
+            nullable=False,
+            server_default=text("'{0,0,0,0,0}'"),
+        ),
+    )
     itinerary_items: list["ItineraryItem"] = Relationship(back_populates="listing_rel")
     interests: list["Interests"] = Relationship(
         back_populates="listings",
@@ -115,6 +155,63 @@ class Listing(SQLModel, table=True):
     listing_hours: list["ListingHours"] = Relationship(back_populates="listing_rel")
 
 
+# Heavy columns most reads throw away: the embedding is only for similarity
+# work, and details/image_urls only matter when a listing is rendered. They are
+# deferred by default; paths that need them use ``undefer``/``undefer_group``,
+# and touching an unloaded attribute still lazy-loads it.
+LISTING_PAYLOAD_GROUP = "payload"
+LISTING_EMBEDDING_GROUP = "embedding"
+
+for _column_name in ("embedding", "embedding_content_hash"):
+    Listing.__mapper__.add_property(
+        _column_name,
+        deferred(Listing.__table__.c[_column_name], group=LISTING_EMBEDDING_GROUP),
+    )
+for _column_name in ("details", "image_urls"):
+    Listing.__mapper__.add_property(
+        _column_name,
+        deferred(Listing.__table__.c[_column_name], group=LISTING_PAYLOAD_GROUP),
+    )
+
+
+# Weighted full-text document: title (A) > description (B) > city/country (C).
+# Generated and GIN-indexed by Postgres; table-only like bookings.booking_period,
+# so the ORM never loads or writes it.
+LISTING_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, "
+    "coalesce(address ->> 'city', '') || ' ' || coalesce(address ->> 'country', '')), 'C')"
+)
+
+Listing.__table__.append_column(
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(LISTING_SEARCH_VECTOR_SQL, persisted=True),
+    )
+)
+Index(
+    "ix_listings_search_vector",
+    Listing.__table__.c.search_vector,
+    postgresql_using="gin",
+)
+# pg_trgm index behind the typo-tolerant fallback search on titles
+Index(
+    "ix_listings_title_trgm",
+    Listing.__table__.c.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+)
+# Cosine HNSW index behind "more like this" (recommendations.service)
+Index(
+    "ix_listings_embedding_hnsw",
+    Listing.__table__.c.embedding,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+)
+
 
 class EmployeeListings(SQLModel, table=True):
     __tablename__ = "employee_listings"
@@ -0,0 +1,123 @@
+"""Personalized listing ranking from an in-memory interest -> listing index.
+
+The personalized feed used to sort every listing sharing an interest with the
+user by ``random()`` on each request. Instead, active listings are indexed per
+interest, together with a popularity score taken from the stored review
+aggregates, and a request ranks only the posting lists of the user's
+interests:
+
+    score = interest overlap x popularity x rotation
+
+Rotation is a small multiplier seeded by user, listing and time window, so a
+user's feed reshuffles every ``ROTATION_PERIOD_SECONDS`` but stays stable in
+between. The index is rebuilt with one statement on the first request once it
+is ``PERSONALIZATION_INDEX_REFRESH_SECONDS`` old. A listing write drops it only
+in the worker that made the write; other workers see the change once their own
+copy expires.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import heapq
+import math
+import time
+from typing import Iterable
+from uuid import UUID
+import zlib
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.modules.interests.models import ListingInterest
+from app.shared.cache import RefreshingValue
+
+from .models import Listing, Statuses
+
+PERSONALIZED_STATUSES = (Statuses.active, Statuses.approved)
+NEUTRAL_RATING = 3.0
+ROTATION_PERIOD_SECONDS = 6 * 60 * 60
+ROTATION_WEIGHT = 0.25
+
+
+def popularity_score(avg_rating, review_count: int | None) -> float:
+    """Review volume with diminishing returns, scaled by the average rating."""
+    rating = float(avg_rating) if avg_rating is not None else NEUTRAL_RATING
+    return (1 + math.log1p(review_count or 0)) * rating / 5
+
+
+def rotation_factor(seed: str, listing_id: UUID) -> float:
+    jitter = zlib.crc32(f"{seed}:{listing_id}".encode()) / 0xFFFFFFFF
+    return 1 + ROTATION_WEIGHT * jitter
+
+
+def rotation_seed(user_id, now: float | None = None) -> str:
+    window = int((time.time() if now is None else now) // ROTATION_PERIOD_SECONDS)
+    return f"{user_id}:{window}"
+
+
+class InterestListingIndex:
+    __slots__ = ("postings", "popularity")
+
+    def __init__(
+        self,
+        postings: dict[UUID, tuple[UUID, ...]],
+        popularity: dict[UUID, float],
+    ):
+        self.postings = postings
+        self.popularity = popularity
+
+    def rank(self, interest_ids: Iterable[UUID], limit: int, seed: str) -> list[UUID]:
+        """Top ``limit`` listing ids for a user with these interests."""
+        overlap: Counter[UUID] = Counter()
+        for interest_id in set(interest_ids):
+            overlap.update(self.postings.get(interest_id, ()))
+        return heapq.nlargest(
+            limit,
+            overlap,
+            key=lambda listing_id: overlap[listing_id]
+            * self.popularity[listing_id]
+            * rotation_factor(seed, listing_id),
+        )
+
+
+def load_interest_listing_index(db: Session) -> InterestListingIndex:
+    postings: dict[UUID, list[UUID]] = {}
+    popularity: dict[UUID, float] = {}
+    for interest_id, listing_id, avg_rating, review_count in db.exec(
+        select(
+            ListingInterest.interest_id,
+            Listing.id,
+            Listing.avg_rating,
+            Listing.review_count,
+        )
+        .join(Listing, Listing.id == ListingInterest.listing_id)
+        .where(col(Listing.status).in_(PERSONALIZED_STATUSES))
+    ).all():
+        postings.setdefault(interest_id, []).append(listing_id)
+        popularity[listing_id] = popularity_score(avg_rating, review_count)
+    return InterestListingIndex(
+        {interest_id: tuple(ids) for interest_id, ids in postings.items()},
+        popularity,
+    )
+
+
+interest_listing_index: RefreshingValue[InterestListingIndex] = RefreshingValue(
+    settings.PERSONALIZATION_INDEX_REFRESH_SECONDS
+)
+
+
+def get_interest_listing_index(db: Session) -> InterestListingIndex:
+    return interest_listing_index.get(lambda: load_interest_listing_index(db))
+
+
+def rank_personalized_listing_ids(
+    db: Session, user_id, interest_ids: list[UUID], limit: int
+) -> list[UUID]:
+    index = get_interest_listing_index(db)
+    return index.rank(interest_ids, limit, rotation_seed(user_id))
+
+
+def invalidate_interest_listing_index() -> None:
+    """Listing and interest-link writes; this worker's next request rebuilds."""
+    interest_listing_index.invalidate()
@@ -7,14 +7,18 @@ from sqlmodel import Session
 from app.infrastructure.database import get_db
 from app.modules.users.models import User
 from app.shared.domain import get_listing_or_404
+from app.shared.pagination import set_next_cursor_header
 from app.shared.dependencies.permissions import require_listing_owner, require_roles
 
+from .hybrid import hybrid_search_listings
 from .models import Listing
 from .schemas import (
+    FacetedListingsResponse,
     ListingCreate,
     ListingModerationUpdate,
     ListingResponse,
     ListingUpdate,
+    SuggestionResponse,
 )
 from .service import (
     create_listing,
@@ -26,12 +30,14 @@ from .service import (
     search_listings_combined,
     update_listing,
 )
+from .suggest import suggest
 
 router = APIRouter(prefix="/api/listings", tags=["Listings"])
 
 
-@router.get("", response_model=List[ListingResponse])
+@router.get("", response_model=List[ListingResponse] | FacetedListingsResponse)
 def get_listings(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     city: str | None = Query(default=None),
@@ -46,9 +52,12 @@ def get_listings(
     city_lat: float | None = Query(default=None, ge=-90, le=90),
     city_lng: float | None = Query(default=None, ge=-180, le=180),
     radius_km: float | None = Query(default=None, gt=0),
+    cursor: str | None = Query(default=None),
+    facets: bool = Query(default=False),
     db: Session = Depends(get_db),
 ):
-    return list_listings(
+    """Bare array by default; ``facets=true`` wraps it with counts over the filtered set."""
+    page = list_listings(
         db=db,
         skip=skip,
         limit=limit,
@@ -64,7 +73,13 @@ def get_listings(
         city_lat=city_lat,
         city_lng=city_lng,
         radius_km=radius_km,
+        cursor=cursor,
+        facets=facets,
     )
+    set_next_cursor_header(response, page)
+    if facets:
+        return {"items": page.items, "facets": page.facets}
+    return page.items
 
 
 @router.get("/personalized", response_model=List[ListingResponse])
@@ -78,26 +93,70 @@ def get_personalized_listings_endpoint(
 
 @router.get("/search")
 def search_listings(
+    response: Response,
     q: str | None = Query(default=None, min_length=1),
     lat: float | None = Query(default=None, ge=-90, le=90),
     lng: float | None = Query(default=None, ge=-180, le=180),
     radius_km: float = Query(default=25, gt=0, le=200),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    facets: bool = Query(default=False),
+    mode: Literal["default", "hybrid"] = Query(default="default"),
     db: Session = Depends(get_db),
 ):
+    """
+    ``mode=hybrid`` fuses text, embedding and proximity rankings; the time
+    each stage took is reported in the ``Server-Timing`` header.
+    """
     if (lat is None) != (lng is None):
         raise HTTPException(
             status_code=400, detail="Both lat and lng are required together"
         )
 
-    return search_listings_combined(
+    if mode == "hybrid":
+        if facets:
+            raise HTTPException(
+                status_code=400, detail="Facets are not available for hybrid search"
+            )
+        page = hybrid_search_listings(
+            db=db,
+            q=q,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            limit=limit,
+            cursor=cursor,
+        )
+        set_next_cursor_header(response, page)
+        response.headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={ms}" for stage, ms in page.timings.items()
+        )
+        return page.items
+
+    page = search_listings_combined(
         db=db,
         q=q,
         lat=lat,
         lng=lng,
         radius_km=radius_km,
         limit=limit,
+        cursor=cursor,
+        facets=facets,
     )
+    set_next_cursor_header(response, page)
+    if facets:
+        return {"items": page.items, "facets": page.facets}
+    return page.items
+
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+def suggest_listings(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=25),
+    db: Session = Depends(get_db),
+):
+    """Typeahead served from the in-memory prefix index, not Postgres."""
+    return suggest(db, q, limit)
 
 
 @router.get("/cities/{country}")
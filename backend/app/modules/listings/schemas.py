@@ -1,5 +1,5 @@
 from datetime import datetime, time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
@@ -165,7 +165,37 @@ class ListingResponse(BaseModel):
     updated_at: Optional[datetime] = None
     avg_rating: Optional[float] = None
     review_count: int = 0
+    rating_histogram: List[int] = [0, 0, 0, 0, 0]
     business_type_name: Optional[str] = None
     business_name: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FacetCount(BaseModel):
+    value: str
+    label: Optional[str] = None
+    count: int
+
+
+class PriceFacetCount(BaseModel):
+    min: int
+    max: Optional[int] = None
+    count: int
+
+
+class ListingFacets(BaseModel):
+    business_type: List[FacetCount] = []
+    price: List[PriceFacetCount] = []
+    city: List[FacetCount] = []
+
+
+class FacetedListingsResponse(BaseModel):
+    items: List[ListingResponse]
+    facets: ListingFacets
+
+
+class SuggestionResponse(BaseModel):
+    kind: Literal["listing", "city", "business", "interest"]
+    id: Optional[str] = None
+    text: str
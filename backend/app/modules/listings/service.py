@@ -1,27 +1,46 @@
 """Business logic for listings."""
 
+from dataclasses import dataclass
 from datetime import datetime
 import random
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, asc, col, desc, select
-
-from app.modules.bookings.models import Booking, BookingStatus
+from sqlalchemy import Float, func, literal, true
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import selectinload, undefer_group
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.modules.availability.models import SlotOccupancy, occupancy_window_overlaps
+from app.modules.businesses.models import Business, BusinessType
 from app.modules.interests.models import (
     BusinessTypeInterest,
     ListingInterest,
     UserInterest,
 )
 from app.modules.listings.schemas import ListingCreate
-from app.modules.reviews.models import Review
+from app.modules.services.cache import invalidate_listing_service_descriptors
 from app.modules.services.models import Service, StatusTypes as ServiceStatusTypes
 from app.shared.domain import get_business_by_user_id
+from app.shared.pagination import (
+    Page,
+    cursor_ordering,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    keyset_order,
+)
+from app.shared.cache import VersionedTTLCache
 from app.shared.services import build_location, extract_lat_lng
 
-from .models import Listing, Statuses
+from .facets import get_listing_facets
+from .models import LISTING_PAYLOAD_GROUP, Listing, Statuses
+from .personalization import (
+    invalidate_interest_listing_index,
+    rank_personalized_listing_ids,
+)
+from .suggest import record_listing_suggestions
 
 ACTIVE_LIKE_STATUSES = (Statuses.active, Statuses.approved)
 OWNER_REVIEW_TRIGGER_FIELDS = {
@@ -31,34 +50,15 @@ OWNER_REVIEW_TRIGGER_FIELDS = {
     "address",
     "location",
 }
+BUSINESS_LISTINGS_ORDERING = "created_at:desc"
+FUZZY_SEARCH_ORDERING = "similarity:desc"
 
 
-def batch_review_stats(db: Session, listing_ids: list) -> dict:
-    if not listing_ids:
-        return {}
-
-    rows = db.exec(
-        select(
-            Review.listing_id,
-            func.avg(Review.rating).label("avg_rating"),
-            func.count(Review.id).label("review_count"),
-        )
-        .where(Review.listing_id.in_(listing_ids))
-        .group_by(Review.listing_id)
-    ).all()
-
-    stats = {
-        row.listing_id: {
-            "avg_rating": float(row.avg_rating) if row.avg_rating is not None else None,
-            "review_count": int(row.review_count or 0),
-        }
-        for row in rows
-    }
-
-    for listing_id in listing_ids:
-        stats.setdefault(listing_id, {"avg_rating": None, "review_count": 0})
+@dataclass
+class ListingPage(Page[dict]):
+    """A page of listing cards, plus facet counts when they were requested."""
 
-    return stats
+    facets: dict | None = None
 
 
 def normalize_interest_ids(interest_ids: list[UUID] | None) -> list[UUID]:
@@ -213,10 +213,14 @@ def batch_listing_interest_ids(
 
 def serialize_listing(
     listing: Listing,
-    review_stats: dict | None = None,
     interest_ids: list[UUID] | None = None,
 ) -> dict:
-    data = listing.model_dump(exclude={"embedding", "location"})
+    data = listing.model_dump(
+        exclude={"embedding", "embedding_content_hash", "location", "rating_sum"}
+    )
+    # model_dump skips deferred columns that were not loaded
+    data["details"] = listing.details
+    data["image_urls"] = listing.image_urls
     if data.get("status") == Statuses.approved:
         data["status"] = Statuses.active
 
@@ -230,9 +234,9 @@ def serialize_listing(
         listing.business_rel.business_name if listing.business_rel else None
     )
 
-    if review_stats is not None:
-        data["avg_rating"] = review_stats.get("avg_rating")
-        data["review_count"] = review_stats.get("review_count")
+    # Review aggregates are stored on the listing (see reviews.ratings)
+    if listing.avg_rating is not None:
+        data["avg_rating"] = float(listing.avg_rating)
 
     data["interest_ids"] = interest_ids or []
 
@@ -242,98 +246,224 @@ def serialize_listing(
 def serialize_listings(db: Session, listings: list[Listing]) -> list[dict]:
     if not listings:
         return []
-    listing_ids = [listing.id for listing in listings]
-    stats_map = batch_review_stats(db, listing_ids)
-    interest_map = batch_listing_interest_ids(db, listing_ids)
+    interest_map = batch_listing_interest_ids(db, [listing.id for listing in listings])
     return [
-        serialize_listing(
-            listing,
-            stats_map[listing.id],
-            interest_map.get(listing.id, []),
-        )
+        serialize_listing(listing, interest_map.get(listing.id, []))
         for listing in listings
     ]
 
 
-def fetch_active_listings(db: Session, limit: int) -> list[Listing]:
-    listings = db.exec(
-        select(Listing)
-        .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
-        .options(
-            selectinload(Listing.business_type_rel),
-            selectinload(Listing.business_rel),
+# Every field a listing response carries, read straight from the row. The
+# location comes back as lat/lng and the embedding is never read.
+LISTING_CARD_COLUMNS = (
+    Listing.id,
+    Listing.created_at,
+    Listing.updated_at,
+    Listing.business_id,
+    Listing.title,
+    Listing.description,
+    Listing.address,
+    Listing.base_price,
+    Listing.business_type,
+    Listing.image_urls,
+    Listing.status,
+    Listing.phone_number,
+    Listing.email_address,
+    Listing.details,
+    Listing.avg_rating,
+    Listing.review_count,
+    Listing.rating_histogram,
+)
+LISTING_CARD_KEYS = tuple(column.key for column in LISTING_CARD_COLUMNS)
+
+
+def select_listing_cards(*extra_columns):
+    """
+    One statement for list responses: the card columns, coordinates and the
+    business and business type names, without hydrating ORM objects.
+    """
+    point = func.geometry(Listing.location)
+    return (
+        select(
+            *LISTING_CARD_COLUMNS,
+            func.ST_Y(point).label("lat"),
+            func.ST_X(point).label("lng"),
+            BusinessType.name.label("business_type_name"),
+            Business.business_name.label("business_name"),
+            *extra_columns,
         )
-        .limit(limit)
-    ).all()
-    random.shuffle(listings)
-    return listings
+        .select_from(Listing)
+        .outerjoin(BusinessType, BusinessType.id == Listing.business_type)
+        .outerjoin(Business, Business.id == Listing.business_id)
+    )
 
 
-def get_listing_review_stats(db: Session, listing_id) -> dict:
-    return batch_review_stats(db, [listing_id])[listing_id]
+def serialize_listing_row(row, interest_ids: list[UUID] | None = None) -> dict:
+    mapping = row._mapping
+    data = {key: mapping[key] for key in LISTING_CARD_KEYS}
+    if data["status"] == Statuses.approved:
+        data["status"] = Statuses.active
+    if data["avg_rating"] is not None:
+        data["avg_rating"] = float(data["avg_rating"])
 
+    lat, lng = mapping["lat"], mapping["lng"]
+    data["location"] = (
+        {"lat": float(lat), "lng": float(lng)} if lat is not None and lng is not None else None
+    )
+    data["business_type_name"] = mapping["business_type_name"]
+    data["business_name"] = mapping["business_name"]
+    data["interest_ids"] = interest_ids or []
+    return data
 
-def list_listings(
-    db: Session,
-    skip: int = 0,
-    limit: int | None = None,
+
+def serialize_listing_rows(db: Session, rows) -> list[dict]:
+    if not rows:
+        return []
+    interest_map = batch_listing_interest_ids(db, [row.id for row in rows])
+    return [serialize_listing_row(row, interest_map.get(row.id, [])) for row in rows]
+
+
+def fetch_active_listings(db: Session, limit: int) -> list:
+    rows = list(
+        db.exec(
+            select_listing_cards()
+            .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
+            .limit(limit)
+        ).all()
+    )
+    random.shuffle(rows)
+    return rows
+
+
+def listing_filters(
     city: str | None = None,
     country: str | None = None,
     business_type: str | None = None,
     min_price: float | None = None,
     max_price: float | None = None,
-    sort_by: str | None = None,
-    sort_order: str = "asc",
     status: str | None = None,
     availability_date=None,
     city_lat: float | None = None,
     city_lng: float | None = None,
     radius_km: float | None = None,
-):
-    query = select(Listing)
-
+) -> list:
+    """WHERE clauses shared by ``list_listings`` and its facet counts."""
+    filters = []
     if city:
-        query = query.where(Listing.address["city"].astext.ilike(f"%{city}%"))
+        filters.append(Listing.address["city"].astext.ilike(f"%{city}%"))
     if country:
-        query = query.where(Listing.address["country"].astext.ilike(f"%{country}%"))
+        filters.append(Listing.address["country"].astext.ilike(f"%{country}%"))
     if business_type:
-        query = query.where(Listing.business_type == business_type)
+        filters.append(Listing.business_type == business_type)
     if min_price is not None:
-        query = query.where(Listing.base_price >= min_price)
+        filters.append(Listing.base_price >= min_price)
     if max_price is not None:
-        query = query.where(Listing.base_price <= max_price)
+        filters.append(Listing.base_price <= max_price)
     if status == Statuses.active.value or status == Statuses.approved.value:
-        query = query.where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
+        filters.append(Listing.status.in_(ACTIVE_LIKE_STATUSES))
     elif status:
-        query = query.where(Listing.status == status)
+        filters.append(Listing.status == status)
+
+    # Availability date filter - part of the query so offset/limit stay correct
+    if availability_date is not None:
+        start_dt = datetime.combine(availability_date, datetime.min.time())
+        end_dt = datetime.combine(availability_date, datetime.max.time())
+        filters.append(listing_availability_clause(start_dt, end_dt))
 
     # Radius filter using geolocation
     if city_lat is not None and city_lng is not None and radius_km is not None:
         point = func.ST_SetSRID(func.ST_MakePoint(city_lng, city_lat), 4326)
-        query = query.where(func.ST_DWithin(Listing.location, point, radius_km * 1000))
+        filters.append(func.ST_DWithin(Listing.location, point, radius_km * 1000))
+    return filters
 
-    if sort_by:
-        sort_column = getattr(Listing, sort_by, None)
-        if sort_column is not None:
-            query = query.order_by(
-                asc(sort_column) if sort_order == "asc" else desc(sort_column)
-            )
 
-    query = query.options(
-        selectinload(Listing.business_type_rel),
-        selectinload(Listing.business_rel),
-    ).offset(skip)
-    if limit is not None:
-        query = query.limit(limit)
-    listings = db.exec(query).all()
+# Scalar card columns a keyset cursor can seek on. The next cursor reads the
+# sort value off the last card row, so only columns the cards carry qualify.
+LISTING_SORT_KEYS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "title",
+    "base_price",
+    "avg_rating",
+    "review_count",
+)
+LISTING_SORT_COLUMNS = {
+    column.key: column for column in LISTING_CARD_COLUMNS if column.key in LISTING_SORT_KEYS
+}
 
-    # Availability date filter - applied after SQL query
-    if availability_date is not None:
-        start_dt = datetime.combine(availability_date, datetime.min.time())
-        end_dt = datetime.combine(availability_date, datetime.max.time())
-        listings = filter_by_availability(db, listings, start_dt, end_dt)
 
-    return serialize_listings(db, listings)
+def list_listings(
+    db: Session,
+    skip: int = 0,
+    limit: int | None = None,
+    city: str | None = None,
+    country: str | None = None,
+    business_type: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    sort_by: str | None = None,
+    sort_order: str = "asc",
+    status: str | None = None,
+    availability_date=None,
+    city_lat: float | None = None,
+    city_lng: float | None = None,
+    radius_km: float | None = None,
+    cursor: str | None = None,
+    facets: bool = False,
+) -> ListingPage:
+    filter_values = {
+        "city": city,
+        "country": country,
+        "business_type": business_type,
+        "min_price": min_price,
+        "max_price": max_price,
+        "status": status,
+        "availability_date": availability_date,
+        "city_lat": city_lat,
+        "city_lng": city_lng,
+        "radius_km": radius_km,
+    }
+    filters = listing_filters(**filter_values)
+    query = select_listing_cards().where(*filters)
+
+    # No sort key falls back to id so pages always have a total order
+    if not sort_by:
+        sort_column, sort_order = Listing.id, "asc"
+    elif sort_by in LISTING_SORT_COLUMNS:
+        sort_column = LISTING_SORT_COLUMNS[sort_by]
+    else:
+        raise HTTPException(status_code=400, detail=f"Cannot sort listings by {sort_by}")
+    descending = sort_order != "asc"
+    ordering = f"{sort_column.key}:{sort_order}"
+
+    if cursor:
+        if skip:
+            raise HTTPException(status_code=400, detail="Use either skip or cursor")
+        sort_value, last_id = decode_cursor(cursor, ordering)
+        query = query.where(
+            keyset_after(sort_column, Listing.id, sort_value, last_id, descending=descending)
+        )
+
+    query = query.order_by(*keyset_order(sort_column, Listing.id, descending=descending))
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    listings = list(db.exec(query).all())
+
+    next_cursor = None
+    if limit is not None and len(listings) > limit:
+        listings = listings[:limit]
+        last = listings[-1]
+        next_cursor = encode_cursor(ordering, getattr(last, sort_column.key), last.id)
+
+    page = ListingPage(serialize_listing_rows(db, listings), next_cursor)
+    if facets:
+        page.facets = get_listing_facets(
+            db, ("list", *filter_values.values()), filters
+        )
+    return page
 
 
 def get_listing_by_id(db: Session, listing_id: str):
@@ -343,13 +473,13 @@ def get_listing_by_id(db: Session, listing_id: str):
         .options(
             selectinload(Listing.business_type_rel),
             selectinload(Listing.business_rel),
+            undefer_group(LISTING_PAYLOAD_GROUP),
         )
     ).first()
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
-    review_stats = get_listing_review_stats(db, listing_id)
     interest_map = batch_listing_interest_ids(db, [listing.id])
-    return serialize_listing(listing, review_stats, interest_map.get(listing.id, []))
+    return serialize_listing(listing, interest_map.get(listing.id, []))
 
 
 def create_listing(db: Session, data: ListingCreate, user_id: str):
@@ -377,9 +507,11 @@ def create_listing(db: Session, data: ListingCreate, user_id: str):
     sync_listing_interests(db, listing.id, validated_interest_ids)
     db.commit()
     db.refresh(listing)
+    invalidate_country_cities()
+    invalidate_interest_listing_index()
+    record_listing_suggestions(db, listing, validated_interest_ids)
 
-    review_stats = get_listing_review_stats(db, listing.id)
-    return serialize_listing(listing, review_stats, validated_interest_ids)
+    return serialize_listing(listing, validated_interest_ids)
 
 
 def update_listing(
@@ -439,9 +571,12 @@ def update_listing(
 
     db.commit()
     db.refresh(listing)
-    review_stats = get_listing_review_stats(db, listing.id)
+    invalidate_listing_service_descriptors(listing.id)
+    invalidate_country_cities()
+    invalidate_interest_listing_index()
     interest_map = batch_listing_interest_ids(db, [listing.id])
-    return serialize_listing(listing, review_stats, interest_map.get(listing.id, []))
+    record_listing_suggestions(db, listing, interest_map.get(listing.id, []))
+    return serialize_listing(listing, interest_map.get(listing.id, []))
 
 
 def delete_listing(db: Session, listing: Listing):
@@ -451,87 +586,86 @@ def delete_listing(db: Session, listing: Listing):
 
     db.commit()
     db.refresh(listing)
+    invalidate_listing_service_descriptors(listing.id)
+    invalidate_country_cities()
+    invalidate_interest_listing_index()
+    record_listing_suggestions(db, listing)
     return listing
 
 
 def get_active_listings(db: Session, limit: int = 20):
-    return serialize_listings(db, fetch_active_listings(db, limit))
+    return serialize_listing_rows(db, fetch_active_listings(db, limit))
 
 
-def get_business_listings(db: Session, user_id: str):
+def get_business_listings(
+    db: Session,
+    user_id: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page[dict]:
     business = get_business_by_user_id(db, user_id)
     if not business:
-        return []
-    listings = db.exec(
-        select(Listing)
+        return Page()
+    query = (
+        select_listing_cards()
         .where(Listing.business_id == business.id)
-        .options(
-            selectinload(Listing.business_type_rel),
-            selectinload(Listing.business_rel),
+        .order_by(*keyset_order(Listing.created_at, Listing.id, descending=True))
+    )
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, BUSINESS_LISTINGS_ORDERING)
+        query = query.where(
+            keyset_after(Listing.created_at, Listing.id, created_at, last_id, descending=True)
         )
-        .order_by(desc(Listing.created_at))
-    ).all()
-    return serialize_listings(db, listings)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    listings = list(db.exec(query).all())
+
+    next_cursor = None
+    if limit is not None and len(listings) > limit:
+        listings = listings[:limit]
+        next_cursor = encode_cursor(
+            BUSINESS_LISTINGS_ORDERING, listings[-1].created_at, listings[-1].id
+        )
+    return Page(serialize_listing_rows(db, listings), next_cursor)
 
 
 def get_personalized_listings(db: Session, user_id: str, limit: int = 20):
-    user_interests = list(
-        db.exec(
-            select(UserInterest.interest_id).where(UserInterest.user_id == user_id)
-        ).all()
-    )
-
-    if not user_interests:
-        return serialize_listings(db, fetch_active_listings(db, limit))
+    """
+    Listings nearest the user's taste vector, one probe of the embedding
+    index. Users without enough taste signal yet get the top listings by
+    interest overlap and popularity from ``rank_personalized_listing_ids``.
+    One indexed read then fetches the cards.
+    """
+    # Imported here: recommendations builds on this module
+    from app.modules.recommendations.taste import rank_taste_listing_ids
 
-    try:
-        # PostgreSQL doesn't allow ORDER BY random() with DISTINCT unless random() is in SELECT
-        # So we fetch listing IDs first, then fetch the listings
-        listing_ids_subq = (
-            select(ListingInterest.listing_id)
-            .join(Listing, Listing.id == ListingInterest.listing_id)
-            .where(ListingInterest.__table__.c.interest_id.in_(user_interests))
-            .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
-            .options(
-                selectinload(Listing.business_type_rel),
-                selectinload(Listing.business_rel),
-            )
-            .distinct()
+    listing_ids = rank_taste_listing_ids(db, user_id, limit)
+    if not listing_ids:
+        user_interests = list(
+            db.exec(
+                select(UserInterest.interest_id).where(UserInterest.user_id == user_id)
+            ).all()
         )
+        listing_ids = (
+            rank_personalized_listing_ids(db, user_id, user_interests, limit)
+            if user_interests
+            else []
+        )
+    if not listing_ids:
+        return serialize_listing_rows(db, fetch_active_listings(db, limit))
 
-        # Get IDs with random ordering using a subquery approach
-        ids_with_random = db.exec(
-            select(Listing.id, func.random().label("rand"))
-            .join(ListingInterest, ListingInterest.listing_id == Listing.id)
-            .where(ListingInterest.__table__.c.interest_id.in_(user_interests))
+    rows_by_id = {
+        row.id: row
+        for row in db.exec(
+            select_listing_cards()
+            .where(Listing.id.in_(listing_ids))
             .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
-            .options(
-                selectinload(Listing.business_type_rel),
-                selectinload(Listing.business_rel),
-            )
-            .distinct()
-            .limit(limit)
-            .order_by(func.random())
         ).all()
-
-        if ids_with_random:
-            # Sort by random value and pick limit
-            shuffled = sorted(ids_with_random, key=lambda x: x.rand)[:limit]
-            listing_ids = [row.id for row in shuffled]
-            listings = db.exec(
-                select(Listing)
-                .where(Listing.id.in_(listing_ids))
-                .where(Listing.status == Statuses.active)
-            ).all()
-        else:
-            listings = fetch_active_listings(db, limit)
-
-        if not listings:
-            listings = fetch_active_listings(db, limit)
-
-        return serialize_listings(db, listings)
-    except Exception:
-        return serialize_listings(db, fetch_active_listings(db, limit))
+    }
+    rows = [rows_by_id[listing_id] for listing_id in listing_ids if listing_id in rows_by_id]
+    if not rows:
+        return serialize_listing_rows(db, fetch_active_listings(db, limit))
+    return serialize_listing_rows(db, rows)
 
 
 def search_listings_combined(
@@ -541,68 +675,162 @@ def search_listings_combined(
     lng: float | None = None,
     radius_km: float = 25,
     limit: int = 20,
-):
-    query = (
-        select(Listing)
-        .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
-        .options(
-            selectinload(Listing.business_type_rel),
-            selectinload(Listing.business_rel),
+    cursor: str | None = None,
+    facets: bool = False,
+) -> ListingPage:
+    """
+    Full-text search over the stored ``search_vector``. When a query matches
+    nothing, the first page is retried as a trigram search on titles so typos
+    still find listings; its cursors keep later pages on the fuzzy path.
+    With ``facets`` the page also carries counts over the whole matched set.
+    """
+    fuzzy = bool(q) and cursor is not None and cursor_ordering(cursor) == FUZZY_SEARCH_ORDERING
+    page = _run_listing_search(db, q, lat, lng, radius_km, limit, cursor, fuzzy=fuzzy)
+    if q and not fuzzy and cursor is None and not page.items:
+        fuzzy = True
+        page = _run_listing_search(db, q, lat, lng, radius_km, limit, None, fuzzy=True)
+    if facets:
+        page.facets = get_listing_facets(
+            db,
+            ("search", q, lat, lng, radius_km, fuzzy),
+            search_filters(q, lat, lng, radius_km, fuzzy=fuzzy),
         )
-    )
+    return page
+
+
+def search_point(lat: float, lng: float):
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+
+
+def search_filters(
+    q: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float,
+    *,
+    fuzzy: bool,
+) -> list:
+    """WHERE clauses of one search path, shared with its facet counts."""
+    filters = [Listing.status.in_(ACTIVE_LIKE_STATUSES)]
+    if q and fuzzy:
+        # ``<%`` is served by the pg_trgm index on title
+        filters.append(literal(q).op("<%")(Listing.title))
+    elif q:
+        search_vector = Listing.__table__.c.search_vector
+        filters.append(search_vector.op("@@")(func.plainto_tsquery("english", q)))
+    if lat is not None and lng is not None:
+        filters.append(
+            func.ST_DWithin(Listing.location, search_point(lat, lng), radius_km * 1000)
+        )
+    return filters
+
 
-    ts_vector = func.to_tsvector(
-        "english",
-        func.concat_ws(" ", Listing.title, func.coalesce(Listing.description, "")),
+def _run_listing_search(
+    db: Session,
+    q: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float,
+    limit: int,
+    cursor: str | None,
+    *,
+    fuzzy: bool,
+) -> ListingPage:
+    query = select_listing_cards().where(
+        *search_filters(q, lat, lng, radius_km, fuzzy=fuzzy)
     )
+
     rank_expr = None
-    if q:
-        ts_query = func.plainto_tsquery("english", q)
-        rank_expr = func.ts_rank(ts_vector, ts_query).label("rank")
-        query = query.add_columns(rank_expr).where(ts_vector.op("@@")(ts_query))
+    if q and fuzzy:
+        rank_expr = func.word_similarity(q, Listing.title)
+    elif q:
+        search_vector = Listing.__table__.c.search_vector
+        rank_expr = func.ts_rank(search_vector, func.plainto_tsquery("english", q))
+    if rank_expr is not None:
+        query = query.add_columns(rank_expr.label("rank"))
 
     distance_expr = None
     if lat is not None and lng is not None:
-        point = func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326)
-
-        distance_expr = func.ST_Distance(Listing.location, point).label("distance_m")
-
-        query = query.add_columns(distance_expr).where(
-            func.ST_DWithin(Listing.location, point, radius_km * 1000)
+        # ``<->`` is the GiST KNN operator: with ORDER BY ... LIMIT the index
+        # yields listings nearest-first, so distances are only computed for
+        # rows that are returned. On geography it measures on the sphere.
+        distance_expr = Listing.location.op("<->", return_type=Float)(
+            search_point(lat, lng)
         )
+        query = query.add_columns(distance_expr.label("distance_m"))
 
     if rank_expr is not None:
-        query = query.order_by(desc(rank_expr))
+        ordering = FUZZY_SEARCH_ORDERING if fuzzy else "rank:desc"
+        sort_expr, descending = rank_expr, True
     elif distance_expr is not None:
-        query = query.order_by(asc(distance_expr))
+        sort_expr, descending, ordering = distance_expr, False, "distance:asc"
     else:
-        query = query.order_by(desc(Listing.created_at))
+        sort_expr, descending, ordering = Listing.created_at, True, "created_at:desc"
+    query = query.order_by(*keyset_order(sort_expr, Listing.id, descending=descending))
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, ordering)
+        query = query.where(
+            keyset_after(sort_expr, Listing.id, sort_value, last_id, descending=descending)
+        )
 
-    rows = db.exec(query.limit(limit)).all()
+    rows = list(db.exec(query.limit(limit + 1)).all())
 
     if not rows:
-        return []
+        return ListingPage()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if rank_expr is not None:
+            sort_value = last.rank
+        elif distance_expr is not None:
+            sort_value = last.distance_m
+        else:
+            sort_value = last.created_at
+        next_cursor = encode_cursor(ordering, sort_value, last.id)
 
-    listings = [row[0] if isinstance(row, tuple) else row for row in rows]
+    serialized = serialize_listing_rows(db, rows)
 
-    serialized = serialize_listings(db, listings)
-    listing_data_by_id = {item["id"]: item for item in serialized}
+    for row, payload in zip(rows, serialized):
+        if rank_expr is not None:
+            payload["rank"] = float(row.rank) if row.rank is not None else None
+        if distance_expr is not None:
+            payload["distance_m"] = (
+                float(row.distance_m) if row.distance_m is not None else None
+            )
 
-    for row in rows:
-        listing = row[0] if isinstance(row, tuple) else row
-        payload = listing_data_by_id.get(str(listing.id))
-        if not payload:
-            continue
-        idx = 1
-        if rank_expr is not None and len(row) > idx:
-            rank_val = row[idx]
-            payload["rank"] = float(rank_val) if rank_val is not None else None
-            idx += 1
-        if distance_expr is not None and len(row) > idx:
-            dist_val = row[idx]
-            payload["distance_m"] = float(dist_val) if dist_val is not None else None
+    return ListingPage(serialized, next_cursor)
 
-    return serialized
+
+def listing_availability_clause(
+    start_dt: datetime,
+    end_dt: datetime,
+    requested_quantity: int = 1,
+):
+    """
+    EXISTS clause matching listings with at least one active service that can
+    still take ``requested_quantity`` people in the window. Booked people are
+    summed from the slot occupancy ledger inside the subquery, so the filter
+    runs in the listing query itself.
+    """
+    booked = (
+        select(func.coalesce(func.sum(SlotOccupancy.booked_people), 0))
+        .where(SlotOccupancy.service_id == Service.service_id)
+        .where(occupancy_window_overlaps(start_dt, end_dt))
+        .correlate(Service)
+        .scalar_subquery()
+    )
+    return (
+        select(Service.service_id)
+        .where(Service.listing_id == Listing.id)
+        .where(Service.status == ServiceStatusTypes.active)
+        .where(Service.capacity > 0)
+        .where(Service.capacity - booked >= requested_quantity)
+        .correlate(Listing)
+        .exists()
+    )
 
 
 def filter_by_availability(
@@ -614,66 +842,121 @@ def filter_by_availability(
 ) -> list[Listing]:
     """
     Returns only listings that have at least one service with available slots
-    in the requested window. Uses a single batched query.
+    in the requested window. Uses a single query.
     """
     listing_ids = [l.id for l in listings]
     if not listing_ids:
         return []
 
-    # Fetch all active services for these listings
-    services = db.exec(
-        select(Service)
-        .where(col(Service.listing_id).in_(listing_ids))
-        .where(Service.status == ServiceStatusTypes.active)
-        .where(Service.capacity > 0)
-    ).all()
+    available_listing_ids = set(
+        db.exec(
+            select(Listing.id)
+            .where(col(Listing.id).in_(listing_ids))
+            .where(listing_availability_clause(start_dt, end_dt, requested_quantity))
+        ).all()
+    )
+    return [l for l in listings if l.id in available_listing_ids]
 
-    if not services:
-        return []
 
-    service_ids = [s.service_id for s in services]
-
-    booked_rows = db.exec(
-        select(Booking.service_id, func.coalesce(func.sum(Booking.amount_of_people), 0))
-        .where(col(Booking.service_id).in_(service_ids))
-        .where(
-            col(Booking.status).notin_(
-                [
-                    BookingStatus.cancelled,
-                    BookingStatus.pending,
-                ]
-            )
-        )
-        .where(Booking.booking_from_time < end_dt)
-        .where(Booking.booking_to_time > start_dt)
-        .group_by(Booking.service_id)
-    ).all()
+RADIUS_QUANTILES = (0.25, 0.5, 0.75, 1.0)
+# Keyed by whatever country string callers send, so bounded like the facet cache
+COUNTRY_CITIES_CACHE_MAX_ENTRIES = 256
 
-    booked_map = {service_id: int(booked or 0) for service_id, booked in booked_rows}
+country_cities_cache: VersionedTTLCache[str, dict] = VersionedTTLCache(
+    settings.CITIES_CACHE_TTL_SECONDS,
+    max_entries=COUNTRY_CITIES_CACHE_MAX_ENTRIES,
+)
 
-    # Determine which listing_ids have at least one available service
-    available_listing_ids = set()
-    for service in services:
-        booked = booked_map.get(service.service_id, 0)
-        if (service.capacity or 0) - booked >= requested_quantity:
-            available_listing_ids.add(service.listing_id)
 
-    return [l for l in listings if l.id in available_listing_ids]
+def invalidate_country_cities() -> None:
+    """Listing writes can move a listing between countries; drop every entry."""
+    country_cities_cache.invalidate()
 
 
 def get_cities_for_country(db: Session, country: str) -> dict:
     """
     Returns cities with listings for a given country, including geo centroids and
-    dynamic radius options computed from listing spread.
+    dynamic radius options computed from listing spread. Cached per country.
     """
-    listings_in_country = db.exec(
-        select(Listing)
+    key = country.casefold()
+    result = country_cities_cache.get_many(
+        [key], lambda _: {key: load_cities_for_country(db, country)}
+    )[key]
+    return {**result, "country": country}
+
+
+def select_country_city_stats(country: str):
+    """
+    One statement: per-city centroids, listing counts and max spread, plus the
+    country centre and the spread quartiles repeated on every row.
+    """
+    point = func.geometry(Listing.location)
+    points = (
+        select(
+            func.coalesce(Listing.address["city"].astext, "Unknown").label("city"),
+            point.label("point"),
+        )
         .where(Listing.address["country"].astext.ilike(country))
         .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
         .where(Listing.location.isnot(None))
-    ).all()
+        .cte("points")
+    )
+    centroids = (
+        select(
+            points.c.city,
+            func.ST_Centroid(func.ST_Collect(points.c.point)).label("center"),
+            func.count().label("listing_count"),
+        )
+        .group_by(points.c.city)
+        .cte("centroids")
+    )
+    distances = (
+        select(
+            points.c.city,
+            (func.ST_DistanceSphere(points.c.point, centroids.c.center) / 1000.0).label(
+                "distance_km"
+            ),
+        )
+        .select_from(points)
+        .join(centroids, centroids.c.city == points.c.city)
+        .cte("distances")
+    )
+    spreads = (
+        select(distances.c.city, func.max(distances.c.distance_km).label("max_distance_km"))
+        .group_by(distances.c.city)
+        .cte("spreads")
+    )
+    country_center = select(
+        func.avg(func.ST_Y(points.c.point)).label("center_lat"),
+        func.avg(func.ST_X(points.c.point)).label("center_lng"),
+    ).cte("country_center")
+    quartiles = select(
+        func.percentile_cont(array(RADIUS_QUANTILES))
+        .within_group(distances.c.distance_km)
+        .label("radius_quantiles")
+    ).cte("quartiles")
+
+    return (
+        select(
+            centroids.c.city,
+            func.ST_Y(centroids.c.center).label("lat"),
+            func.ST_X(centroids.c.center).label("lng"),
+            centroids.c.listing_count,
+            spreads.c.max_distance_km,
+            country_center.c.center_lat,
+            country_center.c.center_lng,
+            quartiles.c.radius_quantiles,
+        )
+        .join(spreads, spreads.c.city == centroids.c.city)
+        .join(country_center, true())
+        .join(quartiles, true())
+        .order_by(centroids.c.city)
+    )
+
 
-    if not listings_in_country:
+def load_cities_for_country(db: Session, country: str) -> dict:
+    rows = db.exec(select_country_city_stats(country)).all()
+    if not rows:
         return {
             "country": country,
             "country_center": None,
@@ -681,100 +964,36 @@ def get_cities_for_country(db: Session, country: str) -> dict:
             "radius_options": [],
         }
 
-    # Group listings by city
-    city_listings: dict[str, list] = {}
-    all_lats = []
-    all_lngs = []
-
-    for listing in listings_in_country:
-        lat_lng = extract_lat_lng(listing.location)
-        if not lat_lng:
-            continue
-        city = (listing.address or {}).get("city", "Unknown")
-        if city not in city_listings:
-            city_listings[city] = []
-        city_listings[city].append(lat_lng)
-        all_lats.append(lat_lng["lat"])
-        all_lngs.append(lat_lng["lng"])
-
-    # Compute country centroid
-    country_center = {
-        "lat": sum(all_lats) / len(all_lats),
-        "lng": sum(all_lngs) / len(all_lngs),
-    }
-
-    # Compute per-city centroids and distances
-    city_data = []
-    all_distances = []
-
-    for city_name, lats_lngs in city_listings.items():
-        lat = sum(l["lat"] for l in lats_lngs) / len(lats_lngs)
-        lng = sum(l["lng"] for l in lats_lngs) / len(lats_lngs)
-
-        # Compute centroid of this city's listings
-        centroid_lat = lat
-        centroid_lng = lng
-
-        # Compute distances from centroid for spread analysis
-        distances = []
-        for l in lats_lngs:
-            dist = haversine_distance(centroid_lat, centroid_lng, l["lat"], l["lng"])
-            distances.append(dist)
-            all_distances.append(dist)
-
-        distances.sort()
-        city_data.append(
-            {
-                "name": city_name,
-                "lat": centroid_lat,
-                "lng": centroid_lng,
-                "listing_count": len(lats_lngs),
-                "max_distance_km": distances[-1] if distances else 0,
-            }
-        )
-
-    # Compute global radius options from quartiles
-    if all_distances:
-        all_distances.sort()
-        n = len(all_distances)
-        radius_options = [
-            round_to_nice(all_distances[int(n * 0.25)]),
-            round_to_nice(all_distances[int(n * 0.50)]),
-            round_to_nice(all_distances[int(n * 0.75)]),
-            round_to_nice(all_distances[n - 1]),
-        ]
-        # Deduplicate and ensure ascending
-        radius_options = sorted(set(r for r in radius_options if r > 0))
-    else:
-        radius_options = []
-
-    city_data.sort(key=lambda c: c["name"])
-
+    first = rows[0]
+    radius_options = sorted(
+        {
+            nice
+            for nice in (
+                round_to_nice(value) for value in first.radius_quantiles or [] if value is not None
+            )
+            if nice > 0
+        }
+    )
     return {
         "country": country,
-        "country_center": country_center,
-        "cities": city_data,
+        "country_center": {
+            "lat": float(first.center_lat),
+            "lng": float(first.center_lng),
+        },
+        "cities": [
+            {
+                "name": row.city,
+                "lat": float(row.lat),
+                "lng": float(row.lng),
+                "listing_count": int(row.listing_count),
+                "max_distance_km": float(row.max_distance_km or 0),
+            }
+            for row in rows
+        ],
         "radius_options": radius_options,
     }
 
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calculate great-circle distance in km between two points."""
-    import math
-
-    R = 6371  # Earth's radius in km
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lng2 - lng1)
-    a = (
-        math.sin(dphi / 2) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
-
 def round_to_nice(value: float) -> float:
     """Round to a nice round number for display."""
     if value <= 1:
@@ -0,0 +1,289 @@
+"""In-memory typeahead over listing titles, cities, business names and interests.
+
+Every suggestion is stored once per word it contains, as a normalized key, in
+one sorted list; a prefix query is a ``bisect`` plus a short forward scan and
+never touches Postgres. Only active listings contribute. Cities, businesses
+and interests are reference counted across those listings, so they appear
+while at least one active listing uses them.
+
+Listing writes (including their interest links) and business renames update
+the index in place. Writes made by other workers are picked up by a full
+rebuild every ``SUGGEST_INDEX_REFRESH_SECONDS``. The interest catalogue has no
+write path in the API; call ``invalidate_suggest_index()`` after editing it.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+import re
+import threading
+import unicodedata
+from typing import Iterable
+from uuid import UUID
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.modules.businesses.models import Business
+from app.modules.interests.models import Interests, ListingInterest
+
+from app.shared.cache import RefreshingValue
+
+from .models import Listing, Statuses
+
+SUGGEST_STATUSES = (Statuses.active, Statuses.approved)
+
+_WORD_SPLIT = re.compile(r"[^\w]+")
+
+
+def normalize_suggest_text(text: str) -> str:
+    """Casefold, strip accents and collapse punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(word for word in _WORD_SPLIT.split(stripped) if word)
+
+
+def suggest_keys(text: str) -> set[str]:
+    """One key per word start, so "old town" also matches "town"."""
+    words = normalize_suggest_text(text).split(" ")
+    return {" ".join(words[index:]) for index in range(len(words)) if words[index]}
+
+
+@dataclass(frozen=True, slots=True)
+class ListingTerms:
+    title: str
+    city: str | None
+    business_id: UUID | None
+    interest_ids: frozenset[UUID]
+
+    def shared_refs(self) -> list[tuple[str, str]]:
+        refs = []
+        if self.city and normalize_suggest_text(self.city):
+            refs.append(("city", normalize_suggest_text(self.city)))
+        if self.business_id is not None:
+            refs.append(("business", str(self.business_id)))
+        refs.extend(("interest", str(interest_id)) for interest_id in self.interest_ids)
+        return refs
+
+
+class SuggestIndex:
+    """Sorted ``(key, kind, ref, text)`` entries with reference-counted shared terms."""
+
+    def __init__(self):
+        self._entries: list[tuple[str, str, str, str]] = []
+        self._listings: dict[UUID, ListingTerms] = {}
+        self._refs: Counter[tuple[str, str]] = Counter()
+        self._names: dict[tuple[str, str], str] = {}
+        self._bulk = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add_entries(self, kind: str, ref: str, text: str) -> None:
+        for key in suggest_keys(text):
+            if self._bulk:
+                self._entries.append((key, kind, ref, text))
+            else:
+                insort(self._entries, (key, kind, ref, text))
+
+    def _remove_entries(self, kind: str, ref: str, text: str) -> None:
+        for key in suggest_keys(text):
+            entry = (key, kind, ref, text)
+            index = bisect_left(self._entries, entry)
+            if index < len(self._entries) and self._entries[index] == entry:
+                del self._entries[index]
+
+    def _acquire(self, kind: str, ref: str) -> None:
+        self._refs[(kind, ref)] += 1
+        text = self._names.get((kind, ref))
+        if self._refs[(kind, ref)] == 1 and text:
+            self._add_entries(kind, ref, text)
+
+    def _release(self, kind: str, ref: str) -> None:
+        self._refs[(kind, ref)] -= 1
+        if self._refs[(kind, ref)] <= 0:
+            del self._refs[(kind, ref)]
+            text = self._names.get((kind, ref))
+            if text:
+                self._remove_entries(kind, ref, text)
+
+    def set_name(self, kind: str, ref: str, text: str) -> None:
+        """Name a business or interest; renames swap the entries in place."""
+        with self._lock:
+            old = self._names.get((kind, ref))
+            if old == text:
+                return
+            self._names[(kind, ref)] = text
+            if self._refs[(kind, ref)] > 0:
+                if old:
+                    self._remove_entries(kind, ref, old)
+                self._add_entries(kind, ref, text)
+
+    def has_name(self, kind: str, ref: str) -> bool:
+        return (kind, ref) in self._names
+
+    def put_listing(self, listing_id: UUID, terms: ListingTerms | None) -> None:
+        """Replace a listing's contribution; ``None`` removes it."""
+        with self._lock:
+            self._put_listing(listing_id, terms)
+
+    def add_listings(self, listings: Iterable[tuple[UUID, ListingTerms]]) -> None:
+        """Add listings not yet in the index with one sort instead of an insort each."""
+        with self._lock:
+            self._bulk = True
+            try:
+                for listing_id, terms in listings:
+                    self._put_listing(listing_id, terms)
+            finally:
+                self._bulk = False
+                self._entries.sort()
+
+    def _put_listing(self, listing_id: UUID, terms: ListingTerms | None) -> None:
+        old = self._listings.pop(listing_id, None)
+        if old is not None:
+            self._remove_entries("listing", str(listing_id), old.title)
+            for kind, ref in old.shared_refs():
+                self._release(kind, ref)
+        if terms is None:
+            return
+        self._listings[listing_id] = terms
+        self._add_entries("listing", str(listing_id), terms.title)
+        for kind, ref in terms.shared_refs():
+            if kind == "city":
+                self._names.setdefault((kind, ref), terms.city)
+            self._acquire(kind, ref)
+
+    def search(self, prefix: str, limit: int = 10) -> list[dict]:
+        query = normalize_suggest_text(prefix)
+        if not query:
+            return []
+        suggestions = []
+        seen = set()
+        with self._lock:
+            index = bisect_left(self._entries, (query,))
+            while index < len(self._entries) and len(suggestions) < limit:
+                key, kind, ref, text = self._entries[index]
+                if not key.startswith(query):
+                    break
+                if (kind, ref) not in seen:
+                    seen.add((kind, ref))
+                    suggestions.append(
+                        {"kind": kind, "id": None if kind == "city" else ref, "text": text}
+                    )
+                index += 1
+        return suggestions
+
+
+def listing_terms(
+    listing: Listing, interest_ids: Iterable[UUID] = ()
+) -> ListingTerms | None:
+    if listing.status not in SUGGEST_STATUSES or not listing.title:
+        return None
+    city = (listing.address or {}).get("city")
+    return ListingTerms(
+        title=listing.title,
+        city=city if isinstance(city, str) else None,
+        business_id=listing.business_id,
+        interest_ids=frozenset(interest_ids),
+    )
+
+
+def load_suggest_index(db: Session) -> SuggestIndex:
+    """Build a fresh index with three statements."""
+    index = SuggestIndex()
+    listings = db.exec(
+        select(
+            Listing.id,
+            Listing.title,
+            Listing.address["city"].astext,
+            Listing.business_id,
+        ).where(col(Listing.status).in_(SUGGEST_STATUSES))
+    ).all()
+
+    interest_ids: dict[UUID, set[UUID]] = {}
+    for listing_id, interest_id, name in db.exec(
+        select(ListingInterest.listing_id, Interests.id, Interests.name)
+        .join(Interests, Interests.id == ListingInterest.interest_id)
+        .join(Listing, Listing.id == ListingInterest.listing_id)
+        .where(col(Listing.status).in_(SUGGEST_STATUSES))
+    ).all():
+        interest_ids.setdefault(listing_id, set()).add(interest_id)
+        index.set_name("interest", str(interest_id), name)
+
+    for business_id, business_name in db.exec(
+        select(Business.id, Business.business_name).where(
+            col(Business.id).in_(
+                select(Listing.business_id).where(col(Listing.status).in_(SUGGEST_STATUSES))
+            )
+        )
+    ).all():
+        index.set_name("business", str(business_id), business_name)
+
+    index.add_listings(
+        (
+            listing_id,
+            ListingTerms(
+                title=title,
+                city=city,
+                business_id=business_id,
+                interest_ids=frozenset(interest_ids.get(listing_id, ())),
+            ),
+        )
+        for listing_id, title, city, business_id in listings
+        if title
+    )
+    return index
+
+
+suggest_index: RefreshingValue[SuggestIndex] = RefreshingValue(
+    settings.SUGGEST_INDEX_REFRESH_SECONDS
+)
+
+
+def get_suggest_index(db: Session) -> SuggestIndex:
+    return suggest_index.get(lambda: load_suggest_index(db))
+
+
+def suggest(db: Session, q: str, limit: int = 10) -> list[dict]:
+    return get_suggest_index(db).search(q, limit)
+
+
+def record_listing_suggestions(
+    db: Session, listing: Listing, interest_ids: Iterable[UUID] = ()
+) -> None:
+    """Apply a committed listing write; a no-op until the index is first built."""
+    index = suggest_index.current
+    if index is None:
+        return
+    terms = listing_terms(listing, interest_ids)
+    if terms is not None:
+        business_id = terms.business_id
+        if business_id is not None and not index.has_name("business", str(business_id)):
+            business = db.get(Business, business_id)
+            if business is not None:
+                index.set_name("business", str(business_id), business.business_name)
+        unnamed = [
+            interest_id
+            for interest_id in terms.interest_ids
+            if not index.has_name("interest", str(interest_id))
+        ]
+        if unnamed:
+            for interest_id, name in db.exec(
+                select(Interests.id, Interests.name).where(col(Interests.id).in_(unnamed))
+            ).all():
+                index.set_name("interest", str(interest_id), name)
+    index.put_listing(listing.id, terms)
+
+
+def rename_business_suggestions(business_id: UUID, business_name: str) -> None:
+    index = suggest_index.current
+    if index is not None:
+        index.set_name("business", str(business_id), business_name)
+
+
+def invalidate_suggest_index() -> None:
+    """Force a full rebuild on the next query."""
+    suggest_index.invalidate()
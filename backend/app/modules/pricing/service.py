@@ -10,7 +10,7 @@ from sqlalchemy import or_
 
 from app.modules.pricing.models import PlatformPricingConfig
 from app.modules.listings.models import Listing
-from app.modules.services.service import get_service_by_id  # reference pattern
+from app.modules.services.cache import get_service_descriptor, load_service_descriptors
 
 
 def now_utc() -> datetime:
@@ -59,31 +59,57 @@ def get_pricing_config(db: Session, business_type_id: Optional[UUID] = None) ->
     raise HTTPException(status_code=404, detail="Pricing config not found")
 
 
-def calculate_display_price(db: Session, listing_id: UUID, service_id: Optional[UUID] = None) -> dict:
+def calculate_display_price(
+    db: Session,
+    listing_id: UUID,
+    service_id: Optional[UUID] = None,
+    *,
+    cached: bool = True,
+) -> dict:
     """Calculate display price for a listing (and optional service).
 
     Returns dict with: base_price, service_fee_percent, service_fee_amount, display_price
+
+    Booking and payment paths pass ``cached=False``: another worker may have
+    changed the price since this process cached the service descriptor, and
+    what a guest is charged must come from the rows.
     """
+    # Service price, listing price and business type come from the service
+    # descriptor; the Listing is only loaded for listing-level prices
+    service = None
+    if service_id is not None:
+        service = (
+            get_service_descriptor(db, service_id)
+            if cached
+            else load_service_descriptors(db, [service_id]).get(service_id)
+        )
+        if service is None:
+            raise HTTPException(status_code=404, detail="Service not found")
+    if service is not None and service.listing_id == listing_id:
+        listing_base_price = service.listing_base_price
+        business_type_id = service.business_type_id
+    else:
+        listing = db.get(Listing, listing_id)
+        if listing is None:
+            raise HTTPException(status_code=404, detail="Listing not found")
+        listing_base_price = listing.base_price
+        business_type_id = listing.business_type
+
     # Resolve base price: prefer service.price if provided, otherwise listing.base_price
-    listing = db.get(Listing, listing_id)
-    if listing is None:
-        raise HTTPException(status_code=404, detail="Listing not found")
     base_price: Optional[float] = None
-    if service_id is not None:
-        service = get_service_by_id(db, service_id)
-        if getattr(service, "price", None) is not None:
-            base_price = service.price
+    if service is not None and service.price is not None:
+        base_price = service.price
     if base_price is None:
-        base_price = listing.base_price
+        base_price = listing_base_price
     if base_price is None:
         # As per requirements, raise 400 when listing has no base price
         raise HTTPException(status_code=400, detail="Listing has no base price set")
 
     # Determine pricing config: try listing's business_type first, then global; default to 0.10 if none
     config = None
-    if getattr(listing, "business_type", None) is not None:
+    if business_type_id is not None:
         try:
-            config = get_pricing_config(db, listing.business_type)  # may raise 404
+            config = get_pricing_config(db, business_type_id)  # may raise 404
         except HTTPException:
             config = None
     if config is None:
@@ -0,0 +1,62 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, LargeBinary, String, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlmodel import Field, SQLModel
+
+
+class UserTasteVector(SQLModel, table=True):
+    """
+    A user's taste: the decayed mean of the embeddings of listings they
+    favourited, booked or rated well, as float16 bytes (768 for 384 dims).
+    """
+
+    __tablename__ = "user_taste_vectors"
+
+    user_id: UUID = Field(
+        sa_column=Column(
+            PGUUID(as_uuid=True),
+            ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        )
+    )
+    taste: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    # Total signal weight behind ``taste``, decayed to ``updated_at``
+    weight: float = Field(sa_column=Column(Float, nullable=False))
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=text("now()"),
+        )
+    )
+
+
+class UserTasteSignal(SQLModel, table=True):
+    """
+    What one favourite, booking or review put into a user's taste: the
+    embedding it was folded in with (float16 bytes), its weight and when it
+    was made. Undoing the signal takes out exactly this, whatever the
+    listing's embedding has become since.
+    """
+
+    __tablename__ = "user_taste_signals"
+
+    user_id: UUID = Field(
+        sa_column=Column(
+            PGUUID(as_uuid=True),
+            ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        )
+    )
+    # "favourite" (keyed by listing), "booking" or "review" (keyed by their id)
+    source: str = Field(sa_column=Column(String(16), primary_key=True, nullable=False))
+    source_id: UUID = Field(
+        sa_column=Column(PGUUID(as_uuid=True), primary_key=True, nullable=False)
+    )
+    embedding: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    weight: float = Field(sa_column=Column(Float, nullable=False))
+    made_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
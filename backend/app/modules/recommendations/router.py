@@ -1,5 +1,26 @@
-from fastapi import APIRouter
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app.infrastructure.database import get_db
+
+from .schemas import SimilarListingResponse
+from .service import get_similar_listings
 
 router = APIRouter(prefix="/api/ai", tags=["AI"])
 
-# TODO: implement AI endpoints
+
+@router.get(
+    "/listings/{listing_id}/similar",
+    response_model=List[SimilarListingResponse],
+)
+def get_similar_listings_endpoint(
+    listing_id: UUID,
+    limit: int = Query(default=10, ge=1, le=50),
+    radius_km: float | None = Query(default=None, gt=0, le=200),
+    db: Session = Depends(get_db),
+):
+    """Live listings most like this one, optionally within ``radius_km`` of it."""
+    return get_similar_listings(db, listing_id, limit, radius_km)
@@ -0,0 +1,5 @@
+from app.modules.listings.schemas import ListingResponse
+
+
+class SimilarListingResponse(ListingResponse):
+    similarity: float
@@ -1 +1,209 @@
 """Business logic for recommendations."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, text
+from sqlmodel import Session, select
+
+from app.modules.listings.models import Listing
+from app.modules.listings.service import (
+    ACTIVE_LIKE_STATUSES,
+    search_point,
+    select_listing_cards,
+    serialize_listing_rows,
+)
+from app.modules.reviews.classifiers.ml_classifier import get_embedding_model
+
+from .vector_index import get_numpy_vector_index
+
+# The bundled sentence encoder shared with review classification
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def listing_embedding_text(
+    title: str | None,
+    description: str | None,
+    business_type_name: str | None,
+    interest_names: Iterable[str] | None,
+) -> str:
+    """The text a listing is embedded from, most significant parts first."""
+    parts = [title or ""]
+    if business_type_name:
+        parts.append(business_type_name)
+    interests = sorted({name for name in interest_names or () if name})
+    if interests:
+        parts.append("Interests: " + ", ".join(interests))
+    if description:
+        parts.append(description)
+    return ". ".join(part.strip() for part in parts if part and part.strip())
+
+
+def embedding_content_hash(text: str) -> str:
+    """Changes whenever the text or the model does, and only then."""
+    return hashlib.sha256(f"{EMBEDDING_MODEL_NAME}\n{text}".encode()).hexdigest()
+
+
+def load_embedding_model() -> Any:
+    model = get_embedding_model()
+    if model is None:
+        raise RuntimeError(
+            f"Embedding model {EMBEDDING_MODEL_NAME} is unavailable; "
+            "install sentence-transformers"
+        )
+    return model
+
+
+def encode_texts(model: Any, texts: Sequence[str], batch_size: int):
+    """Unit-length float32 vectors, so cosine similarity is a dot product."""
+    return model.encode(
+        list(texts),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+
+
+# HNSW candidates visited per query; headroom for the status/radius post-filter
+HNSW_EF_SEARCH = 100
+
+_vector_backend: str | None = None
+
+
+def vector_search_backend(db: Session) -> str:
+    """``"pgvector"`` when the HNSW index exists, else ``"numpy"``. Checked once."""
+    global _vector_backend
+    if _vector_backend is None:
+        has_hnsw = db.get_bind().dialect.name == "postgresql" and db.exec(
+            text("SELECT to_regclass('ix_listings_embedding_hnsw') IS NOT NULL")
+        ).scalar_one()
+        _vector_backend = "pgvector" if has_hnsw else "numpy"
+    return _vector_backend
+
+
+def _neighbour_filters(
+    exclude: UUID | None,
+    center: tuple[float, float] | None,
+    radius_km: float | None,
+) -> list:
+    filters = [
+        Listing.status.in_(ACTIVE_LIKE_STATUSES),
+        Listing.embedding.is_not(None),
+    ]
+    if exclude is not None:
+        filters.append(Listing.id != exclude)
+    if center is not None and radius_km is not None:
+        filters.append(
+            func.ST_DWithin(Listing.location, search_point(*center), radius_km * 1000)
+        )
+    return filters
+
+
+def nearest_listing_ids(
+    db: Session,
+    vector: Sequence[float],
+    limit: int,
+    *,
+    exclude: UUID | None = None,
+    center: tuple[float, float] | None = None,
+    radius_km: float | None = None,
+) -> list[tuple[UUID, float]]:
+    """``(listing_id, cosine similarity)`` of the live listings nearest ``vector``."""
+    if vector_search_backend(db) == "pgvector":
+        distance = Listing.embedding.cosine_distance(vector)
+        db.exec(text(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}"))
+        rows = db.exec(
+            select(Listing.id, distance.label("distance"))
+            .where(*_neighbour_filters(exclude, center, radius_km))
+            .order_by(distance)
+            .limit(limit)
+        ).all()
+        return [(row.id, 1 - float(row.distance)) for row in rows]
+    return get_numpy_vector_index(db).nearest(
+        vector, limit, exclude=exclude, center=center, radius_km=radius_km
+    )
+
+
+@lru_cache(maxsize=1024)
+def _cached_query_embedding(query: str) -> tuple[float, ...]:
+    return tuple(encode_texts(load_embedding_model(), [query], 1)[0].tolist())
+
+
+def embed_query(query: str) -> tuple[float, ...] | None:
+    """The search text as a unit vector, or ``None`` without the encoder."""
+    if get_embedding_model() is None:
+        return None
+    return _cached_query_embedding(" ".join(query.split()).casefold())
+
+
+def get_similar_listings(
+    db: Session,
+    listing_id: UUID,
+    limit: int = 10,
+    radius_km: float | None = None,
+) -> list[dict]:
+    """
+    Live listings closest to ``listing_id`` by cosine similarity of their
+    embeddings, optionally within ``radius_km`` of it, as cards with a
+    ``similarity`` score. Listings without an embedding yet have no neighbours.
+    """
+    point = func.geometry(Listing.location)
+    source = db.exec(
+        select(
+            Listing.embedding,
+            func.ST_Y(point).label("lat"),
+            func.ST_X(point).label("lng"),
+        ).where(Listing.id == listing_id)
+    ).first()
+    if source is None:
+        raise HTTPException(status_code=404, detail="Listing not found")
+    if source.embedding is None:
+        return []
+    within_radius = radius_km is not None and source.lat is not None
+
+    if vector_search_backend(db) == "pgvector":
+        distance = Listing.embedding.cosine_distance(source.embedding)
+        query = select_listing_cards(distance.label("distance")).where(
+            *_neighbour_filters(
+                listing_id,
+                (source.lat, source.lng) if within_radius else None,
+                radius_km,
+            )
+        )
+        db.exec(text(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}"))
+        rows = db.exec(query.order_by(distance).limit(limit)).all()
+        similarities = [1 - float(row.distance) for row in rows]
+    else:
+        hits = get_numpy_vector_index(db).nearest(
+            source.embedding,
+            limit,
+            exclude=listing_id,
+            center=(source.lat, source.lng) if within_radius else None,
+            radius_km=radius_km if within_radius else None,
+        )
+        rows_by_id = (
+            {
+                row.id: row
+                for row in db.exec(
+                    select_listing_cards()
+                    .where(Listing.id.in_([hit_id for hit_id, _ in hits]))
+                    .where(Listing.status.in_(ACTIVE_LIKE_STATUSES))
+                ).all()
+            }
+            if hits
+            else {}
+        )
+        hits = [(hit_id, score) for hit_id, score in hits if hit_id in rows_by_id]
+        rows = [rows_by_id[hit_id] for hit_id, _ in hits]
+        similarities = [score for _, score in hits]
+
+    cards = serialize_listing_rows(db, rows)
+    for card, similarity in zip(cards, similarities):
+        card["similarity"] = round(similarity, 6)
+    return cards
@@ -0,0 +1,406 @@
+"""User taste vectors.
+
+A user's taste is the exponentially decayed, weighted mean of the embeddings
+of listings they favourited, booked or rated above three stars, with a
+half-life of ``TASTE_HALF_LIFE_DAYS``. It lives in ``user_taste_vectors`` and
+is adjusted in the same transaction as each of those writes. What each signal
+put in (the embedding, its weight and when it was made) is kept in
+``user_taste_signals``; undoing one (unfavouriting, cancelling, deleting a
+review) recomputes the taste from the signals that remain. A signal skipped
+because its listing was not embedded yet leaves nothing to retract, and a
+listing re-encoded since takes out the vector that went in.
+
+A booking counts once it is approved, so pending bookings that are never paid
+leave nothing for the expiry job to retract.
+
+The personalized feed is then one nearest-neighbour probe of the listing
+embedding index with the taste vector. ``rebuild_user_tastes`` recomputes
+every vector and signal from history with the current embeddings; the bookings
+scheduler runs it nightly, or as a backfill::
+
+    python -m app.modules.recommendations.taste
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import groupby
+import logging
+import time
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Float, cast, delete, insert, literal, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
+
+from app.infrastructure.database import get_engine
+from app.modules.bookings.models import Booking, BookingStatus
+from app.modules.favourites.models import Favourites
+from app.modules.listings.models import EMBEDDING_DIMENSIONS, Listing
+from app.modules.reviews.models import Review
+from app.modules.services.models import Service
+
+from .models import UserTasteSignal, UserTasteVector
+from .service import nearest_listing_ids
+
+logger = logging.getLogger(__name__)
+
+TASTE_HALF_LIFE_DAYS = 90
+TASTE_HALF_LIFE_SECONDS = TASTE_HALF_LIFE_DAYS * 24 * 60 * 60
+FAVOURITE_WEIGHT = 1.0
+BOOKING_WEIGHT = 2.0
+# ``UserTasteSignal.source``: favourites are keyed by listing, the rest by id
+FAVOURITE_SIGNAL = "favourite"
+BOOKING_SIGNAL = "booking"
+REVIEW_SIGNAL = "review"
+BOOKED_STATUSES = (BookingStatus.approved, BookingStatus.completed)
+# Per star above a neutral three: five stars weigh 1.5, three or fewer nothing
+REVIEW_WEIGHT_PER_STAR = 0.75
+NEUTRAL_RATING = 3
+# Below this much decayed weight a taste is too thin; interests rank instead
+MIN_TASTE_WEIGHT = 0.5
+
+
+def decay_factor(age_seconds: float) -> float:
+    return 0.5 ** (max(age_seconds, 0.0) / TASTE_HALF_LIFE_SECONDS)
+
+
+def review_weight(rating: int | None) -> float:
+    if rating is None:
+        return 0.0
+    return max(rating - NEUTRAL_RATING, 0) * REVIEW_WEIGHT_PER_STAR
+
+
+def _vector_bytes(embedding) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).astype(np.float16).tobytes()
+
+
+def _timestamp(moment: datetime | None) -> float:
+    """Epoch seconds; ``None`` is now (rows not flushed yet), naive is UTC."""
+    if moment is None:
+        return time.time()
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class TasteState:
+    """The running decayed mean, and the decayed weight behind it, as of ``at``."""
+
+    __slots__ = ("taste", "weight", "at")
+
+    def __init__(self, taste=None, weight: float = 0.0, at: float = 0.0):
+        self.taste = (
+            np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+            if taste is None
+            else np.asarray(taste, dtype=np.float32)
+        )
+        self.weight = weight
+        self.at = at
+
+    @classmethod
+    def from_row(cls, row: UserTasteVector) -> "TasteState":
+        taste = np.frombuffer(row.taste, dtype=np.float16) if row.taste else None
+        return cls(taste, row.weight, _timestamp(row.updated_at))
+
+    def to_bytes(self) -> bytes:
+        return self.taste.astype(np.float16).tobytes()
+
+    def weight_at(self, now: float) -> float:
+        return self.weight * decay_factor(now - self.at)
+
+    def add(self, embedding, weight: float, made_at: float, now: float) -> None:
+        """Fold in one signal made at ``made_at``. Retracting is a recompute."""
+        total = self.weight_at(now)
+        signal = weight * decay_factor(now - made_at)
+        if signal <= 0.0:
+            return
+        new_total = total + signal
+        vector = np.asarray(embedding, dtype=np.float32)
+        self.taste = (self.taste * total + vector * signal) / new_total
+        self.weight, self.at = new_total, now
+
+
+def load_taste_state(db: Session, user_id: UUID, now: float) -> TasteState:
+    """A user's taste recomputed from the signals on record, as of ``now``."""
+    state = TasteState(at=now)
+    for signal in db.exec(
+        select(UserTasteSignal).where(UserTasteSignal.user_id == user_id)
+    ).all():
+        state.add(
+            np.frombuffer(signal.embedding, dtype=np.float16),
+            signal.weight,
+            _timestamp(signal.made_at),
+            now,
+        )
+    return state
+
+
+def apply_taste_signal(
+    db: Session,
+    user_id: UUID,
+    listing_id: UUID | None,
+    source: str,
+    source_id: UUID,
+    weight: float,
+    made_at: datetime | None,
+) -> None:
+    """
+    Set what one favourite, booking or review adds to a user's taste, locking
+    their row; a zero weight retracts it. A new signal is folded in, anything
+    else recomputes the taste from the signals on record. Does not commit;
+    callers commit with their own write.
+    """
+    if weight:
+        if listing_id is None:
+            return
+        embedding = db.exec(
+            select(Listing.embedding).where(Listing.id == listing_id)
+        ).first()
+        if embedding is None:
+            # Not embedded yet: skipped here, picked up by the next rebuild
+            return
+        db.exec(
+            pg_insert(UserTasteVector)
+            .values(user_id=user_id, taste=b"", weight=0.0)
+            .on_conflict_do_nothing()
+        )
+    row = db.exec(
+        select(UserTasteVector)
+        .where(UserTasteVector.user_id == user_id)
+        .with_for_update()
+    ).first()
+    if row is None:
+        return
+    signal = db.exec(
+        select(UserTasteSignal)
+        .where(UserTasteSignal.user_id == user_id)
+        .where(UserTasteSignal.source == source)
+        .where(UserTasteSignal.source_id == source_id)
+    ).first()
+    now = time.time()
+    if signal is None:
+        if not weight:
+            # Its add was skipped, so there is nothing to take out
+            return
+        signal = UserTasteSignal(
+            user_id=user_id,
+            source=source,
+            source_id=source_id,
+            embedding=_vector_bytes(embedding),
+            weight=weight,
+            made_at=datetime.fromtimestamp(_timestamp(made_at), timezone.utc),
+        )
+        db.add(signal)
+        state = TasteState.from_row(row)
+        state.add(
+            np.frombuffer(signal.embedding, dtype=np.float16),
+            weight,
+            _timestamp(signal.made_at),
+            now,
+        )
+    elif signal.weight == weight:
+        return
+    else:
+        if weight:
+            signal.weight = weight
+            db.add(signal)
+        else:
+            db.delete(signal)
+        db.flush()
+        state = load_taste_state(db, user_id, now)
+    row.taste = state.to_bytes()
+    row.weight = state.weight
+    row.updated_at = datetime.fromtimestamp(now, timezone.utc)
+    db.add(row)
+
+
+def record_favourite_added(db: Session, user_id: UUID, listing_id: UUID) -> None:
+    apply_taste_signal(
+        db, user_id, listing_id, FAVOURITE_SIGNAL, listing_id, FAVOURITE_WEIGHT, None
+    )
+
+
+def record_favourite_removed(db: Session, favourite: Favourites) -> None:
+    apply_taste_signal(
+        db,
+        favourite.user_id,
+        favourite.listing_id,
+        FAVOURITE_SIGNAL,
+        favourite.listing_id,
+        0.0,
+        favourite.created_at,
+    )
+
+
+def record_booking_status_changed(
+    db: Session,
+    booking: Booking,
+    previous_status: BookingStatus | None,
+    listing_id: UUID | None = None,
+) -> None:
+    """Add the booking's signal when it becomes approved, retract it when it stops counting."""
+    was_booked = previous_status in BOOKED_STATUSES
+    is_booked = booking.status in BOOKED_STATUSES
+    if was_booked == is_booked:
+        return
+    if is_booked and listing_id is None:
+        listing_id = db.exec(
+            select(Service.listing_id).where(Service.service_id == booking.service_id)
+        ).first()
+    apply_taste_signal(
+        db,
+        booking.user_id,
+        listing_id,
+        BOOKING_SIGNAL,
+        booking.id,
+        BOOKING_WEIGHT if is_booked else 0.0,
+        booking.created_at,
+    )
+
+
+def record_review_rated(
+    db: Session, review: Review, old_rating: int | None, new_rating: int | None
+) -> None:
+    """A review added (no old rating), re-rated, or removed (no new rating)."""
+    weight = review_weight(new_rating)
+    if review_weight(old_rating) == weight:
+        return
+    apply_taste_signal(
+        db,
+        review.user_id,
+        review.listing_id,
+        REVIEW_SIGNAL,
+        review.id,
+        weight,
+        review.created_at,
+    )
+
+
+def get_taste_vector(db: Session, user_id) -> np.ndarray | None:
+    """The user's taste, or ``None`` while it rests on too little signal."""
+    row = db.get(UserTasteVector, user_id)
+    if row is None:
+        return None
+    state = TasteState.from_row(row)
+    if state.weight_at(time.time()) < MIN_TASTE_WEIGHT:
+        return None
+    return state.taste
+
+
+def rank_taste_listing_ids(db: Session, user_id, limit: int) -> list[UUID]:
+    taste = get_taste_vector(db, user_id)
+    if taste is None:
+        return []
+    return [listing_id for listing_id, _ in nearest_listing_ids(db, taste, limit)]
+
+
+def select_taste_signals(user_ids: Sequence[UUID] | None = None):
+    """Every signal behind users' tastes, with its listing's embedding, by user."""
+    signals = union_all(
+        select(
+            Favourites.user_id,
+            Favourites.listing_id,
+            literal(FAVOURITE_SIGNAL).label("source"),
+            Favourites.listing_id.label("source_id"),
+            Favourites.created_at,
+            literal(FAVOURITE_WEIGHT, Float).label("weight"),
+        ),
+        select(
+            Booking.user_id,
+            Service.listing_id,
+            literal(BOOKING_SIGNAL),
+            Booking.id,
+            Booking.created_at,
+            literal(BOOKING_WEIGHT, Float),
+        )
+        .join(Service, Service.service_id == Booking.service_id)
+        .where(Booking.status.in_(BOOKED_STATUSES)),
+        select(
+            Review.user_id,
+            Review.listing_id,
+            literal(REVIEW_SIGNAL),
+            Review.id,
+            Review.created_at,
+            cast(Review.rating - NEUTRAL_RATING, Float) * REVIEW_WEIGHT_PER_STAR,
+        ).where(Review.rating > NEUTRAL_RATING),
+    ).subquery()
+    query = (
+        select(
+            signals.c.user_id,
+            signals.c.source,
+            signals.c.source_id,
+            signals.c.created_at,
+            signals.c.weight,
+            Listing.embedding,
+        )
+        .join(Listing, Listing.id == signals.c.listing_id)
+        .where(Listing.embedding.is_not(None))
+        .order_by(signals.c.user_id)
+    )
+    if user_ids is not None:
+        query = query.where(signals.c.user_id.in_(user_ids))
+    return query
+
+
+def rebuild_user_tastes(db: Session, user_ids: Sequence[UUID] | None = None) -> dict:
+    """
+    Recompute taste vectors, and the signals behind them, from favourites,
+    approved bookings and reviews with the current embeddings, for
+    ``user_ids`` or everyone, replacing the stored rows in one transaction.
+    """
+    now = time.time()
+    updated_at = datetime.fromtimestamp(now, timezone.utc)
+    rows = []
+    signal_rows = []
+    for user_id, signals in groupby(
+        db.exec(select_taste_signals(user_ids)).all(), key=lambda row: row.user_id
+    ):
+        state = TasteState(at=now)
+        for signal in signals:
+            embedding = _vector_bytes(signal.embedding)
+            made_at = _timestamp(signal.created_at)
+            state.add(np.frombuffer(embedding, dtype=np.float16), signal.weight, made_at, now)
+            signal_rows.append(
+                {
+                    "user_id": user_id,
+                    "source": signal.source,
+                    "source_id": signal.source_id,
+                    "embedding": embedding,
+                    "weight": signal.weight,
+                    "made_at": datetime.fromtimestamp(made_at, timezone.utc),
+                }
+            )
+        if state.weight:
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "taste": state.to_bytes(),
+                    "weight": state.weight,
+                    "updated_at": updated_at,
+                }
+            )
+
+    for model in (UserTasteSignal, UserTasteVector):
+        stale = delete(model)
+        if user_ids is not None:
+            stale = stale.where(model.user_id.in_(user_ids))
+        db.exec(stale)
+    if rows:
+        db.exec(insert(UserTasteVector), params=rows)
+    if signal_rows:
+        db.exec(insert(UserTasteSignal), params=signal_rows)
+    db.commit()
+    return {"users": len(rows), "signals": len(signal_rows)}
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with Session(get_engine()) as db:
+        logger.info("Rebuilt user taste vectors: %s", rebuild_user_tastes(db))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""In-process brute-force vector index.
+
+Fallback for "more like this" when Postgres has no HNSW index on
+``listings.embedding`` (pgvector missing or older than 0.5, or a test
+database). Embeddings are unit length, so cosine similarity is one matrix
+product and the top k come from ``argpartition``. At 100k x 384 floats that is
+about 150 MB, and each query streams all of it (~20 ms on one core), so this
+serves tests and small catalogues; the HNSW path is the low-millisecond one.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.modules.listings.models import EMBEDDING_DIMENSIONS, Listing, Statuses
+from app.shared.cache import RefreshingValue
+
+INDEXED_STATUSES = (Statuses.active, Statuses.approved)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lats, lngs, lat: float, lng: float):
+    lat1, lng1 = np.radians(lats), np.radians(lngs)
+    lat2, lng2 = math.radians(lat), math.radians(lng)
+    a = (
+        np.sin((lat1 - lat2) / 2) ** 2
+        + np.cos(lat1) * math.cos(lat2) * np.sin((lng1 - lng2) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class NumpyVectorIndex:
+    def __init__(
+        self,
+        rows: Iterable[tuple[UUID, Iterable[float], float | None, float | None]],
+    ):
+        """``rows`` are ``(listing_id, embedding, lat, lng)``."""
+        rows = list(rows)
+        self.ids = [row[0] for row in rows]
+        self.positions = {listing_id: position for position, listing_id in enumerate(self.ids)}
+        vectors = np.asarray(
+            [np.asarray(row[1], dtype=np.float32) for row in rows], dtype=np.float32
+        ).reshape(len(rows), -1 if rows else EMBEDDING_DIMENSIONS)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = vectors / np.where(norms == 0, 1, norms)
+        self.lats = np.array([np.nan if row[2] is None else row[2] for row in rows], dtype=float)
+        self.lngs = np.array([np.nan if row[3] is None else row[3] for row in rows], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nearest(
+        self,
+        vector: Iterable[float],
+        limit: int,
+        *,
+        exclude: UUID | None = None,
+        center: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """``(listing_id, cosine similarity)`` pairs, most similar first."""
+        if not self.ids or limit <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+        scores = self.vectors @ query
+
+        mask = np.ones(len(self.ids), dtype=bool)
+        if exclude in self.positions:
+            mask[self.positions[exclude]] = False
+        if center is not None and radius_km is not None:
+            with np.errstate(invalid="ignore"):
+                mask &= haversine_km(self.lats, self.lngs, *center) <= radius_km
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        k = min(limit, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[position], float(scores[position])) for position in top]
+
+
+def load_numpy_vector_index(db: Session) -> NumpyVectorIndex:
+    point = func.geometry(Listing.location)
+    rows = db.exec(
+        select(Listing.id, Listing.embedding, func.ST_Y(point), func.ST_X(point))
+        .where(col(Listing.status).in_(INDEXED_STATUSES))
+        .where(Listing.embedding.is_not(None))
+    ).all()
+    return NumpyVectorIndex(rows)
+
+
+numpy_vector_index: RefreshingValue[NumpyVectorIndex] = RefreshingValue(
+    settings.VECTOR_INDEX_REFRESH_SECONDS
+)
+
+
+def get_numpy_vector_index(db: Session) -> NumpyVectorIndex:
+    return numpy_vector_index.get(lambda: load_numpy_vector_index(db))
+
+
+def set_numpy_vector_index(index: NumpyVectorIndex | None) -> None:
+    """Install a prebuilt index (tests, warm starts); ``None`` forces a reload."""
+    numpy_vector_index.set(index)
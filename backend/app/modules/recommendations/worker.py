@@ -1 +1,153 @@
-"""Background worker for generating recommendations."""
+"""Background worker for generating recommendations.
+
+Keeps ``listings.embedding`` in step with listing content. Each pass walks the
+listings in id order, rebuilds their embedding text (title, business type,
+interests, description) and compares its hash with
+``embedding_content_hash``; only listings whose text changed are encoded, in
+large CPU batches, and written back with one bulk UPDATE per batch. A pass over
+unchanged listings therefore reads text but never runs the model.
+
+    python -m app.modules.recommendations.worker [--interval SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from app.infrastructure.database import get_engine
+from app.modules.businesses.models import BusinessType
+from app.modules.interests.models import Interests, ListingInterest
+from app.modules.listings.models import Listing, Statuses
+
+from .service import (
+    embedding_content_hash,
+    encode_texts,
+    listing_embedding_text,
+    load_embedding_model,
+)
+
+logger = logging.getLogger(__name__)
+
+# Listings become recommendable (and get embedded) once they are live
+EMBEDDED_STATUSES = (Statuses.active, Statuses.approved)
+SCAN_BATCH_SIZE = 1000
+ENCODE_BATCH_SIZE = 128
+
+
+def select_embedding_sources(after_id: UUID | None, limit: int):
+    """One page of listings with everything their embedding text needs."""
+    interest_names = func.array_agg(Interests.name).filter(Interests.name.is_not(None))
+    query = (
+        select(
+            Listing.id,
+            Listing.title,
+            Listing.description,
+            BusinessType.name.label("business_type_name"),
+            interest_names.label("interest_names"),
+            Listing.embedding_content_hash,
+        )
+        .outerjoin(BusinessType, BusinessType.id == Listing.business_type)
+        .outerjoin(ListingInterest, ListingInterest.listing_id == Listing.id)
+        .outerjoin(Interests, Interests.id == ListingInterest.interest_id)
+        .where(Listing.status.in_(EMBEDDED_STATUSES))
+        .group_by(Listing.id, BusinessType.name)
+        .order_by(Listing.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(Listing.id > after_id)
+    return query
+
+
+def write_embeddings(db: Session, pending: list[tuple[UUID, str, str]], model: Any) -> None:
+    """Encode ``(listing_id, text, hash)`` rows and store them in one bulk UPDATE."""
+    vectors = encode_texts(model, [text for _, text, _ in pending], ENCODE_BATCH_SIZE)
+    db.exec(
+        update(Listing),
+        params=[
+            {
+                "id": listing_id,
+                "embedding": vector.tolist(),
+                "embedding_content_hash": content_hash,
+            }
+            for (listing_id, _, content_hash), vector in zip(pending, vectors)
+        ],
+    )
+    db.commit()
+
+
+def embed_changed_listings(
+    db: Session,
+    model: Any = None,
+    *,
+    scan_batch_size: int = SCAN_BATCH_SIZE,
+) -> dict:
+    """
+    One pass over every listing; returns counts and encoding throughput.
+    The model is only loaded once a listing actually needs encoding.
+    """
+    stats = {"scanned": 0, "encoded": 0, "skipped": 0, "encode_seconds": 0.0}
+    after_id = None
+    while True:
+        rows = db.exec(select_embedding_sources(after_id, scan_batch_size)).all()
+        if not rows:
+            break
+        after_id = rows[-1].id
+        stats["scanned"] += len(rows)
+
+        pending = []
+        for row in rows:
+            text = listing_embedding_text(
+                row.title, row.description, row.business_type_name, row.interest_names
+            )
+            content_hash = embedding_content_hash(text)
+            if content_hash != row.embedding_content_hash:
+                pending.append((row.id, text, content_hash))
+        stats["skipped"] += len(rows) - len(pending)
+
+        if pending:
+            model = model if model is not None else load_embedding_model()
+            started = time.perf_counter()
+            write_embeddings(db, pending, model)
+            stats["encode_seconds"] += time.perf_counter() - started
+            stats["encoded"] += len(pending)
+
+    stats["listings_per_second"] = (
+        stats["encoded"] / stats["encode_seconds"] if stats["encode_seconds"] else 0.0
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Embed listings whose content changed since their last embedding."
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="keep running, starting a new pass every INTERVAL seconds",
+    )
+    parser.add_argument("--scan-batch-size", type=int, default=SCAN_BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # The encoder is cached per process, so later passes reuse it
+    while True:
+        with Session(get_engine()) as db:
+            stats = embed_changed_listings(db, scan_batch_size=args.scan_batch_size)
+        logger.info("Listing embedding pass: %s", stats)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,16 @@ from __future__ import annotations
 
 import json
 import logging
+from typing import Sequence
 
 from .classifiers.keyword_classifier import (
     classify_with_keywords,
     get_classification_approach,
 )
-from .classifiers.ml_classifier import classify_review as ml_classify_review
+from .classifiers.ml_classifier import (
+    classify_review as ml_classify_review,
+    classify_reviews as ml_classify_reviews,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,8 +64,11 @@ def classify_review_text(
     except Exception:
         logger.exception("ML classification failed; falling back to keyword classifier")
         return keyword_result(text, business_type_uuid, "ml_fallback")
+    return ml_result_or_fallback(text, business_type_uuid, ml_result)
+
 
-    if ml_result.get("main_label") is None:
+def ml_result_or_fallback(text: str, business_type_uuid: str, ml_result: dict | None) -> dict:
+    if ml_result is None or ml_result.get("main_label") is None:
         return keyword_result(text, business_type_uuid, "ml_fallback")
 
     normalized = normalize_labels(ml_result)
@@ -73,3 +80,35 @@ def classify_review_text(
         }
     )
     return normalized
+
+
+def classify_review_texts(
+    reviews: Sequence[tuple[str, str | None, str]],
+    timings: dict[str, float] | None = None,
+) -> list[dict]:
+    """
+    ``classify_review_text`` for a batch of ``(text, business_type_name,
+    business_type_uuid)``: keyword types one by one, ML types together.
+    """
+    results: list[dict | None] = [None] * len(reviews)
+    ml_rows = []
+    for row, (text, business_type_name, business_type_uuid) in enumerate(reviews):
+        if get_classification_approach(business_type_name or "") == "ml":
+            ml_rows.append(row)
+        else:
+            results[row] = keyword_result(text, business_type_uuid, "keyword")
+
+    if ml_rows:
+        try:
+            ml_results = ml_classify_reviews(
+                [reviews[row][0] for row in ml_rows],
+                [reviews[row][2] for row in ml_rows],
+                timings,
+            )
+        except Exception:
+            logger.exception("Batch ML classification failed; falling back to keyword classifier")
+            ml_results = [None] * len(ml_rows)
+        for row, ml_result in zip(ml_rows, ml_results):
+            text, _, business_type_uuid = reviews[row]
+            results[row] = ml_result_or_fallback(text, business_type_uuid, ml_result)
+    return results
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 import pickle
 import threading
+import time
 import warnings
 from typing import Any
-from typing import Optional
+from typing import Optional, Sequence
 
 warnings.filterwarnings("ignore")
 
@@ -19,6 +21,9 @@ MODEL_PATH = os.path.join(
 SUPPORTED_LANGUAGES = ["en", "fr", "es", "nl"]
 
 ML_TIMEOUT_SECONDS = 60
+# Concurrent translation calls per batch; each one is a network round trip
+TRANSLATE_WORKERS = 8
+ENCODE_BATCH_SIZE = 64
 
 LOCAL_MODEL_PATH = os.path.join(
     os.path.dirname(__file__), "ml_models", "all-MiniLM-L6-v2"
@@ -179,21 +184,55 @@ def fallback_response(
     }
 
 
+def resolve_business_type(business_type_uuid: str) -> tuple[int, str]:
+    """The pickled models are keyed by these ids."""
+    if business_type_uuid == BUSINESS_TYPE_UUIDS.get("hotel"):
+        return 1, "Hotel"
+    if business_type_uuid == BUSINESS_TYPE_UUIDS.get("restaurant"):
+        return 2, "Restaurant"
+    return 0, "Unknown"
+
+
+def predict_labels(np, model_info: dict, embeddings) -> list[tuple]:
+    """
+    ``(main, second, third)`` for each row of ``embeddings``: the most probable
+    main label, then the two best-scoring other labels. One ``predict_proba``
+    and one ``decision_function`` call cover the whole batch.
+    """
+    clf_main = model_info.get("clf_main")
+    mlb_main = model_info.get("mlb_main")
+    clf_all = model_info.get("clf_all")
+    mlb_all = model_info.get("mlb_all")
+
+    main_labels = [
+        mlb_main.classes_[index]
+        for index in np.argmax(clf_main.predict_proba(embeddings), axis=1)
+    ]
+    if clf_all is None or mlb_all is None:
+        return [(main_label, None, None) for main_label in main_labels]
+
+    labels = []
+    all_scores = clf_all.decision_function(embeddings)
+    for main_label, scores in zip(main_labels, all_scores):
+        secondary_labels = []
+        for idx in np.argsort(scores)[::-1]:
+            label = mlb_all.classes_[idx]
+            if label != main_label:
+                secondary_labels.append(label)
+                if len(secondary_labels) == 2:
+                    break
+        secondary_labels += [None] * (2 - len(secondary_labels))
+        labels.append((main_label, *secondary_labels))
+    return labels
+
+
 def classify_review(
     text: str,
     business_type_uuid: str,
     hotel_name: Optional[str] = None,
     verbose: bool = False,
 ) -> dict:
-    if business_type_uuid == BUSINESS_TYPE_UUIDS.get("hotel"):
-        business_type_id = 1
-        business_type = "Hotel"
-    elif business_type_uuid == BUSINESS_TYPE_UUIDS.get("restaurant"):
-        business_type_id = 2
-        business_type = "Restaurant"
-    else:
-        business_type_id = 0
-        business_type = "Unknown"
+    business_type_id, business_type = resolve_business_type(business_type_uuid)
 
     translated_text, detected_lang = translate_if_needed(text)
 
@@ -223,12 +262,7 @@ def classify_review(
             hotel_name=hotel_name,
         )
 
-    clf_main = model_info.get("clf_main")
-    mlb_main = model_info.get("mlb_main")
-    clf_all = model_info.get("clf_all")
-    mlb_all = model_info.get("mlb_all")
-
-    if clf_main is None or mlb_main is None:
+    if model_info.get("clf_main") is None or model_info.get("mlb_main") is None:
         return fallback_response(
             business_type_id,
             business_type,
@@ -250,25 +284,7 @@ def classify_review(
         )
 
     embedding = embedding_model.encode([translated_text])
-
-    main_proba = clf_main.predict_proba(embedding)
-    main_idx = np.argmax(main_proba[0])
-    main_label = mlb_main.classes_[main_idx]
-
-    if clf_all is not None and mlb_all is not None:
-        all_scores = clf_all.decision_function(embedding)
-        sorted_indices = np.argsort(all_scores[0])[::-1]
-
-        secondary_labels = []
-        for idx in sorted_indices:
-            label = mlb_all.classes_[idx]
-            if label != main_label and len(secondary_labels) < 2:
-                secondary_labels.append(label)
-    else:
-        secondary_labels = []
-
-    second_label = secondary_labels[0] if len(secondary_labels) > 0 else None
-    third_label = secondary_labels[1] if len(secondary_labels) > 1 else None
+    main_label, second_label, third_label = predict_labels(np, model_info, embedding)[0]
 
     if verbose:
         logger.debug(
@@ -290,3 +306,90 @@ def classify_review(
         "second_label": second_label,
         "third_label": third_label,
     }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def classify_reviews(
+    texts: Sequence[str],
+    business_type_uuids: Sequence[str],
+    timings: dict[str, float] | None = None,
+) -> list[dict]:
+    """
+    ``classify_review`` for many reviews at once. Translations run
+    concurrently, every text is encoded by one ``model.encode`` call, and each
+    business type's classifiers score all of its rows together. ``timings``
+    receives the milliseconds spent in each stage.
+    """
+    timings = {} if timings is None else timings
+
+    started = time.perf_counter()
+    languages = [detect_language(text) for text in texts]
+    timings["detect"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    translated = list(texts)
+    foreign = [row for row, language in enumerate(languages) if language != "en"]
+    if foreign:
+        with ThreadPoolExecutor(max_workers=min(TRANSLATE_WORKERS, len(foreign))) as pool:
+            translations = pool.map(
+                lambda row: translate_to_english(texts[row], languages[row]), foreign
+            )
+            for row, translation in zip(foreign, translations):
+                translated[row] = translation
+    timings["translate"] = _elapsed_ms(started)
+
+    business_types = [resolve_business_type(uuid) for uuid in business_type_uuids]
+    results = [
+        fallback_response(
+            business_type_id,
+            business_type,
+            language,
+            text=text,
+            translated_text=translated_text,
+            hotel_name=None,
+        )
+        for (business_type_id, business_type), language, text, translated_text in zip(
+            business_types, languages, texts, translated
+        )
+    ]
+
+    started = time.perf_counter()
+    models_data = load_models()
+    embedding_model = get_embedding_model_with_timeout(ML_TIMEOUT_SECONDS)
+    np = get_numpy()
+    timings["load"] = _elapsed_ms(started)
+    if models_data is None or embedding_model is None or np is None:
+        return results
+
+    models_by_type = models_data.get("models_by_type", {})
+    rows_by_type: dict[int, list[int]] = {}
+    for row, (business_type_id, _) in enumerate(business_types):
+        model_info = models_by_type.get(business_type_id) or {}
+        if model_info.get("clf_main") is not None and model_info.get("mlb_main") is not None:
+            rows_by_type.setdefault(business_type_id, []).append(row)
+    encoded_rows = [row for rows in rows_by_type.values() for row in rows]
+    if not encoded_rows:
+        return results
+
+    started = time.perf_counter()
+    embeddings = embedding_model.encode(
+        [translated[row] for row in encoded_rows], batch_size=ENCODE_BATCH_SIZE
+    )
+    timings["encode"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    offset = 0
+    for business_type_id, rows in rows_by_type.items():
+        labels = predict_labels(
+            np, models_by_type[business_type_id], embeddings[offset : offset + len(rows)]
+        )
+        offset += len(rows)
+        for row, (main_label, second_label, third_label) in zip(rows, labels):
+            results[row].update(
+                main_label=main_label, second_label=second_label, third_label=third_label
+            )
+    timings["predict"] = _elapsed_ms(started)
+    return results
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
 
@@ -6,7 +7,9 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     DateTime,
+    Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     Text,
     UniqueConstraint,
@@ -16,10 +19,21 @@ from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlmodel import Field, SQLModel
 
 
+class ClassificationStatus(str, Enum):
+    pending = "pending"
+    classified = "classified"
+
+
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
     __table_args__ = (
         CheckConstraint("rating >= 1 AND rating <= 5", name="check_rating_range"),
+        # The classification worker's queue, oldest first
+        Index(
+            "ix_reviews_classification_pending",
+            "created_at",
+            postgresql_where=text("classification_status = 'pending'"),
+        ),
     )
 
     id: UUID = Field(
@@ -63,6 +77,18 @@ class Review(SQLModel, table=True):
         default=None,
         sa_column=Column(DateTime(timezone=True), nullable=True),
     )
+    classification_status: ClassificationStatus = Field(
+        default=ClassificationStatus.pending,
+        sa_column=Column(
+            SAEnum(
+                ClassificationStatus,
+                name="review_classification_statuses",
+                create_type=False,
+            ),
+            nullable=False,
+            server_default=ClassificationStatus.pending.value,
+        ),
+    )
     detected_language: Optional[str] = Field(
         default=None, sa_column=Column(Text, nullable=True)
     )
@@ -0,0 +1,159 @@
+"""Review aggregates stored on listings.
+
+``listings.review_count``, ``rating_sum``, ``rating_histogram`` (counts of 1..5
+stars) and ``avg_rating`` are adjusted in the same transaction as every review
+write, so listing serialization and rating sorts never aggregate ``reviews``.
+``reconcile_listing_ratings`` rebuilds them from the reviews table; run it as
+a backfill or drift check::
+
+    python -m app.modules.reviews.ratings [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from uuid import UUID
+
+from sqlalchemy import Integer, Numeric, cast, func, literal, or_, update
+from sqlalchemy.dialects.postgresql import array
+from sqlmodel import Session, select
+
+from app.infrastructure.database import get_engine
+from app.modules.listings.models import Listing
+
+from .models import Review
+
+logger = logging.getLogger(__name__)
+
+RATING_VALUES = range(1, 6)
+
+
+def average_rating(rating_sum, review_count):
+    return func.round(cast(rating_sum, Numeric) / func.nullif(review_count, 0), 2)
+
+
+def apply_rating_deltas(db: Session, listing_id: UUID, deltas: dict[int, int]) -> None:
+    """
+    Adjust one listing's aggregates by ``{rating: +/-count}`` in a single
+    UPDATE. Does not commit; callers commit with the review write.
+    """
+    deltas = {rating: delta for rating, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    count_delta = sum(deltas.values())
+    sum_delta = sum(rating * delta for rating, delta in deltas.items())
+    values = {
+        Listing.review_count: Listing.review_count + count_delta,
+        Listing.rating_sum: Listing.rating_sum + sum_delta,
+        Listing.avg_rating: average_rating(
+            Listing.rating_sum + sum_delta, Listing.review_count + count_delta
+        ),
+    }
+    for rating, delta in deltas.items():
+        values[Listing.rating_histogram[rating]] = Listing.rating_histogram[rating] + delta
+
+    db.exec(update(Listing).where(Listing.id == listing_id).values(values))
+
+
+def record_review_added(db: Session, review: Review) -> None:
+    apply_rating_deltas(db, review.listing_id, {review.rating: 1})
+
+
+def record_review_removed(db: Session, review: Review) -> None:
+    apply_rating_deltas(db, review.listing_id, {review.rating: -1})
+
+
+def record_rating_changed(
+    db: Session, listing_id: UUID, old_rating: int, new_rating: int
+) -> None:
+    if old_rating != new_rating:
+        apply_rating_deltas(db, listing_id, {old_rating: -1, new_rating: 1})
+
+
+def reconcile_listing_ratings(db: Session, *, repair: bool = True) -> dict:
+    """
+    Recompute every listing's aggregates from ``reviews`` and report listings
+    whose stored values drifted. With ``repair`` the drifted rows are
+    rewritten in one UPDATE and committed.
+    """
+    totals = (
+        select(
+            Review.listing_id.label("listing_id"),
+            func.count().label("review_count"),
+            func.sum(Review.rating).label("rating_sum"),
+            array(
+                [
+                    cast(func.count().filter(Review.rating == rating), Integer)
+                    for rating in RATING_VALUES
+                ]
+            ).label("rating_histogram"),
+        )
+        .group_by(Review.listing_id)
+        .subquery()
+    )
+    review_count = func.coalesce(totals.c.review_count, 0)
+    rating_sum = func.coalesce(totals.c.rating_sum, 0)
+    rating_histogram = func.coalesce(
+        totals.c.rating_histogram,
+        array([literal(0) for _ in RATING_VALUES]),
+    )
+    expected = (
+        select(
+            Listing.id.label("listing_id"),
+            review_count.label("review_count"),
+            rating_sum.label("rating_sum"),
+            rating_histogram.label("rating_histogram"),
+            average_rating(rating_sum, review_count).label("avg_rating"),
+        )
+        .outerjoin(totals, totals.c.listing_id == Listing.id)
+        .where(
+            or_(
+                Listing.review_count != review_count,
+                Listing.rating_sum != rating_sum,
+                Listing.rating_histogram != rating_histogram,
+                Listing.avg_rating.is_distinct_from(
+                    average_rating(rating_sum, review_count)
+                ),
+            )
+        )
+        .subquery()
+    )
+
+    if not repair:
+        drifted = db.exec(select(func.count()).select_from(expected)).one()
+        return {"drifted": int(drifted), "repaired": 0}
+
+    repaired = db.exec(
+        update(Listing)
+        .where(Listing.id == expected.c.listing_id)
+        .values(
+            review_count=expected.c.review_count,
+            rating_sum=expected.c.rating_sum,
+            rating_histogram=expected.c.rating_histogram,
+            avg_rating=expected.c.avg_rating,
+        )
+        .returning(Listing.id)
+    ).all()
+    db.commit()
+    if repaired:
+        logger.warning("Repaired rating aggregates on %d listings", len(repaired))
+    return {"drifted": len(repaired), "repaired": len(repaired)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Backfill or check the review aggregates stored on listings."
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="report drift without repairing it"
+    )
+    args = parser.parse_args()
+
+    with Session(get_engine()) as db:
+        print(reconcile_listing_ratings(db, repair=not args.check))
+
+
+if __name__ == "__main__":
+    main()
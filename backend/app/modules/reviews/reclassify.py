@@ -0,0 +1,303 @@
+"""Bulk reclassification of existing reviews.
+
+Run after ``ml_models/unified_pipeline_models.pkl`` changes. Classified
+reviews of ML business types are streamed in id order (keyset pages),
+grouped by business type and split into chunks. Each chunk is embedded and
+scored with one ``encode``, one ``predict_proba`` and one
+``decision_function`` call in a process pool, whose workers load the models
+once. Labels go back one bulk UPDATE per page. The stored translation is
+reused, so nothing is re-translated over the network. Reviews stored without
+one (keyword fallbacks) are only reclassified when they are in English; the
+English-trained models would misread the rest, so they are counted as skipped.
+
+The next page is read while the pool works on the current one. After each
+page commits, the last review id is checkpointed together with a fingerprint
+of the models, so an interrupted run resumes where it stopped. A run with
+different models starts over.
+
+    python -m app.modules.reviews.reclassify [--workers 4] [--restart]
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from app.infrastructure.database import get_engine
+from app.modules.businesses.models import BusinessType
+from app.modules.listings.models import Listing
+
+from .classification import normalize_labels
+from .classifiers import ml_classifier
+from .classifiers.keyword_classifier import ML_CLASSIFICATION_TYPES
+from .models import ClassificationStatus, Review
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 2000
+CHUNK_SIZE = 256
+DEFAULT_CHECKPOINT = "reclassify_reviews.checkpoint.json"
+
+
+def models_fingerprint(path: str = ml_classifier.MODEL_PATH) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as models_file:
+        for block in iter(lambda: models_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_checkpoint(path: str, fingerprint: str) -> UUID | None:
+    """The last review id done with these models, or ``None`` to start over."""
+    try:
+        with open(path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("models") != fingerprint or not checkpoint.get("last_id"):
+        return None
+    return UUID(checkpoint["last_id"])
+
+
+def save_checkpoint(path: str, fingerprint: str, last_id: UUID, processed: int) -> None:
+    """Written to a temporary file and renamed, so a crash never leaves half of one."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as checkpoint_file:
+        json.dump(
+            {"models": fingerprint, "last_id": str(last_id), "processed": processed},
+            checkpoint_file,
+        )
+    os.replace(temporary, path)
+
+
+def select_review_page(after_id: UUID | None, limit: int):
+    """One keyset page of classified reviews of ML business types."""
+    query = (
+        select(
+            Review.id,
+            func.coalesce(Review.translated_comment, Review.comment, "").label("text"),
+            Review.translated_comment.is_not(None).label("translated"),
+            Review.detected_language,
+            Listing.business_type.label("business_type_id"),
+        )
+        .join(Listing, Listing.id == Review.listing_id)
+        .join(BusinessType, BusinessType.id == Listing.business_type)
+        .where(func.lower(BusinessType.name).in_(sorted(ML_CLASSIFICATION_TYPES)))
+        .where(Review.classification_status == ClassificationStatus.classified)
+        .order_by(Review.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(Review.id > after_id)
+    return query
+
+
+def is_untranslated_foreign(row) -> bool:
+    """A review with no stored translation whose text is not English."""
+    if row.translated:
+        return False
+    language = row.detected_language or ml_classifier.detect_language(row.text)
+    return language != "en"
+
+
+def load_worker_models() -> None:
+    """Pool initializer: each process loads the classifiers and encoder once."""
+    ml_classifier.load_models()
+    ml_classifier.get_embedding_model_with_timeout(ml_classifier.ML_TIMEOUT_SECONDS)
+
+
+def classify_chunk(business_type_id: int, texts: Sequence[str]) -> list[tuple] | None:
+    """Labels for one business type's texts, or ``None`` without a model for it."""
+    models_data = ml_classifier.load_models()
+    encoder = ml_classifier.get_embedding_model_with_timeout(ml_classifier.ML_TIMEOUT_SECONDS)
+    np = ml_classifier.get_numpy()
+    if models_data is None or encoder is None or np is None:
+        return None
+    model_info = models_data.get("models_by_type", {}).get(business_type_id) or {}
+    if model_info.get("clf_main") is None or model_info.get("mlb_main") is None:
+        return None
+    embeddings = encoder.encode(list(texts), batch_size=ml_classifier.ENCODE_BATCH_SIZE)
+    return ml_classifier.predict_labels(np, model_info, embeddings)
+
+
+class InlineExecutor(Executor):
+    """Runs tasks in the calling process (``--workers 0``)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def submit_page(executor: Executor, rows, chunk_size: int) -> list[tuple[list, Future]]:
+    """Group a page by business type and queue it in chunks."""
+    rows_by_type: dict[int, list] = {}
+    for row in rows:
+        business_type_id, _ = ml_classifier.resolve_business_type(str(row.business_type_id))
+        rows_by_type.setdefault(business_type_id, []).append(row)
+    submitted = []
+    for business_type_id, typed_rows in rows_by_type.items():
+        for start in range(0, len(typed_rows), chunk_size):
+            chunk = typed_rows[start : start + chunk_size]
+            submitted.append(
+                (
+                    chunk,
+                    executor.submit(
+                        classify_chunk, business_type_id, [row.text for row in chunk]
+                    ),
+                )
+            )
+    return submitted
+
+
+def reclassify_reviews(
+    db: Session,
+    executor: Executor,
+    *,
+    checkpoint_path: str | None = None,
+    fingerprint: str = "",
+    restart: bool = False,
+    page_size: int = PAGE_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Reclassify every eligible review after the checkpoint; returns run stats."""
+    after_id = None
+    if checkpoint_path and not restart:
+        after_id = load_checkpoint(checkpoint_path, fingerprint)
+    if after_id is not None:
+        logger.info("Resuming after review %s", after_id)
+
+    started = time.perf_counter()
+    stage_seconds = {"fetch": 0.0, "classify": 0.0, "write": 0.0}
+    updated = skipped = 0
+
+    def fetch(after):
+        stage = time.perf_counter()
+        rows = db.exec(select_review_page(after, page_size)).all()
+        stage_seconds["fetch"] += time.perf_counter() - stage
+        return rows
+
+    page = fetch(after_id)
+    while page:
+        rows = [row for row in page if not is_untranslated_foreign(row)]
+        skipped += len(page) - len(rows)
+        submitted = submit_page(executor, rows, chunk_size)
+        next_page = fetch(page[-1].id)
+
+        stage = time.perf_counter()
+        params = []
+        classified_at = datetime.utcnow()
+        for chunk, future in submitted:
+            labels = future.result()
+            if labels is None:
+                skipped += len(chunk)
+                continue
+            for row, (main_label, second_label, third_label) in zip(chunk, labels):
+                normalized = normalize_labels(
+                    {
+                        "main_label": main_label,
+                        "second_label": second_label,
+                        "third_label": third_label,
+                    }
+                )
+                params.append(
+                    {
+                        "id": row.id,
+                        "classification_labels": normalized["classification_labels"],
+                        "classified_at": classified_at,
+                    }
+                )
+        stage_seconds["classify"] += time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        if params:
+            db.exec(update(Review), params=params)
+        db.commit()
+        updated += len(params)
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, fingerprint, page[-1].id, updated + skipped)
+        stage_seconds["write"] += time.perf_counter() - stage
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Reclassified %d reviews (%d skipped), %.1f reviews/sec",
+            updated,
+            skipped,
+            (updated + skipped) / elapsed,
+        )
+        page = next_page
+
+    seconds = time.perf_counter() - started
+    return {
+        "updated": updated,
+        "skipped": skipped,
+        "seconds": round(seconds, 3),
+        "reviews_per_second": round((updated + skipped) / seconds, 1) if updated + skipped else 0.0,
+        "stage_seconds": {stage: round(value, 3) for stage, value in stage_seconds.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Reclassify existing reviews with the current pickled classifiers."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max((os.cpu_count() or 2) - 1, 1),
+        help="classifier processes; 0 runs in this process",
+    )
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore the checkpoint and start over"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not os.path.exists(ml_classifier.MODEL_PATH):
+        raise SystemExit(f"No classifiers at {ml_classifier.MODEL_PATH}")
+    fingerprint = models_fingerprint()
+
+    if args.workers:
+        # Spawned, not forked: workers must not inherit the parent's DB connections
+        executor: Executor = ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=load_worker_models,
+        )
+    else:
+        load_worker_models()
+        executor = InlineExecutor()
+
+    with executor, Session(get_engine()) as db:
+        stats = reclassify_reviews(
+            db,
+            executor,
+            checkpoint_path=args.checkpoint,
+            fingerprint=fingerprint,
+            restart=args.restart,
+            page_size=args.page_size,
+            chunk_size=args.chunk_size,
+        )
+    logger.info("Review reclassification finished: %s", stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from app.shared.dependencies.permissions import (
     require_roles,
 )
 from .schemas import (
+    ClassificationQueueResponse,
     ReviewCreate,
     ReviewResponse,
     ReviewSubmitResponse,
@@ -19,6 +20,7 @@ from .schemas import (
     BusinessReplyResponse,
 )
 from .service import (
+    classification_queue_stats,
     submit_review,
     delete_review,
     list_reviews,
@@ -60,7 +62,11 @@ def get_reviews_for_listing_route(
     status_code=201,
     responses={
         201: {
-            "description": "Review submitted and classified",
+            "description": (
+                "Review submitted. Keyword-classified business types are "
+                "classified immediately; ML-classified ones are saved pending "
+                "and classified by the background worker."
+            ),
             "content": {
                 "application/json": {
                     "example": {
@@ -69,14 +75,15 @@ def get_reviews_for_listing_route(
                         "user_id": "f9826077-3237-406b-9857-847564313890",
                         "rating": 4,
                         "comment": "Great food and atmosphere!",
-                        "detected_language": "en",
-                        "classification_labels": '["food_quality", "service_quality", "ambiance"]',
-                        "main_label": "food_quality",
-                        "second_label": "service_quality",
-                        "third_label": "ambiance",
-                        "classification_method": "ml",
+                        "detected_language": None,
+                        "classification_labels": None,
+                        "main_label": "(none)",
+                        "second_label": "(none)",
+                        "third_label": "(none)",
+                        "classification_method": None,
+                        "classification_status": "pending",
                         "created_at": "2026-05-19T10:30:00Z",
-                        "detail": "Review submitted and classified",
+                        "detail": "Review submitted; classification pending",
                     }
                 }
             },
@@ -84,7 +91,6 @@ def get_reviews_for_listing_route(
         400: {"description": "Listing is not active"},
         401: {"description": "Not authorized"},
         404: {"description": "Listing not found"},
-        500: {"description": "Review could not be classified"},
     },
 )
 def submit_review_route(
@@ -107,6 +113,18 @@ def submit_review_route(
     )
 
 
+@router.get(
+    "/classification/queue",
+    response_model=ClassificationQueueResponse,
+)
+def get_classification_queue_route(
+    current_user: User = Depends(require_roles("admin")),
+    db: Session = Depends(get_db),
+):
+    """Reviews waiting for the classification worker (admin only)."""
+    return classification_queue_stats(db)
+
+
 @router.put(
     "/{review_id}",
     response_model=ReviewSubmitResponse,
@@ -127,6 +145,7 @@ def submit_review_route(
                         "second_label": "service_quality",
                         "third_label": "(none)",
                         "classification_method": "keyword",
+                        "classification_status": "classified",
                         "created_at": "2026-05-21T01:25:06.342237Z",
                         "detail": "Review updated",
                     }
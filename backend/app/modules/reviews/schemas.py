@@ -43,6 +43,7 @@ class ReviewResponse(BaseModel):
     third_label: str | None = None
     classification_labels: str | None = None
     classification_method: str | None = None
+    classification_status: str | None = None
     created_at: datetime
     business_reply: "BusinessReplyResponse | None" = None
 
@@ -97,7 +98,13 @@ class ReviewSubmitResponse(BaseModel):
     second_label: str | None = None
     third_label: str | None = None
     classification_method: str | None = None
+    classification_status: str | None = None
     created_at: datetime
     detail: str | None = None
 
     model_config = {"from_attributes": True}
+
+
+class ClassificationQueueResponse(BaseModel):
+    pending: int
+    oldest_pending_seconds: float
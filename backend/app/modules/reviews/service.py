@@ -1,12 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import aliased
 from sqlmodel import Session, desc, select
 
 from app.modules.listings.models import EmployeeListings, Listing, Statuses
 from app.modules.businesses.models import BusinessType
+from app.modules.recommendations.taste import record_review_rated
 from app.modules.users.models import User, UserTypes
 from app.shared.domain import (
     ensure_listing_service_manager,
@@ -15,11 +17,13 @@ from app.shared.domain import (
     get_listing_for_business_or_404,
 )
 
-from .classification import classify_review_text
+from .classification import keyword_result
+from .classifiers.keyword_classifier import get_classification_approach
 from .profanity import censor_text
 from app.shared.sanitization import sanitize_html
 
-from .models import Review, BusinessReply
+from .models import BusinessReply, ClassificationStatus, Review
+from .ratings import record_rating_changed, record_review_added, record_review_removed
 from .schemas import ReviewCreate, ReviewUpdate
 
 import json
@@ -103,7 +107,9 @@ def list_reviews(
             review.classification_labels or '["(none)", "(none)", "(none)"]'
         )
         classification_method = "keyword"
-        if review.translated_comment:
+        if review.classification_status == ClassificationStatus.pending:
+            classification_method = None
+        elif review.translated_comment:
             classification_method = "ml"
 
         reviews.append(
@@ -122,6 +128,7 @@ def list_reviews(
                 "third_label": labels[2] if len(labels) > 2 else "(none)",
                 "classification_labels": review.classification_labels,
                 "classification_method": classification_method,
+                "classification_status": review.classification_status,
                 "created_at": review.created_at,
                 "business_reply": build_business_reply_payload(reply, reply_username),
             }
@@ -195,6 +202,67 @@ def authorize_reply_actor(
     raise HTTPException(status_code=403, detail=detail)
 
 
+def apply_review_classification(review: Review, result: dict) -> None:
+    review.classification_labels = result["classification_labels"]
+    review.detected_language = result["detected_lang"]
+    review.translated_comment = result["translated_text"] or None
+    review.classified_at = datetime.utcnow()
+    review.classification_status = ClassificationStatus.classified
+
+
+def queue_review_classification(
+    review: Review,
+    text: str,
+    business_type_name: str,
+    business_type_uuid: str,
+) -> str | None:
+    """
+    Keyword classification is cheap, so it happens here. ML classification
+    (language detection, translation, the sentence encoder) is left to
+    ``python -m app.modules.reviews.worker``: the review is saved ``pending``
+    with its old labels cleared. Returns the method used, if any.
+    """
+    if get_classification_approach(business_type_name) != "ml":
+        apply_review_classification(
+            review, keyword_result(text, business_type_uuid, "keyword")
+        )
+        return "keyword"
+    review.classification_labels = None
+    review.detected_language = None
+    review.translated_comment = None
+    review.classified_at = None
+    review.classification_status = ClassificationStatus.pending
+    return None
+
+
+def review_classification_payload(review: Review, classification_method: str | None) -> dict:
+    labels = json.loads(
+        review.classification_labels or '["(none)", "(none)", "(none)"]'
+    )
+    return {
+        "detected_language": review.detected_language,
+        "classification_labels": review.classification_labels,
+        "classification_status": review.classification_status,
+        "classification_method": classification_method,
+        "main_label": labels[0] if len(labels) > 0 else "(none)",
+        "second_label": labels[1] if len(labels) > 1 else "(none)",
+        "third_label": labels[2] if len(labels) > 2 else "(none)",
+    }
+
+
+def classification_queue_stats(db: Session) -> dict:
+    """Depth and age of the pending classification queue."""
+    pending, oldest = db.exec(
+        select(func.count(), func.min(Review.created_at)).where(
+            Review.classification_status == ClassificationStatus.pending
+        )
+    ).one()
+    oldest_seconds = 0.0
+    if oldest is not None:
+        oldest_seconds = round((datetime.now(timezone.utc) - oldest).total_seconds(), 1)
+    return {"pending": pending, "oldest_pending_seconds": oldest_seconds}
+
+
 def submit_review(db: Session, user_id: UUID, review_request: ReviewCreate) -> dict:
     listing = db.exec(
         select(Listing).where(Listing.id == review_request.listing_id)
@@ -223,62 +291,57 @@ def submit_review(db: Session, user_id: UUID, review_request: ReviewCreate) -> d
             status_code=400, detail="Comment exceeds maximum length of 5000 characters"
         )
 
-    classification_result = classify_review_text(
-        text, business_type_name, business_type_uuid
-    )
-
-    main_label = classification_result["main_label"]
-    second_label = classification_result["second_label"]
-    third_label = classification_result["third_label"]
-    classification_labels = classification_result["classification_labels"]
-    detected_lang = classification_result["detected_lang"]
-    translated_text = classification_result["translated_text"]
-    classification_method = classification_result["classification_method"]
-
     review = Review(
         listing_id=review_request.listing_id,
         user_id=user_id,
         rating=review_request.rating,
         comment=original_comment,
-        classification_labels=classification_labels,
-        classified_at=datetime.utcnow(),
-        detected_language=detected_lang,
-        translated_comment=translated_text if translated_text else None,
         censored_comment=censored_comment,
     )
+    classification_method = queue_review_classification(
+        review, text, business_type_name, business_type_uuid
+    )
 
     db.add(review)
+    record_review_added(db, review)
+    record_review_rated(db, review, None, review.rating)
     db.commit()
     db.refresh(review)
 
-    return {
-        "id": review.id,
-        "listing_id": review.listing_id,
-        "user_id": review.user_id,
-        "rating": review.rating,
-        "comment": review.comment,
-        "detected_language": detected_lang,
-        "translated_comment": review.translated_comment,
-        "censored_comment": review.censored_comment,
-        "classification_labels": classification_labels,
-        "main_label": main_label,
-        "second_label": second_label,
-        "third_label": third_label,
-        "classification_method": classification_method,
-        "created_at": review.created_at,
-        "detail": "Review submitted and classified",
-    }
+    response = review_classification_payload(review, classification_method)
+    response.update(
+        {
+            "id": review.id,
+            "listing_id": review.listing_id,
+            "user_id": review.user_id,
+            "rating": review.rating,
+            "comment": review.comment,
+            "translated_comment": review.translated_comment,
+            "censored_comment": review.censored_comment,
+            "created_at": review.created_at,
+            "detail": (
+                "Review submitted; classification pending"
+                if review.classification_status == ClassificationStatus.pending
+                else "Review submitted and classified"
+            ),
+        }
+    )
+    return response
 
 
 def update_review(db: Session, review: Review, review_request: ReviewUpdate) -> dict:
     if review_request.rating is not None:
+        record_rating_changed(db, review.listing_id, review.rating, review_request.rating)
+        record_review_rated(db, review, review.rating, review_request.rating)
         review.rating = review_request.rating
+    text = None
     if review_request.comment is not None:
-        review.comment = sanitize_html(review_request.comment)
-        review.censored_comment = censor_text(review_request.comment)
+        text = sanitize_html(review_request.comment) or ""
+        review.comment = text
+        review.censored_comment = censor_text(text) if text else None
 
     classification_method = None
-    if review_request.comment is not None:
+    if text is not None:
         listing = db.exec(
             select(Listing).where(Listing.id == review.listing_id)
         ).first()
@@ -289,48 +352,32 @@ def update_review(db: Session, review: Review, review_request: ReviewUpdate) ->
             ).first()
 
             if business_type:
-                classification_result = classify_review_text(
-                    review_request.comment,
+                classification_method = queue_review_classification(
+                    review,
+                    text,
                     business_type.name,
                     str(listing.business_type),
                 )
-                review.classification_labels = classification_result[
-                    "classification_labels"
-                ]
-                review.detected_language = classification_result["detected_lang"]
-                review.translated_comment = classification_result["translated_text"]
-                review.classified_at = datetime.utcnow()
-                classification_method = classification_result["classification_method"]
 
     review.updated_at = datetime.utcnow()
     db.add(review)
     db.commit()
     db.refresh(review)
 
-    response = {
-        "id": review.id,
-        "listing_id": review.listing_id,
-        "user_id": review.user_id,
-        "rating": review.rating,
-        "comment": review.comment,
-        "detected_language": review.detected_language,
-        "translated_comment": review.translated_comment,
-        "censored_comment": review.censored_comment,
-        "classification_labels": review.classification_labels,
-        "created_at": review.created_at,
-        "detail": "Review updated",
-    }
-
-    if classification_method:
-        response["classification_method"] = classification_method
-
-    labels = json.loads(
-        review.classification_labels or '["(none)", "(none)", "(none)"]'
+    response = review_classification_payload(review, classification_method)
+    response.update(
+        {
+            "id": review.id,
+            "listing_id": review.listing_id,
+            "user_id": review.user_id,
+            "rating": review.rating,
+            "comment": review.comment,
+            "translated_comment": review.translated_comment,
+            "censored_comment": review.censored_comment,
+            "created_at": review.created_at,
+            "detail": "Review updated",
+        }
     )
-    response["main_label"] = labels[0] if len(labels) > 0 else "(none)"
-    response["second_label"] = labels[1] if len(labels) > 1 else "(none)"
-    response["third_label"] = labels[2] if len(labels) > 2 else "(none)"
-
     return response
 
 
@@ -471,5 +518,7 @@ def delete_business_reply(
 
 
 def delete_review(db: Session, review: Review) -> None:
+    record_review_removed(db, review)
+    record_review_rated(db, review, review.rating, None)
     db.delete(review)
     db.commit()
@@ -0,0 +1,145 @@
+"""Background review classification.
+
+Reviews of ML-classified business types are saved ``pending`` (see
+``queue_review_classification``). This worker claims the oldest pending
+reviews in batches with ``FOR UPDATE SKIP LOCKED``, so several workers can
+share the queue, classifies each batch with one encoder call, writes the
+labels back with one bulk UPDATE and commits. Every pass logs the queue depth
+and the milliseconds spent in each stage.
+
+    python -m app.modules.reviews.worker [--interval SECONDS] [--batch-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import logging
+import time
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.infrastructure.database import get_engine
+from app.modules.businesses.models import BusinessType
+from app.modules.listings.models import Listing
+
+from .classification import classify_review_texts
+from .models import ClassificationStatus, Review
+from .service import classification_queue_stats
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 64
+
+
+def select_pending_reviews(limit: int):
+    """The oldest unclaimed pending reviews, locked until the batch commits."""
+    return (
+        select(
+            Review.id,
+            Review.comment,
+            Listing.business_type.label("business_type_id"),
+            BusinessType.name.label("business_type_name"),
+        )
+        .join(Listing, Listing.id == Review.listing_id)
+        .outerjoin(BusinessType, BusinessType.id == Listing.business_type)
+        .where(Review.classification_status == ClassificationStatus.pending)
+        .order_by(Review.created_at)
+        .limit(limit)
+        .with_for_update(of=Review, skip_locked=True)
+    )
+
+
+def _add_ms(stage_ms: dict[str, float], stage: str, ms: float) -> None:
+    stage_ms[stage] = round(stage_ms.get(stage, 0.0) + ms, 2)
+
+
+def classify_pending_reviews(
+    db: Session,
+    *,
+    batch_size: int = CLAIM_BATCH_SIZE,
+    max_batches: int | None = None,
+) -> dict:
+    """Drain the pending queue (or ``max_batches`` of it); returns pass stats."""
+    started = time.perf_counter()
+    stage_ms: dict[str, float] = {}
+    classified = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        stage = time.perf_counter()
+        rows = db.exec(select_pending_reviews(batch_size)).all()
+        _add_ms(stage_ms, "claim", (time.perf_counter() - stage) * 1000)
+        if not rows:
+            db.rollback()
+            break
+
+        timings: dict[str, float] = {}
+        results = classify_review_texts(
+            [
+                (row.comment or "", row.business_type_name, str(row.business_type_id))
+                for row in rows
+            ],
+            timings,
+        )
+        for name, ms in timings.items():
+            _add_ms(stage_ms, name, ms)
+
+        stage = time.perf_counter()
+        classified_at = datetime.utcnow()
+        db.exec(
+            update(Review),
+            params=[
+                {
+                    "id": row.id,
+                    "classification_labels": result["classification_labels"],
+                    "detected_language": result["detected_lang"],
+                    "translated_comment": result["translated_text"] or None,
+                    "classified_at": classified_at,
+                    "classification_status": ClassificationStatus.classified,
+                }
+                for row, result in zip(rows, results)
+            ],
+        )
+        db.commit()
+        _add_ms(stage_ms, "write", (time.perf_counter() - stage) * 1000)
+        classified += len(rows)
+        batches += 1
+
+    seconds = time.perf_counter() - started
+    return {
+        "classified": classified,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "reviews_per_second": round(classified / seconds, 1) if classified else 0.0,
+        "stage_ms": stage_ms,
+        **classification_queue_stats(db),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Classify reviews waiting in the pending classification queue."
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="keep running, starting a new pass every INTERVAL seconds",
+    )
+    parser.add_argument("--batch-size", type=int, default=CLAIM_BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # Models load once per process, on the first batch that needs them
+    while True:
+        with Session(get_engine()) as db:
+            stats = classify_pending_reviews(db, batch_size=args.batch_size)
+        logger.info("Review classification pass: %s", stats)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Process-local cache of compact service descriptors.
+
+Availability, bookings and pricing all need the same few facts about a service
+(capacity, listing, business type, prices, which weekdays have slots) and used
+to walk Service -> Listing -> BusinessType for them on every call. Descriptors
+are loaded for many services in one joined query and kept per process.
+
+Entries expire after ``SERVICE_CACHE_TTL_SECONDS`` so other workers' writes are
+picked up; see ``VersionedTTLCache`` for how racing loads are handled. Write
+paths for services, slots and listings invalidate explicitly; business types
+have no write path in the API, so an admin editing them directly should call
+``invalidate_service_descriptors()``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.modules.availability.models import ServiceSlots
+from app.modules.businesses.models import BusinessType
+from app.modules.listings.models import Listing
+from app.modules.services.models import Service, StatusTypes
+from app.shared.cache import VersionedTTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceDescriptor:
+    service_id: UUID
+    listing_id: UUID | None
+    status: StatusTypes
+    capacity: int | None
+    price: float | None
+    listing_base_price: float | None
+    business_type_id: UUID | None
+    business_type_name: str | None
+    slot_days: frozenset[int]
+
+    @property
+    def is_hotel(self) -> bool:
+        return self.business_type_name == "hotel"
+
+    @property
+    def is_restaurant(self) -> bool:
+        return self.business_type_name == "restaurant"
+
+    def requires_slot(self, day_of_week: int) -> bool:
+        """Bookings on this weekday must pick one of the service's slots."""
+        return not self.is_hotel and day_of_week in self.slot_days
+
+
+def load_service_descriptors(
+    db: Session, service_ids: Iterable[UUID]
+) -> dict[UUID, ServiceDescriptor]:
+    """Build descriptors straight from the database (two statements)."""
+    service_ids = list(dict.fromkeys(service_ids))
+    if not service_ids:
+        return {}
+
+    rows = db.exec(
+        select(
+            Service.service_id,
+            Service.listing_id,
+            Service.status,
+            Service.capacity,
+            Service.price,
+            Listing.base_price,
+            Listing.business_type,
+            BusinessType.name,
+        )
+        .outerjoin(Listing, Service.listing_id == Listing.id)
+        .outerjoin(BusinessType, Listing.business_type == BusinessType.id)
+        .where(col(Service.service_id).in_(service_ids))
+    ).all()
+
+    slot_days: dict[UUID, set[int]] = {}
+    for service_id, day_of_week in db.exec(
+        select(ServiceSlots.service_id, ServiceSlots.day_of_week)
+        .where(col(ServiceSlots.service_id).in_(service_ids))
+        .distinct()
+    ).all():
+        slot_days.setdefault(service_id, set()).add(day_of_week)
+
+    return {
+        service_id: ServiceDescriptor(
+            service_id=service_id,
+            listing_id=listing_id,
+            status=status,
+            capacity=capacity,
+            price=price,
+            listing_base_price=listing_base_price,
+            business_type_id=business_type_id,
+            business_type_name=business_type_name.lower() if business_type_name else None,
+            slot_days=frozenset(slot_days.get(service_id, ())),
+        )
+        for (
+            service_id,
+            listing_id,
+            status,
+            capacity,
+            price,
+            listing_base_price,
+            business_type_id,
+            business_type_name,
+        ) in rows
+    }
+
+
+service_descriptor_cache: VersionedTTLCache[UUID, ServiceDescriptor] = VersionedTTLCache(
+    settings.SERVICE_CACHE_TTL_SECONDS
+)
+
+
+def get_service_descriptors(
+    db: Session, service_ids: Iterable[UUID]
+) -> dict[UUID, ServiceDescriptor]:
+    return service_descriptor_cache.get_many(
+        service_ids, lambda missing: load_service_descriptors(db, missing)
+    )
+
+
+def get_service_descriptor(db: Session, service_id: UUID) -> ServiceDescriptor | None:
+    return get_service_descriptors(db, [service_id]).get(service_id)
+
+
+def invalidate_service_descriptors(*service_ids: UUID) -> None:
+    """Drop the given services, or every cached descriptor when called bare."""
+    service_descriptor_cache.invalidate(service_ids or None)
+
+
+def invalidate_listing_service_descriptors(listing_id: UUID) -> None:
+    service_descriptor_cache.invalidate_where(
+        lambda _, descriptor: descriptor.listing_id == listing_id
+    )
@@ -4,6 +4,7 @@ from sqlmodel import Session
 
 from fastapi import HTTPException
 
+from app.modules.services.cache import invalidate_service_descriptors
 from app.modules.services.models import Service, StatusTypes
 from app.modules.services.schemas import ServiceCreate, ServiceUpdate
 from app.shared.domain import get_listing_or_404, get_service_or_404
@@ -68,6 +69,7 @@ def create_service(db: Session, data: ServiceCreate, user_id: UUID) -> Service:
     db.add(service)
     db.commit()
     db.refresh(service)
+    invalidate_service_descriptors(service.service_id)
     return service
 
 
@@ -82,6 +84,7 @@ def update_service(db: Session, service_id: UUID, data: ServiceUpdate) -> Servic
     service.updated_at = func.now()
     db.commit()
     db.refresh(service)
+    invalidate_service_descriptors(service.service_id)
     return service
 
 
@@ -93,6 +96,7 @@ def delete_service(db: Session, service_id: UUID) -> Service:
 
     db.commit()
     db.refresh(service)
+    invalidate_service_descriptors(service.service_id)
     return service
 
 
@@ -104,4 +108,5 @@ def deactivate_service(db: Session, service_id: UUID) -> Service:
 
     db.commit()
     db.refresh(service)
+    invalidate_service_descriptors(service.service_id)
     return service
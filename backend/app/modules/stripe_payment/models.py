@@ -17,6 +17,7 @@ class PaymentEvent(SQLModel, table=True):
         - payment_intent.created: Payment intent was created
         - payment_intent.confirmed: Payment was confirmed
         - payment_intent.payment_failed: Payment failed
+        - refund.required: Paid, but the capacity was gone; refund manually
         - refund.initiated: Refund was initiated (T6)
         - refund.completed: Refund was completed
     """
@@ -9,9 +9,9 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.infrastructure.database import get_db
-from app.modules.bookings.models import Booking, BookingStatus, PaymentEvent
+from app.modules.bookings.models import Booking, PaymentEvent
 from app.modules.users.models import User
-from app.modules.stripe_payment.service import process_refund
+from app.modules.stripe_payment.service import approve_paid_booking, process_refund
 from app.shared.dependencies.permissions import require_roles
 
 
@@ -53,17 +53,13 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
             booking = db.get(Booking, UUID(booking_id))
             if booking:
-                booking.status = BookingStatus.approved
-                db.add(booking)
-
-                payment_event = PaymentEvent(
-                    booking_id=booking.id,
-                    event_type="payment_intent.succeeded",
-                    stripe_payment_intent_id=event.data.object["id"],
+                approve_paid_booking(
+                    db,
+                    booking,
+                    payment_intent_id=event.data.object["id"],
                     amount_cents=event.data.object["amount"],
+                    event_type="payment_intent.succeeded",
                 )
-                db.add(payment_event)
-                db.commit()
 
     # Handle payment_intent.payment_failed
     elif event.type == "payment_intent.payment_failed":
@@ -1,5 +1,6 @@
 """Service for stripe payment module."""
 
+from datetime import datetime
 from uuid import UUID
 
 import stripe
@@ -7,6 +8,7 @@ from fastapi import HTTPException
 from sqlmodel import Session, select
 
 from app.core.config import settings
+from app.modules.availability.occupancy import booking_contribution
 from app.modules.bookings.models import Booking, BookingStatus, PaymentEvent
 from app.modules.services.models import Service
 
@@ -162,14 +164,72 @@ def process_refund(db: Session, booking: Booking) -> dict:
     return {"success": True, "refund_id": refund.id, "amount_cents": refund.amount}
 
 
+def approve_paid_booking(
+    db: Session,
+    booking: Booking,
+    *,
+    payment_intent_id: str,
+    amount_cents: int,
+    event_type: str,
+) -> bool:
+    """
+    Approve a booking whose payment succeeded, claiming its capacity first.
+
+    Records ``event_type`` and commits. When the capacity is gone the booking
+    is cancelled instead and a ``refund.required`` event is recorded, so the
+    payment shows up under the admin refunds. The booking row is locked and
+    re-read first: the webhook and the confirm endpoint both land here, and
+    only a still-pending booking is settled. Returns whether it is approved.
+    """
+    from app.modules.bookings.service import get_booking_capacity, reserve_booking_capacity
+    from app.modules.recommendations.taste import record_booking_status_changed
+
+    db.refresh(booking, with_for_update=True)
+    if booking.status != BookingStatus.pending:
+        # Settled already (or cancelled meanwhile); nothing new to record
+        approved = booking.status == BookingStatus.approved
+        db.commit()
+        return approved
+
+    previous_occupancy = booking_contribution(booking)
+    previous_status = booking.status
+    booking.status = BookingStatus.approved
+    approved = reserve_booking_capacity(
+        db,
+        booking,
+        get_booking_capacity(db, booking),
+        previous=previous_occupancy,
+    )
+    if not approved:
+        # The ledger is untouched; the row lock is held through the cancellation
+        booking.status = BookingStatus.cancelled
+        booking.cancelled_by_role = "system"
+        booking.cancellation_reason = "Capacity was taken before the payment completed"
+        booking.cancelled_at = datetime.utcnow()
+        event_type = "refund.required"
+    else:
+        record_booking_status_changed(db, booking, previous_status)
+
+    db.add(booking)
+    db.add(
+        PaymentEvent(
+            booking_id=booking.id,
+            event_type=event_type,
+            stripe_payment_intent_id=payment_intent_id,
+            amount_cents=amount_cents,
+        )
+    )
+    db.commit()
+    db.refresh(booking)
+    return approved
+
+
 def confirm_payment(db: Session, booking: "Booking") -> dict:
     """
     Confirm payment was successful via Stripe API and update booking status.
     Used by bookings router to delegate payment confirmation to stripe_payment module.
     """
     import stripe as stripe_lib
-    from app.modules.bookings.models import BookingStatus
-    from app.modules.stripe_payment.models import PaymentEvent
 
     # Check if payment intent was created for this booking
     if not booking.stripe_payment_intent_id:
@@ -190,36 +250,16 @@ def confirm_payment(db: Session, booking: "Booking") -> dict:
     if payment_intent.status != "succeeded":
         return {"success": False, "error": "Payment not yet completed or failed"}
 
-    # Verify slot availability before confirming (dates may have been taken since payment intent created)
-    from app.modules.services.models import Service
-    if booking.service_id and booking.booking_from_time and booking.booking_to_time:
-        service = db.get(Service, booking.service_id)
-        if service and service.capacity:
-            from app.modules.availability.service import is_available as check_availability
-            still_available = check_availability(
-                db,
-                booking.service_id,
-                service.capacity,
-                booking.booking_from_time,
-                booking.booking_to_time,
-                booking.amount_of_people or 1,
-            )
-            if not still_available:
-                return {"success": False, "error": "The selected time slot is no longer available. Please choose a different time."}
-
-    # Update booking status to approved
-    booking.status = BookingStatus.approved
-    db.add(booking)
-
-    # Create PaymentEvent record
-    payment_event = PaymentEvent(
-        booking_id=booking.id,
-        event_type="payment_intent.confirmed",
-        stripe_payment_intent_id=payment_intent.id,
+    # Claim capacity before confirming (dates may have been taken since payment intent created)
+    if not approve_paid_booking(
+        db,
+        booking,
+        payment_intent_id=payment_intent.id,
         amount_cents=payment_intent.amount,
-    )
-    db.add(payment_event)
-    db.commit()
-    db.refresh(booking)
+        event_type="payment_intent.confirmed",
+    ):
+        if booking.status == BookingStatus.cancelled and booking.cancelled_by_role == "system":
+            return {"success": False, "error": "The selected time slot is no longer available. Please choose a different time."}
+        return {"success": False, "error": "Booking is not in pending status"}
 
     return {"success": True, "status": "approved", "message": "Payment successful"}
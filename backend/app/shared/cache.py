@@ -0,0 +1,153 @@
+"""Process-local read-through caches with TTL expiry and versioned invalidation."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class VersionedTTLCache(Generic[K, V]):
+    """
+    Entries expire after ``ttl_seconds`` so writes made by other processes are
+    eventually seen. Every invalidation bumps ``version``; a load that started
+    before an invalidation is returned to its caller but never stored, so a
+    reader racing a writer cannot pin stale data until the TTL runs out.
+
+    ``max_entries`` bounds caches keyed by open-ended values such as filter
+    combinations: expired entries are pruned first, then the oldest ones.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_entries: int | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: dict[K, tuple[float, V]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(
+        self,
+        keys: Iterable[K],
+        load: Callable[[list[K]], dict[K, V]],
+        *,
+        is_fresh: Callable[[K, V], bool] | None = None,
+    ) -> dict[K, V]:
+        """Serve cached values and ``load`` the rest in one call."""
+        now = self.clock()
+        found: dict[K, V] = {}
+        missing: list[K] = []
+        with self._lock:
+            version = self.version
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if (
+                    entry is not None
+                    and entry[0] > now
+                    and (is_fresh is None or is_fresh(key, entry[1]))
+                ):
+                    found[key] = entry[1]
+                else:
+                    missing.append(key)
+
+        if missing:
+            loaded = load(missing)
+            found.update(loaded)
+            expires_at = self.clock() + self.ttl_seconds
+            with self._lock:
+                if version == self.version:
+                    for key, value in loaded.items():
+                        self._entries.pop(key, None)
+                        self._entries[key] = (expires_at, value)
+                    self._evict_over_limit()
+        return found
+
+    def _evict_over_limit(self) -> None:
+        if self.max_entries is None or len(self._entries) <= self.max_entries:
+            return
+        now = self.clock()
+        for key, (expires_at, _) in list(self._entries.items()):
+            if expires_at <= now:
+                del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, keys: Iterable[K] | None = None) -> None:
+        """Drop ``keys``, or everything when ``keys`` is None."""
+        with self._lock:
+            self.version += 1
+            if keys is None:
+                self._entries.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> None:
+        with self._lock:
+            self.version += 1
+            for key, (_, value) in list(self._entries.items()):
+                if predicate(key, value):
+                    del self._entries[key]
+
+
+class RefreshingValue(Generic[V]):
+    """
+    A single process-local value, such as an in-memory index, rebuilt by
+    ``load`` when it is missing or ``ttl_seconds`` old. One thread rebuilds
+    while the others wait for its result instead of building their own.
+    Invalidation is versioned as in ``VersionedTTLCache``: a build that started
+    before ``invalidate`` or ``set`` is returned to its caller but not kept.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version = 0
+        self._entry: tuple[float, V] | None = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def current(self) -> V | None:
+        """The value as it stands, without building; ``None`` before the first build."""
+        entry = self._entry
+        return entry[1] if entry is not None else None
+
+    def _fresh(self) -> V | None:
+        entry = self._entry
+        return entry[1] if entry is not None and entry[0] > self.clock() else None
+
+    def get(self, load: Callable[[], V]) -> V:
+        value = self._fresh()
+        if value is not None:
+            return value
+        with self._build_lock:
+            value = self._fresh()
+            if value is not None:
+                return value
+            version = self.version
+            value = load()
+            with self._lock:
+                if version == self.version:
+                    self._entry = (self.clock() + self.ttl_seconds, value)
+        return value
+
+    def set(self, value: V | None) -> None:
+        """Install a prebuilt value; ``None`` forces a rebuild on the next ``get``."""
+        with self._lock:
+            self.version += 1
+            self._entry = None if value is None else (self.clock() + self.ttl_seconds, value)
+
+    def invalidate(self) -> None:
+        self.set(None)
@@ -0,0 +1,120 @@
+"""Opaque keyset cursors.
+
+A cursor records the sort key and id of the last row on a page, plus the
+ordering it was issued for. The next page starts strictly after that row, so
+deep pages cost the same as the first one and rows inserted meanwhile do not
+shift the results. Tokens are urlsafe base64 JSON: opaque to clients, not
+secret.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+import json
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_, tuple_
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def set_next_cursor_header(response: Response, page: Page) -> None:
+    """List endpoints keep returning bare arrays; the next cursor travels in a header."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(ordering: str, sort_value: Any, row_id: Any) -> str:
+    payload = {"o": ordering, "k": _encode_value(sort_value), "id": str(row_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _load_cursor(token: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def cursor_ordering(token: str) -> str | None:
+    """The ordering a cursor was issued for, for endpoints with several modes."""
+    return _load_cursor(token).get("o")
+
+
+def decode_cursor(token: str, ordering: str) -> tuple[Any, str]:
+    """Return ``(sort_value, row_id)``; 400 for malformed or foreign cursors."""
+    payload = _load_cursor(token)
+    try:
+        if payload["o"] != ordering:
+            raise ValueError("cursor was issued for another ordering")
+        return _decode_value(payload["k"]), str(UUID(payload["id"]))
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(sort_expr, id_column, sort_value: Any, row_id: Any, *, descending: bool):
+    """
+    Rows after ``(sort_value, row_id)`` under ``ORDER BY sort_expr, id_column``
+    with both keys in the same direction and Postgres' default NULL placement
+    (last when ascending, first when descending).
+    """
+    if descending:
+        if sort_value is None:
+            return or_(sort_expr.is_not(None), id_column < row_id)
+        return tuple_(sort_expr, id_column) < tuple_(sort_value, row_id)
+    if sort_value is None:
+        return and_(sort_expr.is_(None), id_column > row_id)
+    return or_(
+        tuple_(sort_expr, id_column) > tuple_(sort_value, row_id),
+        sort_expr.is_(None),
+    )
+
+
+def keyset_order(sort_expr, id_column, *, descending: bool) -> tuple:
+    if descending:
+        return sort_expr.desc(), id_column.desc()
+    return sort_expr.asc(), id_column.asc()
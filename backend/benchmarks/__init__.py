@@ -0,0 +1,8 @@
+"""Ad-hoc performance benchmarks.
+
+Run from the ``backend`` directory against a seeded database, for example::
+
+    python -m benchmarks.bulk_availability
+
+``DATABASE_URL`` is read from the usual ``.env`` files.
+"""
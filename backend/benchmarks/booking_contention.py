@@ -0,0 +1,200 @@
+"""Concurrent payment confirmations for one window - oversell check and throughput.
+
+A throwaway service with ``--capacity`` seats gets ``--threads * --attempts``
+pending bookings of ``--people`` on the same window. Each worker thread opens
+its own session and confirms its share through ``confirm_payment``, the path
+the bookings router uses (Stripe is stubbed to report every payment as
+succeeded). At the end the ledger must hold exactly the seats that were
+granted, and never more than ``--capacity``; every refused booking must be
+flagged ``refund.required``. ``naive`` swaps in the old read-then-write
+approval for comparison.
+
+    python -m benchmarks.booking_contention [--threads 16] [--attempts 5]
+        [--capacity 40] [--mode reserve naive]
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import random
+import threading
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import delete, func
+from sqlmodel import select
+import stripe
+
+from app.core.config import settings
+from app.modules.availability.occupancy import get_window_occupancy, sync_booking_occupancy
+from app.modules.availability.service import is_available
+from app.modules.bookings import service as bookings_service
+from app.modules.bookings.models import Booking, BookingStatus, PaymentEvent
+from app.modules.services.models import Service
+from app.modules.stripe_payment.service import confirm_payment
+from app.modules.users.models import User
+
+from .common import open_session, print_table
+
+
+def reserve_naive(db, booking, capacity, *, previous=None) -> bool:
+    """The approval before atomic reservations: check availability, then write."""
+    if capacity is not None and not is_available(
+        db,
+        booking.service_id,
+        capacity,
+        booking.booking_from_time,
+        booking.booking_to_time,
+        booking.amount_of_people or 1,
+    ):
+        return False
+    sync_booking_occupancy(db, previous, booking)
+    return True
+
+
+RESERVERS = {
+    "reserve": bookings_service.reserve_booking_capacity,
+    "naive": reserve_naive,
+}
+
+
+@contextmanager
+def stubbed_stripe():
+    """Every payment intent reports a succeeded payment."""
+    secret_key, retrieve = settings.STRIPE_SECRET_KEY, stripe.PaymentIntent.retrieve
+    settings.STRIPE_SECRET_KEY = secret_key or "sk_benchmark"
+    stripe.PaymentIntent.retrieve = lambda intent_id: SimpleNamespace(
+        id=intent_id, status="succeeded", amount=2200
+    )
+    try:
+        yield
+    finally:
+        settings.STRIPE_SECRET_KEY, stripe.PaymentIntent.retrieve = secret_key, retrieve
+
+
+def seed_bookings(args, window_start: datetime, window_end: datetime):
+    """A user, a service with ``--capacity`` and its pending, paid-for bookings."""
+    with open_session() as db:
+        user = User(
+            id=uuid4(), email=f"contention-{uuid4().hex}@example.com", hashed_password="-"
+        )
+        service = Service(service_id=uuid4(), name="booking_contention", capacity=args.capacity)
+        db.add(user)
+        db.add(service)
+        db.flush()
+        booking_ids = []
+        for _ in range(args.threads * args.attempts):
+            booking = Booking(
+                id=uuid4(),
+                service_id=service.service_id,
+                user_id=user.id,
+                status=BookingStatus.pending,
+                amount_of_people=args.people,
+                bookers_name="Benchmark",
+                booking_from_time=window_start,
+                booking_to_time=window_end,
+                stripe_payment_intent_id=f"pi_{uuid4().hex}",
+            )
+            db.add(booking)
+            booking_ids.append(booking.id)
+        db.commit()
+        return user.id, service.service_id, booking_ids
+
+
+def run_mode(mode: str, args) -> list[object]:
+    # A window far in the future that no real booking uses
+    window_start = datetime(2099, 1, 1) + timedelta(minutes=random.randrange(10**6))
+    window_end = window_start + timedelta(hours=1)
+    user_id, service_id, booking_ids = seed_bookings(args, window_start, window_end)
+    shares = [booking_ids[index :: args.threads] for index in range(args.threads)]
+    granted = 0
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(share) -> None:
+        nonlocal granted, errors
+        with open_session() as db:
+            for booking_id in share:
+                try:
+                    confirmed = confirm_payment(db, db.get(Booking, booking_id))["success"]
+                except Exception:
+                    db.rollback()
+                    confirmed = False
+                    with lock:
+                        errors += 1
+                if confirmed:
+                    with lock:
+                        granted += 1
+
+    reserve = bookings_service.reserve_booking_capacity
+    bookings_service.reserve_booking_capacity = RESERVERS[mode]
+    try:
+        with stubbed_stripe():
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                list(pool.map(worker, shares))
+            elapsed = time.perf_counter() - started
+    finally:
+        bookings_service.reserve_booking_capacity = reserve
+
+    with open_session() as db:
+        booked = get_window_occupancy(db, service_id, window_start, window_end)
+        flagged = db.exec(
+            select(func.count())
+            .select_from(PaymentEvent)
+            .where(PaymentEvent.event_type == "refund.required")
+            .where(PaymentEvent.booking_id.in_(booking_ids))
+        ).one()
+        # Bookings and their payment events go with the user; the ledger with the service
+        db.exec(delete(User).where(User.id == user_id))
+        db.exec(delete(Service).where(Service.service_id == service_id))
+        db.commit()
+
+    attempts = len(booking_ids)
+    oversold = max(0, booked - args.capacity)
+    consistent = booked == granted * args.people and flagged == attempts - granted - errors
+    return [
+        mode,
+        attempts,
+        granted,
+        booked,
+        oversold,
+        "yes" if consistent else "no",
+        errors,
+        attempts / elapsed,
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--capacity", type=int, default=40)
+    parser.add_argument("--people", type=int, default=1)
+    parser.add_argument(
+        "--mode", nargs="+", choices=sorted(RESERVERS), default=["reserve", "naive"]
+    )
+    args = parser.parse_args()
+
+    rows = [run_mode(mode, args) for mode in args.mode]
+    print_table(
+        [
+            "mode",
+            "attempts",
+            "granted",
+            "ledger",
+            "oversold",
+            "consistent",
+            "errors",
+            "confirms_per_s",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
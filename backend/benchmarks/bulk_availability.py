@@ -0,0 +1,63 @@
+"""Query count and latency of get_bulk_service_availability by batch size.
+
+The bulk plan should issue the same number of statements whether the cart
+asks about 1 or 50 (service, date, people) tuples.
+
+    python -m benchmarks.bulk_availability [--sizes 1 5 20 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+from itertools import cycle, islice
+
+from sqlmodel import select
+
+from app.modules.availability.schemas import BulkServiceAvailabilityRequestItem
+from app.modules.availability.service import get_bulk_service_availability
+from app.modules.services.models import Service, StatusTypes
+
+from .common import count_queries, open_session, print_table, time_call
+
+
+def build_requests(service_ids, size: int) -> list[BulkServiceAvailabilityRequestItem]:
+    today = date.today()
+    return [
+        BulkServiceAvailabilityRequestItem(
+            key=f"item-{idx}",
+            service_id=service_id,
+            date=today + timedelta(days=idx % 30),
+            people=1 + idx % 3,
+        )
+        for idx, service_id in enumerate(islice(cycle(service_ids), size))
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 20, 50])
+    args = parser.parse_args()
+
+    with open_session() as db:
+        service_ids = db.exec(
+            select(Service.service_id)
+            .where(Service.status == StatusTypes.active)
+            .limit(max(args.sizes))
+        ).all()
+        if not service_ids:
+            raise SystemExit("No active services found; seed the database first.")
+
+        rows = []
+        for size in args.sizes:
+            requests = build_requests(service_ids, size)
+            with count_queries() as counter:
+                get_bulk_service_availability(db, requests)
+            timing = time_call(lambda: get_bulk_service_availability(db, requests))
+            rows.append([size, counter.count, timing["median_ms"], timing["max_ms"]])
+
+    print_table(["requests", "queries", "median_ms", "max_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
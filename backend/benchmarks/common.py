@@ -0,0 +1,76 @@
+"""Shared helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import statistics
+import time
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.infrastructure.database import get_engine
+
+
+@dataclass
+class QueryCounter:
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine=None) -> Iterator[QueryCounter]:
+    """Record every statement sent to the database inside the block."""
+    engine = engine or get_engine()
+    counter = QueryCounter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def time_call(fn: Callable[[], object], *, repeat: int = 5, warmup: int = 1) -> dict:
+    """Run ``fn`` repeatedly and summarise wall-clock latency in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+    }
+
+
+def open_session() -> Session:
+    return Session(get_engine())
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    formatted = [
+        [f"{value:.2f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths = [
+        max([len(str(header)), *(len(row[idx]) for row in formatted)])
+        for idx, header in enumerate(headers)
+    ]
+    print("  ".join(str(header).ljust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in formatted:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
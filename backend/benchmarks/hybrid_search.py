@@ -0,0 +1,52 @@
+"""Where hybrid search spends its time.
+
+Runs ``hybrid_search_listings`` for each query and reports the median
+milliseconds of every stage: the text, vector and geo legs (run in parallel,
+so ``total`` tracks the slowest of them, not their sum), query embedding,
+fusion and the card fetch.
+
+    python -m benchmarks.hybrid_search [--q "reef dive,rum tour"] [--lat 13.1 --lng -59.6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+
+from app.modules.listings.hybrid import hybrid_search_listings
+
+from .common import open_session, print_table
+
+STAGES = ("text", "embed", "vector", "geo", "fuse", "fetch", "total")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--q", default="beach villa,reef dive,rum tour,sunset cruise")
+    parser.add_argument("--lat", type=float, default=13.1)
+    parser.add_argument("--lng", type=float, default=-59.6)
+    parser.add_argument("--radius-km", type=float, default=25)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    with open_session() as db:
+        for q in args.q.split(","):
+            samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+            for attempt in range(args.repeat + 1):
+                page = hybrid_search_listings(db, q, args.lat, args.lng, args.radius_km)
+                if attempt:  # the first run warms the model and caches
+                    for stage, ms in page.timings.items():
+                        samples[stage].append(ms)
+            rows.append(
+                [q, len(page.items)]
+                + [
+                    statistics.median(samples[stage]) if samples[stage] else "-"
+                    for stage in STAGES
+                ]
+            )
+    print_table(["query", "items", *(f"{stage}_ms" for stage in STAGES)], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Bytes per row and load latency saved by deferring heavy Listing columns.
+
+Reports the average stored size of ``embedding``, ``details`` and
+``image_urls`` next to the rest of the row, then times ``select(Listing)``
+with the model's default deferrals against the same query with every column
+undeferred (what each ``select(Listing)`` used to fetch).
+
+    python -m benchmarks.listing_deferred_columns [--limit 500] [--repeat 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import undefer, undefer_group
+from sqlmodel import select
+
+from app.modules.listings.models import LISTING_PAYLOAD_GROUP, Listing
+
+from .common import open_session, print_table, time_call
+
+DEFERRED_COLUMNS = ("embedding", "details", "image_urls")
+
+
+def column_sizes(db) -> list[list[object]]:
+    sizes = db.exec(
+        select(
+            func.count(),
+            *[
+                func.coalesce(func.avg(func.pg_column_size(text(name))), 0)
+                for name in DEFERRED_COLUMNS
+            ],
+            func.coalesce(func.avg(func.pg_column_size(text("listings.*"))), 0),
+        ).select_from(Listing)
+    ).one()
+    count, *deferred_sizes, row_size = sizes
+    rows = [[name, float(size)] for name, size in zip(DEFERRED_COLUMNS, deferred_sizes)]
+    deferred_total = sum(float(size) for size in deferred_sizes)
+    rows.append(["deferred total", deferred_total])
+    rows.append(["whole row", float(row_size)])
+    rows.append(["saved share", 100 * deferred_total / float(row_size) if row_size else 0.0])
+    print(f"{count} listings\n")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with open_session() as db:
+        print_table(["column", "avg_bytes"], column_sizes(db))
+        print()
+
+        full = select(Listing).options(
+            undefer(Listing.embedding), undefer_group(LISTING_PAYLOAD_GROUP)
+        )
+        timings = []
+        for mode, query in [("all columns", full), ("deferred", select(Listing))]:
+            query = query.order_by(Listing.id).limit(args.limit)
+
+            def run():
+                db.expunge_all()
+                return db.exec(query).all()
+
+            timing = time_call(run, repeat=args.repeat)
+            timings.append(
+                [mode, args.limit, timing["min_ms"], timing["median_ms"], timing["max_ms"]]
+            )
+
+    print_table(["select(Listing)", "limit", "min_ms", "median_ms", "max_ms"], timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Listing embedding throughput on CPU.
+
+Encodes the embedding text of up to ``--limit`` live listings with the bundled
+all-MiniLM-L6-v2 model at several batch sizes and reports listings/sec. Nothing
+is written back; run ``python -m app.modules.recommendations.worker`` for that.
+``--synthetic N`` benchmarks made-up listings without a database.
+
+    python -m benchmarks.listing_embeddings [--limit 2000] [--batch-sizes 16,64,128,256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.modules.recommendations.service import (
+    encode_texts,
+    listing_embedding_text,
+    load_embedding_model,
+)
+from app.modules.recommendations.worker import select_embedding_sources
+
+from .common import open_session, print_table
+
+WORDS = "beach reef sunset villa harbour tour rum garden spa surf lodge market".split()
+
+
+def listing_texts(limit: int) -> list[str]:
+    with open_session() as db:
+        rows = db.exec(select_embedding_sources(None, limit)).all()
+    return [
+        listing_embedding_text(
+            row.title, row.description, row.business_type_name, row.interest_names
+        )
+        for row in rows
+    ]
+
+
+def synthetic_texts(count: int) -> list[str]:
+    rng = random.Random(7)
+    return [
+        listing_embedding_text(
+            " ".join(rng.sample(WORDS, 3)).title(),
+            " ".join(rng.choices(WORDS, k=60)),
+            rng.choice(["Hotel", "Restaurant", "Tour"]),
+            rng.sample(WORDS, 2),
+        )
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--batch-sizes", default="16,64,128,256")
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.synthetic) if args.synthetic else listing_texts(args.limit)
+    if not texts:
+        raise SystemExit("No live listings found; seed the database or use --synthetic.")
+
+    model = load_embedding_model()
+    encode_texts(model, texts[:32], 32)  # warm up
+
+    rows = []
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        started = time.perf_counter()
+        encode_texts(model, texts, batch_size)
+        seconds = time.perf_counter() - started
+        rows.append([batch_size, len(texts), seconds, len(texts) / seconds])
+    print_table(["batch_size", "listings", "seconds", "listings_per_sec"], rows)
+
+
+if __name__ == "__main__":
+    main()
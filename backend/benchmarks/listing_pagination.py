@@ -0,0 +1,75 @@
+"""Deep-page latency of list_listings: OFFSET vs keyset cursor.
+
+Walks the listing feed with cursors up to ``--page``, then times fetching that
+same page both ways. The offset plan has to read and discard every earlier
+row; the cursor plan seeks straight past the last row of the previous page.
+
+    python -m benchmarks.listing_pagination [--page 100] [--page-size 20]
+        [--sort-by created_at] [--sort-order desc]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app.modules.listings.service import list_listings
+
+from .common import count_queries, open_session, print_table, time_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--sort-by", default="created_at")
+    parser.add_argument("--sort-order", choices=["asc", "desc"], default="desc")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    options = {
+        "limit": args.page_size,
+        "sort_by": args.sort_by,
+        "sort_order": args.sort_order,
+    }
+
+    with open_session() as db:
+        cursor = None
+        for page in range(1, args.page):
+            result = list_listings(db, cursor=cursor, **options)
+            cursor = result.next_cursor
+            if cursor is None:
+                raise SystemExit(
+                    f"Only {page} pages of {args.page_size}; seed more listings "
+                    "or lower --page."
+                )
+
+        skip = (args.page - 1) * args.page_size
+        by_offset = list_listings(db, skip=skip, **options).items
+        by_cursor = list_listings(db, cursor=cursor, **options).items
+        same_rows = [item["id"] for item in by_offset] == [item["id"] for item in by_cursor]
+
+        rows = []
+        for mode, fetch in [
+            ("offset", lambda: list_listings(db, skip=skip, **options)),
+            ("cursor", lambda: list_listings(db, cursor=cursor, **options)),
+        ]:
+            with count_queries() as counter:
+                fetch()
+            timing = time_call(fetch, repeat=args.repeat)
+            rows.append(
+                [
+                    mode,
+                    args.page,
+                    counter.count,
+                    timing["min_ms"],
+                    timing["median_ms"],
+                    timing["max_ms"],
+                ]
+            )
+
+    print_table(["mode", "page", "queries", "min_ms", "median_ms", "max_ms"], rows)
+    print(f"\nsame rows on page {args.page}: {'yes' if same_rows else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""ORM vs column-projected serialization of a page of listings.
+
+``orm`` is the previous list path: load ``Listing`` objects with their business
+type and business, then ``serialize_listings`` (model_dump + shapely per row).
+``rows`` selects the card columns, coordinates and names in one statement and
+builds dicts from the rows. Both include the interest-id batch query.
+
+    python -m benchmarks.listing_serialization [--page-size 500] [--repeat 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.modules.listings.models import Listing
+from app.modules.listings.service import (
+    select_listing_cards,
+    serialize_listing_rows,
+    serialize_listings,
+)
+
+from .common import count_queries, open_session, print_table, time_call
+
+
+def orm_page(db, page_size: int) -> list[dict]:
+    listings = db.exec(
+        select(Listing)
+        .options(
+            selectinload(Listing.business_type_rel),
+            selectinload(Listing.business_rel),
+        )
+        .order_by(Listing.id)
+        .limit(page_size)
+    ).all()
+    return serialize_listings(db, listings)
+
+
+def rows_page(db, page_size: int) -> list[dict]:
+    rows = db.exec(select_listing_cards().order_by(Listing.id).limit(page_size)).all()
+    return serialize_listing_rows(db, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    with open_session() as db:
+        for mode, fetch in [("orm", orm_page), ("rows", rows_page)]:
+            # Fresh identity map each call so the ORM path pays for hydration
+            def run() -> list[dict]:
+                db.expunge_all()
+                return fetch(db, args.page_size)
+
+            with count_queries() as counter:
+                listings = run()
+            timing = time_call(run, repeat=args.repeat)
+            rows.append(
+                [
+                    mode,
+                    len(listings),
+                    counter.count,
+                    timing["min_ms"],
+                    timing["median_ms"],
+                    timing["max_ms"],
+                ]
+            )
+
+    if rows[0][1] == 0:
+        raise SystemExit("No listings found; seed the database first.")
+    print_table(["mode", "listings", "queries", "min_ms", "median_ms", "max_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
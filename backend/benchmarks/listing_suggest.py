@@ -0,0 +1,84 @@
+"""Typeahead latency from the in-memory prefix index.
+
+Builds the index from the database (or, with ``--synthetic N``, from N made-up
+listings), then times single-keystroke prefixes of growing length. Queries
+never reach Postgres, so the query column should stay at zero.
+
+    python -m benchmarks.listing_suggest [--synthetic 50000] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from uuid import uuid4
+
+from app.modules.listings.suggest import ListingTerms, SuggestIndex, load_suggest_index
+
+from .common import count_queries, open_session, print_table, time_call
+
+WORDS = [
+    "beach", "bay", "harbour", "reef", "sunset", "villa", "cottage", "rum",
+    "shack", "tour", "catamaran", "garden", "hill", "view", "grill", "cafe",
+    "island", "coral", "palm", "breeze", "surf", "lodge", "market", "spa",
+]
+CITIES = ["Bridgetown", "Holetown", "Speightstown", "Oistins", "Bathsheba", "St Lawrence"]
+
+
+def synthetic_index(size: int) -> SuggestIndex:
+    rng = random.Random(7)
+    index = SuggestIndex()
+    index.add_listings(
+        (
+            uuid4(),
+            ListingTerms(
+                title=" ".join(rng.sample(WORDS, 3)).title(),
+                city=rng.choice(CITIES),
+                business_id=None,
+                interest_ids=frozenset(),
+            ),
+        )
+        for _ in range(size)
+    )
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.synthetic:
+        index = synthetic_index(args.synthetic)
+    else:
+        with open_session() as db:
+            index = load_suggest_index(db)
+    build_ms = (time.perf_counter() - started) * 1000
+    if not len(index):
+        raise SystemExit("No active listings found; seed the database or use --synthetic.")
+    print(f"built {len(index)} entries in {build_ms:.1f} ms")
+
+    rows = []
+    for prefix in ["b", "be", "bea", "beach", "beach v", "zzz"]:
+        with count_queries() as counter:
+            results = index.search(prefix, args.limit)
+        timing = time_call(lambda: index.search(prefix, args.limit), repeat=args.repeat)
+        rows.append(
+            [
+                prefix,
+                len(results),
+                counter.count,
+                timing["min_ms"],
+                timing["median_ms"],
+                timing["max_ms"],
+            ]
+        )
+    print_table(["prefix", "results", "queries", "min_ms", "median_ms", "max_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
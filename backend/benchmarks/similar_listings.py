@@ -0,0 +1,89 @@
+""""More like this" latency.
+
+Without arguments, times ``get_similar_listings`` against the database for a
+sample of embedded listings, on whichever backend it detects (the HNSW index,
+or the in-process NumPy index when that is missing). ``--synthetic N`` times
+the NumPy index alone over N random unit vectors, e.g. the 100k target.
+
+    python -m benchmarks.similar_listings [--sample 20] [--synthetic 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+from uuid import uuid4
+
+import numpy as np
+from sqlmodel import select
+
+from app.modules.listings.models import EMBEDDING_DIMENSIONS, Listing
+from app.modules.recommendations.service import get_similar_listings, vector_search_backend
+from app.modules.recommendations.vector_index import NumpyVectorIndex
+
+from .common import count_queries, open_session, print_table, time_call
+
+
+def synthetic(size: int, repeat: int) -> None:
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((size, EMBEDDING_DIMENSIONS), dtype=np.float32)
+    lats = rng.uniform(12.9, 13.4, size)
+    lngs = rng.uniform(-59.7, -59.4, size)
+    ids = [uuid4() for _ in range(size)]
+    index = NumpyVectorIndex(zip(ids, vectors, lats, lngs))
+
+    rows = []
+    for label, kwargs in [
+        ("numpy", {}),
+        ("numpy + 5 km radius", {"center": (13.1, -59.6), "radius_km": 5}),
+    ]:
+        timing = time_call(
+            lambda: index.nearest(vectors[0], 10, exclude=ids[0], **kwargs), repeat=repeat
+        )
+        rows.append([label, size, timing["min_ms"], timing["median_ms"], timing["max_ms"]])
+    print_table(["mode", "listings", "min_ms", "median_ms", "max_ms"], rows)
+
+
+def from_database(sample: int, repeat: int) -> None:
+    rows = []
+    with open_session() as db:
+        listing_ids = db.exec(
+            select(Listing.id).where(Listing.embedding.is_not(None)).limit(sample)
+        ).all()
+        if not listing_ids:
+            raise SystemExit("No embedded listings; run app.modules.recommendations.worker first.")
+        backend = vector_search_backend(db)
+        for radius_km in (None, 10):
+            with count_queries() as counter:
+                get_similar_listings(db, listing_ids[0], 10, radius_km)
+
+            def run() -> None:
+                for listing_id in listing_ids:
+                    get_similar_listings(db, listing_id, 10, radius_km)
+                db.rollback()
+
+            timing = time_call(run, repeat=repeat)
+            rows.append(
+                [
+                    backend if radius_km is None else f"{backend} + {radius_km} km radius",
+                    counter.count,
+                    timing["median_ms"] / len(listing_ids),
+                ]
+            )
+    print_table(["mode", "queries", "median_ms_per_request"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", type=int, default=20)
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        synthetic(args.synthetic, args.repeat)
+    else:
+        from_database(args.sample, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.listings.models import Statuses
+from app.modules.listings.service import LISTING_CARD_KEYS
+
+
+def make_listing_card(listing_id, title: str = "Listing", **values) -> SimpleNamespace:
+    """A ``select_listing_cards()`` row: attribute access plus ``_mapping``."""
+    mapping = {key: None for key in LISTING_CARD_KEYS}
+    mapping.update(
+        id=listing_id,
+        created_at=datetime(2026, 7, 1),
+        title=title,
+        status=Statuses.active,
+        review_count=0,
+        rating_histogram=[0, 0, 0, 0, 0],
+        lat=None,
+        lng=None,
+        business_type_name=None,
+        business_name=None,
+    )
+    mapping.update(values)
+    return SimpleNamespace(_mapping=mapping, **mapping)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = list(rows or [])
+        self.rowcount = len(self.rows)
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def one(self):
+        return self.rows[0]
+
+    def scalar_one(self):
+        return self.rows[0]
+
+    def scalar_one_or_none(self):
+        return self.first()
+
+
+class FakeSession:
+    """
+    Stands in for a ``Session`` without a database. Every statement is
+    recorded; ``exec`` answers with the next queued list of rows, or with
+    whatever ``respond(statement)`` returns when that is not ``None``. Bulk
+    writes (``exec(statement, params=...)``) are recorded in ``bulk`` and
+    consume nothing; ``get`` looks rows up in ``objects`` by (model, key).
+    """
+
+    def __init__(self, *results, respond=None):
+        self.results = list(results)
+        self.respond = respond
+        self.statements = []
+        self.bulk = []
+        self.added = []
+        self.deleted = []
+        self.objects = {}
+        self.commits = 0
+        self.rollbacks = 0
+
+    def exec(self, statement, params=None):
+        self.statements.append(statement)
+        if params is not None:
+            self.bulk.append(params)
+            return FakeResult([])
+        if self.respond is not None:
+            rows = self.respond(statement)
+            if rows is not None:
+                return FakeResult(rows)
+        return FakeResult(self.results.pop(0) if self.results else [])
+
+    def sql(self) -> list[str]:
+        return [compile_sql(statement) for statement in self.statements]
+
+    def get(self, model, key):
+        return self.objects.get((model, key))
+
+    def add(self, row):
+        self.added.append(row)
+
+    def delete(self, row):
+        self.deleted.append(row)
+
+    def flush(self):
+        pass
+
+    def refresh(self, row, with_for_update=None):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def get_bind(self):
+        return None
+
+
+def compile_sql(statement) -> str:
+    if isinstance(statement, str):
+        return statement
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def listing_card():
+    return make_listing_card
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession
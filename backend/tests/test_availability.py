@@ -0,0 +1,575 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+import os
+import threading
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select
+import stripe
+
+from app.core.config import settings
+from app.infrastructure.database import get_db
+from app.main import create_app
+from app.modules.availability import service as availability_service
+from app.modules.availability.engine import BookingLoadIndex
+from app.modules.availability.occupancy import (
+    booking_contribution,
+    get_overlapping_occupancy,
+    reconcile_slot_occupancy,
+)
+from app.modules.availability.schedule import compile_weekly_schedule
+from app.modules.bookings import service as bookings_service
+from app.modules.bookings.models import Booking, BookingStatus
+from app.modules.bookings.schemas import BookingCreate
+from app.modules.services.models import Service
+from app.modules.stripe_payment.service import confirm_payment
+from app.modules.users.models import User
+from app.modules.availability.service import (
+    build_service_day_availability,
+    get_day_remaining_capacity,
+    is_service_open_on,
+    iter_date_chunks,
+)
+
+
+def _override_get_db():
+    yield object()
+
+
+def test_booking_load_index_matches_overlap_predicate():
+    intervals = [
+        (datetime(2026, 7, 1, 9), datetime(2026, 7, 1, 11), 2),
+        (datetime(2026, 7, 1, 10), datetime(2026, 7, 1, 12), 3),
+        (datetime(2026, 7, 1, 14), datetime(2026, 7, 2, 11), 1),
+    ]
+    index = BookingLoadIndex(intervals)
+
+    windows = [
+        (datetime(2026, 7, 1, 8), datetime(2026, 7, 1, 9)),
+        (datetime(2026, 7, 1, 9), datetime(2026, 7, 1, 10)),
+        (datetime(2026, 7, 1, 10, 30), datetime(2026, 7, 1, 10, 45)),
+        (datetime(2026, 7, 1, 11), datetime(2026, 7, 1, 12)),
+        (datetime(2026, 7, 1, 12), datetime(2026, 7, 1, 14)),
+        (datetime(2026, 7, 2, 0), datetime(2026, 7, 2, 23)),
+    ]
+    for start, end in windows:
+        expected = sum(
+            people for from_time, to_time, people in intervals
+            if from_time < end and to_time > start
+        )
+        assert index.booked_between(start, end) == expected
+
+    assert index.remaining(4, datetime(2026, 7, 1, 10), datetime(2026, 7, 1, 11)) == 0
+
+
+def test_weekly_schedule_falls_back_to_listing_hours_then_all_day():
+    service_id = uuid4()
+    hours = SimpleNamespace(open_time=time(8), close_time=time(17))
+    slot = SimpleNamespace(
+        id=7,
+        service_id=service_id,
+        day_of_week=3,
+        start_time=time(9),
+        end_time=time(10),
+        capacity=2,
+    )
+
+    schedule = compile_weekly_schedule(service_id, None, 5, {3: [slot]}, {1: hours})
+
+    assert [(s.id, s.start_time, s.end_time, s.capacity) for s in schedule.slots_for(1)] == [
+        (-1, time(8), time(17), 5)
+    ]
+    all_day = schedule.slots_for(2)[0]
+    assert (all_day.start_time, all_day.end_time) == (time(0), time(23, 59, 59))
+    assert [(s.id, s.is_virtual) for s in schedule.slots_for(3)] == [(7, False)]
+
+
+def test_day_availability_reports_remaining_capacity_per_slot():
+    service = SimpleNamespace(service_id=uuid4(), capacity=10, listing_id=uuid4())
+    day = date(2026, 7, 6)  # Monday -> DB day 1
+    morning = SimpleNamespace(
+        id=1,
+        service_id=service.service_id,
+        day_of_week=1,
+        start_time=time(9),
+        end_time=time(12),
+        capacity=4,
+    )
+    evening = SimpleNamespace(
+        id=2,
+        service_id=service.service_id,
+        day_of_week=1,
+        start_time=time(18),
+        end_time=time(21),
+        capacity=4,
+    )
+    loads = BookingLoadIndex(
+        [(datetime(2026, 7, 6, 9), datetime(2026, 7, 6, 12), 3)]
+    )
+
+    schedule = compile_weekly_schedule(
+        service.service_id, service.listing_id, 10, {1: [morning, evening]}, {}
+    )
+    response = build_service_day_availability(service, False, day, 2, schedule, loads)
+
+    assert response.day_of_week == 1
+    assert [(s.slot_id, s.remaining_capacity, s.is_available) for s in response.slots] == [
+        (1, 1, False),
+        (2, 4, True),
+    ]
+    assert response.is_open is True
+    assert response.closed_reason is None
+
+
+def test_hotel_availability_uses_overnight_window():
+    service = SimpleNamespace(service_id=uuid4(), capacity=2, listing_id=uuid4())
+    loads = BookingLoadIndex(
+        [(datetime(2026, 7, 6, 14), datetime(2026, 7, 8, 11), 2)]
+    )
+
+    assert is_service_open_on(service, True, date(2026, 7, 7), 1, None, loads) is False
+    assert is_service_open_on(service, True, date(2026, 7, 8), 1, None, loads) is True
+
+
+def test_booking_contribution_only_counts_approved_bookings():
+    booking = SimpleNamespace(
+        status="approved",
+        service_id=uuid4(),
+        booking_from_time=datetime(2026, 7, 1, 9),
+        booking_to_time=datetime(2026, 7, 1, 10),
+        amount_of_people=3,
+    )
+    contribution = booking_contribution(booking)
+    assert contribution.people == 3
+    assert contribution.overlaps(
+        booking.service_id, datetime(2026, 7, 1, 9, 30), datetime(2026, 7, 1, 11)
+    )
+    assert not contribution.overlaps(
+        booking.service_id, datetime(2026, 7, 1, 10), datetime(2026, 7, 1, 11)
+    )
+
+    booking.status = "pending"
+    assert booking_contribution(booking) is None
+
+
+def test_day_remaining_capacity_is_best_slot_of_the_day():
+    service = SimpleNamespace(service_id=uuid4(), capacity=3, listing_id=None)
+    schedule = compile_weekly_schedule(service.service_id, None, 3, {}, {})
+    loads = BookingLoadIndex(
+        [(datetime(2026, 7, 6, 0), datetime(2026, 7, 6, 23, 59, 59), 2)]
+    )
+
+    assert get_day_remaining_capacity(service, False, date(2026, 7, 6), schedule, loads) == 1
+    assert get_day_remaining_capacity(service, False, date(2026, 7, 7), schedule, loads) == 3
+
+
+def test_listing_heatmap_rejects_ranges_longer_than_six_months():
+    app = create_app(background_jobs_enabled=False)
+    app.dependency_overrides[get_db] = _override_get_db
+    start = date(2026, 7, 1)
+
+    with TestClient(app) as client:
+        response = client.get(
+            f"/api/availability/listings/{uuid4()}/heatmap",
+            params={
+                "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=200)).isoformat(),
+            },
+        )
+
+    assert response.status_code == 400
+
+
+def test_next_available_scan_chunks_double_and_cover_the_horizon():
+    start = date(2026, 7, 1)
+    chunks = list(iter_date_chunks(start, start + timedelta(days=59)))
+
+    assert [(last - first).days + 1 for first, last in chunks] == [7, 14, 28, 11]
+    assert chunks[0][0] == start
+    assert all(
+        next_first == last + timedelta(days=1)
+        for (_, last), (next_first, _) in zip(chunks, chunks[1:])
+    )
+
+
+def _ledger_rows(*entries):
+    return [(service_id, start, end, people) for service_id, start, end, people in entries]
+
+
+def test_reconcile_confirms_drift_under_the_service_lock_before_repairing(fake_session):
+    service_id = uuid4()
+    window = (service_id, datetime(2026, 7, 1, 9), datetime(2026, 7, 1, 10))
+    # A booking for two commits between the unlocked scan's two reads: the
+    # bookings read misses it, the ledger read already counts it
+    db = fake_session(
+        [],
+        _ledger_rows((*window, 2)),
+        [service_id],
+        _ledger_rows((*window, 2)),
+        _ledger_rows((*window, 2)),
+    )
+
+    result = reconcile_slot_occupancy(db)
+
+    sql = db.sql()
+    assert sql[2].startswith("SELECT services.service_id")
+    assert sql[2].endswith("FOR UPDATE")
+    assert "bookings.service_id IN (" in sql[3]
+    assert not any(statement.startswith(("DELETE", "INSERT")) for statement in sql)
+    assert db.commits == 0
+    assert result == {
+        "windows": 0,
+        "missing": 0,
+        "stale": 0,
+        "mismatched": 0,
+        "drift_people": 0,
+        "repaired": False,
+    }
+
+
+def test_reconcile_repairs_drift_that_holds_under_the_lock(fake_session):
+    service_id = uuid4()
+    window = (service_id, datetime(2026, 7, 1, 9), datetime(2026, 7, 1, 10))
+    stale = (service_id, datetime(2026, 7, 2, 9), datetime(2026, 7, 2, 10))
+    scan = (_ledger_rows((*window, 3)), _ledger_rows((*window, 1), (*stale, 2)))
+    db = fake_session(*scan, [service_id], *scan)
+
+    result = reconcile_slot_occupancy(db)
+
+    sql = db.sql()
+    assert sql[5].startswith("DELETE FROM slot_occupancy")
+    assert sql[6].endswith("FOR SHARE")
+    assert sql[7].startswith("INSERT INTO slot_occupancy")
+    assert db.statements[7].compile().params["booked_people_m0"] == 2
+    assert db.commits == 1
+    assert result["mismatched"] == 1 and result["stale"] == 1
+    assert result["drift_people"] == 4 and result["repaired"]
+
+    report_only = fake_session(*scan, [service_id], *scan)
+    assert not reconcile_slot_occupancy(report_only, repair=False)["repaired"]
+    assert report_only.commits == 0 and report_only.rollbacks == 1
+
+
+SERVICE_ID = uuid4()
+WINDOW = (datetime(2027, 7, 1, 9), datetime(2027, 7, 1, 10))
+LATER_WINDOW = (datetime(2027, 7, 1, 11), datetime(2027, 7, 1, 12))
+
+
+def _ledger_session(fake_session, *, booked=0, returning=()):
+    """Answers overlap sums with ``booked`` and the expiry sweep with ``returning``."""
+
+    def respond(statement):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        if "sum(slot_occupancy.booked_people)" in sql:
+            return [booked]
+        if sql.startswith("UPDATE bookings") and "RETURNING" in sql:
+            return list(returning)
+        return []
+
+    return fake_session(respond=respond)
+
+
+def _ledger_deltas(db) -> dict:
+    """People added to each (service, window) by the upserts ``db`` saw."""
+    deltas = {}
+    for statement in db.statements:
+        compiled = statement.compile(dialect=postgresql.dialect())
+        if not str(compiled).startswith("INSERT INTO slot_occupancy"):
+            continue
+        params = compiled.params
+        suffixes = [
+            name[len("booked_people"):]
+            for name in params
+            if name == "booked_people" or name.startswith("booked_people_m")
+        ]
+        for suffix in suffixes:
+            key = (
+                params[f"service_id{suffix}"],
+                params[f"window_start{suffix}"],
+                params[f"window_end{suffix}"],
+            )
+            deltas[key] = deltas.get(key, 0) + params[f"booked_people{suffix}"]
+    return deltas
+
+
+def _approved_booking(**values):
+    fields = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "service_id": SERVICE_ID,
+        "status": BookingStatus.approved,
+        "amount_of_people": 2,
+        "bookers_name": "Ana",
+        "booking_from_time": WINDOW[0],
+        "booking_to_time": WINDOW[1],
+    }
+    fields.update(values)
+    return Booking(**fields)
+
+
+def test_creating_an_approved_booking_adds_its_people_to_the_ledger(monkeypatch, fake_session):
+    service = SimpleNamespace(service_id=SERVICE_ID, listing_id=uuid4(), capacity=4)
+    monkeypatch.setattr(
+        bookings_service, "validate_service_for_booking", lambda *args, **kwargs: (service, None)
+    )
+    monkeypatch.setattr(
+        bookings_service, "booking_requires_slot_selection", lambda *args, **kwargs: False
+    )
+    monkeypatch.setattr(availability_service, "get_booked_count", lambda *args: 0)
+    monkeypatch.setattr(bookings_service, "is_restaurant_service", lambda db, service: True)
+    monkeypatch.setattr(bookings_service, "is_hotel_service", lambda db, service: False)
+    monkeypatch.setattr(
+        bookings_service,
+        "calculate_display_price_for_booking",
+        lambda *args, **kwargs: {"base_price": 10, "service_fee_percent": 0.1},
+    )
+    db = _ledger_session(fake_session)
+
+    booking = bookings_service.create_booking_record(
+        db,
+        BookingCreate(
+            service_id=SERVICE_ID,
+            amount_of_people=2,
+            bookers_name="Ana",
+            booking_from_time=WINDOW[0],
+            booking_to_time=WINDOW[1],
+        ),
+        uuid4(),
+        commit=True,
+    )
+
+    assert booking.status == BookingStatus.approved
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): 2}
+    assert db.commits == 1
+
+
+def _update(monkeypatch, db, booking, update_data):
+    monkeypatch.setattr(
+        bookings_service, "booking_requires_slot_selection", lambda *args, **kwargs: False
+    )
+    monkeypatch.setattr(
+        bookings_service, "availability_get_booked_count", lambda *args, **kwargs: 0
+    )
+    db.objects[(Service, SERVICE_ID)] = Service(service_id=SERVICE_ID, capacity=4)
+    return bookings_service.update_booking(db, booking, update_data)
+
+
+def test_moving_a_booking_moves_its_people_between_windows(monkeypatch, fake_session):
+    db = _ledger_session(fake_session)
+
+    _update(
+        monkeypatch,
+        db,
+        _approved_booking(),
+        {"booking_from_time": LATER_WINDOW[0], "booking_to_time": LATER_WINDOW[1]},
+    )
+
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): -2, (SERVICE_ID, *LATER_WINDOW): 2}
+
+
+def test_resizing_a_party_applies_only_the_difference(monkeypatch, fake_session):
+    # The booking's own two people are on the ledger and are excluded from the check
+    db = _ledger_session(fake_session, booked=2)
+
+    _update(monkeypatch, db, _approved_booking(), {"amount_of_people": 3})
+
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): 1}
+    assert db.commits == 1
+
+
+def test_cancelling_an_approved_booking_releases_its_people(fake_session):
+    db = _ledger_session(fake_session)
+
+    bookings_service.cancel_booking(db, _approved_booking(), cancelled_by_role="guest")
+
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): -2}
+
+
+def test_confirming_payment_claims_the_window(monkeypatch, fake_session):
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "sk_test")
+    monkeypatch.setattr(
+        stripe.PaymentIntent,
+        "retrieve",
+        lambda intent_id: SimpleNamespace(id=intent_id, status="succeeded", amount=2200),
+    )
+    monkeypatch.setattr(bookings_service, "get_booking_capacity", lambda db, booking: 4)
+    booking = _approved_booking(status=BookingStatus.pending, stripe_payment_intent_id="pi_1")
+    db = _ledger_session(fake_session)
+
+    assert confirm_payment(db, booking)["success"]
+
+    assert booking.status == BookingStatus.approved
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): 2}
+
+
+def test_payment_for_a_sold_out_window_cancels_and_flags_a_refund(monkeypatch, fake_session):
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "sk_test")
+    monkeypatch.setattr(
+        stripe.PaymentIntent,
+        "retrieve",
+        lambda intent_id: SimpleNamespace(id=intent_id, status="succeeded", amount=2200),
+    )
+    monkeypatch.setattr(bookings_service, "get_booking_capacity", lambda db, booking: 4)
+    booking = _approved_booking(status=BookingStatus.pending, stripe_payment_intent_id="pi_1")
+    db = _ledger_session(fake_session, booked=3)
+
+    assert not confirm_payment(db, booking)["success"]
+
+    assert booking.status == BookingStatus.cancelled
+    assert booking.cancelled_by_role == "system"
+    assert [event.event_type for event in db.added if hasattr(event, "event_type")] == [
+        "refund.required"
+    ]
+    assert _ledger_deltas(db) == {}
+    assert db.commits == 1
+
+
+def test_confirming_payment_only_settles_pending_bookings(monkeypatch, fake_session):
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "sk_test")
+    monkeypatch.setattr(
+        stripe.PaymentIntent,
+        "retrieve",
+        lambda intent_id: SimpleNamespace(id=intent_id, status="succeeded", amount=2200),
+    )
+    monkeypatch.setattr(bookings_service, "get_booking_capacity", lambda db, booking: 4)
+    refused = _approved_booking(
+        status=BookingStatus.cancelled,
+        cancelled_by_role="system",
+        stripe_payment_intent_id="pi_1",
+    )
+    approved = _approved_booking(stripe_payment_intent_id="pi_2")
+    db = _ledger_session(fake_session)
+
+    # A booking refused for capacity is not re-approved, an approved one not re-recorded
+    result = confirm_payment(db, refused)
+    assert not result["success"] and "no longer available" in result["error"]
+    assert refused.status == BookingStatus.cancelled
+    assert confirm_payment(db, approved)["success"]
+
+    assert db.added == []
+    assert _ledger_deltas(db) == {}
+
+
+def _webhook(monkeypatch, db, booking):
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", "whsec_test")
+    monkeypatch.setattr(
+        stripe.Webhook,
+        "construct_event",
+        lambda payload, signature, secret: SimpleNamespace(
+            type="payment_intent.succeeded",
+            data=SimpleNamespace(
+                object={"id": "pi_1", "amount": 2200, "metadata": {"booking_id": str(booking.id)}}
+            ),
+        ),
+    )
+    monkeypatch.setattr(bookings_service, "get_booking_capacity", lambda db, booking: 4)
+    db.objects[(Booking, booking.id)] = booking
+    app = create_app(background_jobs_enabled=False)
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/stripe_payment/payments/webhook", headers={"stripe-signature": "t=1"}
+        )
+    assert response.status_code == 200
+
+
+def test_payment_webhook_claims_capacity_across_overlapping_windows(monkeypatch, fake_session):
+    # A slot booking is checked against every overlapping window of the service
+    booking = _approved_booking(status=BookingStatus.pending, service_slot_id=uuid4())
+    db = _ledger_session(fake_session, booked=2)
+
+    _webhook(monkeypatch, db, booking)
+
+    assert booking.status == BookingStatus.approved
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): 2}
+    sql = db.sql()
+    assert "FOR UPDATE" in next(statement for statement in sql if "FROM services" in statement)
+
+
+def test_payment_webhook_flags_a_refund_when_capacity_is_gone(monkeypatch, fake_session):
+    booking = _approved_booking(status=BookingStatus.pending)
+    db = _ledger_session(fake_session, booked=4)
+
+    _webhook(monkeypatch, db, booking)
+
+    assert booking.status == BookingStatus.cancelled
+    assert [event.event_type for event in db.added if hasattr(event, "event_type")] == [
+        "refund.required"
+    ]
+    assert _ledger_deltas(db) == {}
+
+
+def test_expiry_sweep_releases_what_its_update_returned(fake_session):
+    db = _ledger_session(
+        fake_session,
+        returning=[(SERVICE_ID, *WINDOW, 2), (SERVICE_ID, *LATER_WINDOW, 1)],
+    )
+
+    assert bookings_service.update_expired_bookings(db) == {"completed": 2, "cancelled": 0}
+
+    assert _ledger_deltas(db) == {(SERVICE_ID, *WINDOW): -2, (SERVICE_ID, *LATER_WINDOW): -1}
+    assert db.commits == 1
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="Concurrent reservations need a migrated Postgres in TEST_DATABASE_URL",
+)
+def test_parallel_payments_for_the_last_seats_never_oversell(monkeypatch):
+    capacity, attempts = 3, 8
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "sk_test")
+    monkeypatch.setattr(
+        stripe.PaymentIntent,
+        "retrieve",
+        lambda intent_id: SimpleNamespace(id=intent_id, status="succeeded", amount=2200),
+    )
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    user_id, service_id = uuid4(), uuid4()
+    booking_ids = [uuid4() for _ in range(attempts)]
+    with Session(engine) as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com", hashed_password="-"))
+        db.add(Service(service_id=service_id, name="Contention", capacity=capacity))
+        db.flush()
+        for booking_id in booking_ids:
+            db.add(
+                _approved_booking(
+                    id=booking_id,
+                    user_id=user_id,
+                    service_id=service_id,
+                    status=BookingStatus.pending,
+                    amount_of_people=1,
+                    stripe_payment_intent_id=f"pi_{booking_id.hex}",
+                )
+            )
+        db.commit()
+
+    ready = threading.Barrier(attempts)
+
+    def pay(booking_id):
+        with Session(engine) as db:
+            booking = db.get(Booking, booking_id)
+            ready.wait()
+            return confirm_payment(db, booking)["success"]
+
+    try:
+        with ThreadPoolExecutor(max_workers=attempts) as pool:
+            confirmed = list(pool.map(pay, booking_ids))
+        with Session(engine) as db:
+            booked = get_overlapping_occupancy(db, service_id, *WINDOW)
+            statuses = db.exec(select(Booking.status).where(Booking.service_id == service_id)).all()
+    finally:
+        with Session(engine) as db:
+            # Bookings and payment events go with the user, the ledger with the service
+            db.exec(delete(User).where(User.id == user_id))
+            db.exec(delete(Service).where(Service.service_id == service_id))
+            db.commit()
+
+    assert confirmed.count(True) == capacity
+    assert booked == capacity
+    assert statuses.count(BookingStatus.approved) == capacity
+    assert statuses.count(BookingStatus.cancelled) == attempts - capacity
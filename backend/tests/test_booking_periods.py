@@ -0,0 +1,68 @@
+import os
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.modules.availability.occupancy import get_overlapping_occupancy
+from app.modules.bookings.service import check_booking_conflict
+
+FROM_TIME = datetime(2026, 7, 1, 10)
+TO_TIME = datetime(2026, 7, 1, 12)
+
+
+def _sql(statement) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_booking_conflict_uses_range_overlap(fake_session):
+    db = fake_session()
+
+    assert check_booking_conflict(db, uuid4(), FROM_TIME, TO_TIME) is False
+
+    [statement] = db.statements
+    sql = _sql(statement)
+    assert "bookings.booking_period && tsrange(" in sql
+    assert "'[)'" in sql
+    assert "booking_from_time <" not in sql
+
+
+def test_overlapping_occupancy_uses_range_overlap(fake_session):
+    db = fake_session([0])
+
+    assert get_overlapping_occupancy(db, uuid4(), FROM_TIME, TO_TIME) == 0
+
+    [statement] = db.statements
+    sql = _sql(statement)
+    assert "slot_occupancy.window_period && tsrange(" in sql
+    assert "window_start <" not in sql
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="EXPLAIN checks need a migrated Postgres in TEST_DATABASE_URL",
+)
+@pytest.mark.parametrize(
+    ("query_fn", "index_name"),
+    [
+        (check_booking_conflict, "ix_bookings_service_period_gist"),
+        (get_overlapping_occupancy, "ix_slot_occupancy_service_period_gist"),
+    ],
+)
+def test_overlap_queries_can_use_gist_indexes(query_fn, index_name, fake_session):
+    db = fake_session([0])
+    query_fn(db, uuid4(), FROM_TIME, TO_TIME)
+    [statement] = db.statements
+
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    with engine.begin() as conn:
+        # Small test tables would otherwise be seq-scanned regardless of indexes
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(conn.execute(text(f"EXPLAIN {_sql(statement)}")).scalars())
+    assert index_name in plan
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+
+from app.modules.recommendations.service import (
+    embedding_content_hash,
+    listing_embedding_text,
+)
+from app.modules.recommendations.worker import embed_changed_listings
+
+
+class _FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(texts)
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+
+def _source(title, content_hash=None, interests=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        title=title,
+        description="Sea views",
+        business_type_name="Hotel",
+        interest_names=interests,
+        embedding_content_hash=content_hash,
+    )
+
+
+def test_embedding_text_is_stable_and_ignores_interest_order():
+    text = listing_embedding_text("Coral Inn", "Sea views", "Hotel", ["Surf", "Food", None])
+    assert text == "Coral Inn. Hotel. Interests: Food, Surf. Sea views"
+    assert text == listing_embedding_text("Coral Inn", "Sea views", "Hotel", ["Food", "Surf"])
+    assert listing_embedding_text("Coral Inn", None, None, None) == "Coral Inn"
+
+
+def test_only_listings_whose_text_changed_are_encoded_and_bulk_updated(fake_session):
+    unchanged = _source("Coral Inn")
+    unchanged.embedding_content_hash = embedding_content_hash(
+        listing_embedding_text("Coral Inn", "Sea views", "Hotel", None)
+    )
+    changed = _source("Reef Lodge", content_hash="stale", interests=["Diving"])
+    new = _source("Palm Villa")
+    db = fake_session([unchanged, changed], [new])
+    model = _FakeModel()
+
+    stats = embed_changed_listings(db, model, scan_batch_size=2)
+
+    assert (stats["scanned"], stats["encoded"], stats["skipped"]) == (3, 2, 1)
+    assert model.batches == [
+        ["Reef Lodge. Hotel. Interests: Diving. Sea views"],
+        ["Palm Villa. Hotel. Sea views"],
+    ]
+    assert [[row["id"] for row in params] for params in db.bulk] == [[changed.id], [new.id]]
+    assert db.bulk[0][0]["embedding"] == [1.0, 1.0, 1.0]
+    assert db.bulk[0][0]["embedding_content_hash"] == embedding_content_hash(
+        model.batches[0][0]
+    )
+    assert db.commits == 2
+
+
+def test_unchanged_pass_never_loads_the_model(fake_session):
+    listing = _source("Coral Inn")
+    listing.embedding_content_hash = embedding_content_hash(
+        listing_embedding_text("Coral Inn", "Sea views", "Hotel", None)
+    )
+    db = fake_session([listing])
+
+    stats = embed_changed_listings(db, model=None)
+
+    assert stats["encoded"] == 0 and stats["listings_per_second"] == 0.0
+    assert db.bulk == []
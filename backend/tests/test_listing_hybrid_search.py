@@ -0,0 +1,151 @@
+import threading
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.modules.listings import hybrid
+from app.modules.listings.hybrid import (
+    HYBRID_SEARCH_ORDERING,
+    hybrid_search_listings,
+    reciprocal_rank_fusion,
+    run_search_legs,
+    select_geo_candidates,
+    select_text_candidates,
+)
+from app.shared.pagination import encode_cursor
+
+
+def _id(n):
+    return UUID(int=n)
+
+
+def _card_session(fake_session, listing_card):
+    """Returns a card for every listing id asked for; interests are empty."""
+
+    def respond(statement):
+        if "listing_interests" in _sql(statement):
+            return []
+        params = statement.compile(dialect=postgresql.dialect()).params
+        ids = next((value for value in params.values() if isinstance(value, list)), [])
+        return [
+            listing_card(listing_id, f"Listing {listing_id.int}")
+            for listing_id in ids
+            if isinstance(listing_id, UUID)
+        ]
+
+    return fake_session(respond=respond)
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_reciprocal_rank_fusion_rewards_agreement_between_legs():
+    fused = reciprocal_rank_fusion(
+        {
+            "text": [_id(1), _id(2), _id(3)],
+            "vector": [_id(2), _id(4)],
+            "geo": [_id(3), _id(2)],
+        }
+    )
+
+    assert [listing_id.int for listing_id, _ in fused] == [2, 3, 1, 4]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61 + 1 / 62)
+    # A tie is broken by id, highest first, like the cursor
+    tied = reciprocal_rank_fusion({"text": [_id(5)], "geo": [_id(9)]})
+    assert [listing_id.int for listing_id, _ in tied] == [9, 5]
+
+
+def test_search_legs_run_concurrently_on_their_own_sessions():
+    barrier = threading.Barrier(3, timeout=5)
+    sessions = []
+
+    class _Session:
+        def __enter__(self):
+            sessions.append(self)
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def leg(ranked):
+        def run(db):
+            barrier.wait()  # only passes when all three legs are running at once
+            return [ranked, id(db)]
+
+        return run
+
+    timings = {}
+    rankings = run_search_legs(
+        _Session, {"text": leg(_id(1)), "vector": leg(_id(2)), "geo": leg(_id(3))}, timings
+    )
+
+    assert {name: ranked[0].int for name, ranked in rankings.items()} == {
+        "text": 1,
+        "vector": 2,
+        "geo": 3,
+    }
+    assert len({ranked[1] for ranked in rankings.values()}) == 3
+    assert len(sessions) == 3
+    assert set(timings) == {"text", "vector", "geo"}
+
+
+def test_candidate_queries_rank_by_ts_rank_and_knn_within_the_radius():
+    text_sql = _sql(select_text_candidates("reef dive", 13.1, -59.6, 10, 100))
+    assert "listings.search_vector @@ plainto_tsquery" in text_sql
+    assert "ORDER BY ts_rank(listings.search_vector, plainto_tsquery" in text_sql
+    assert "ST_DWithin(listings.location, geography(" in text_sql
+
+    geo_sql = _sql(select_geo_candidates(13.1, -59.6, 10, 100))
+    assert "ORDER BY listings.location <-> geography(" in geo_sql
+    assert "ST_DWithin" in geo_sql
+    assert "search_vector" not in geo_sql
+
+
+def test_hybrid_search_pages_through_the_fused_list(monkeypatch, fake_session, listing_card):
+    rankings = {
+        "text": [_id(1), _id(2), _id(3)],
+        "vector": [_id(2), _id(4)],
+        "geo": [_id(3), _id(2), _id(5)],
+    }
+
+    def fake_run(open_session, legs, timings):
+        assert set(legs) == {"text", "vector", "geo"}
+        timings.update({name: 1.0 for name in legs})
+        return rankings
+
+    monkeypatch.setattr(hybrid, "run_search_legs", fake_run)
+    db = _card_session(fake_session, listing_card)
+
+    first = hybrid_search_listings(db, "reef", 13.1, -59.6, limit=2)
+    assert [item["id"].int for item in first.items] == [2, 3]
+    assert first.items[0]["score"] == pytest.approx(1 / 62 + 1 / 61 + 1 / 62, abs=1e-6)
+    assert {"text", "vector", "geo", "fuse", "fetch", "total"} <= set(first.timings)
+    assert first.next_cursor
+
+    second = hybrid_search_listings(
+        db, "reef", 13.1, -59.6, limit=2, cursor=first.next_cursor
+    )
+    assert [item["id"].int for item in second.items] == [1, 4]
+    third = hybrid_search_listings(
+        db, "reef", 13.1, -59.6, limit=2, cursor=second.next_cursor
+    )
+    assert [item["id"].int for item in third.items] == [5]
+    assert third.next_cursor is None
+
+
+def test_hybrid_search_rejects_a_cursor_without_a_numeric_score(fake_session):
+    for score in ("0.5", None, True, [0.5]):
+        cursor = encode_cursor(HYBRID_SEARCH_ORDERING, score, _id(1))
+        with pytest.raises(HTTPException) as error:
+            hybrid_search_listings(fake_session(), "reef", None, None, cursor=cursor)
+        assert error.value.status_code == 400
+        assert error.value.detail == "Invalid cursor"
+
+
+def test_hybrid_search_needs_text_or_a_point(fake_session):
+    with pytest.raises(HTTPException) as error:
+        hybrid_search_listings(fake_session(), None, None, None)
+    assert error.value.status_code == 400
@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+from app.modules.listings.personalization import (
+    ROTATION_PERIOD_SECONDS,
+    InterestListingIndex,
+    popularity_score,
+    rotation_seed,
+)
+
+
+def _index(postings, popularity):
+    return InterestListingIndex(postings, popularity)
+
+
+def test_rank_prefers_interest_overlap_then_popularity():
+    beach, food, music = uuid4(), uuid4(), uuid4()
+    both, popular, quiet, unrelated = uuid4(), uuid4(), uuid4(), uuid4()
+    index = _index(
+        {
+            beach: (both, popular, quiet),
+            food: (both,),
+            music: (unrelated,),
+        },
+        {
+            both: popularity_score(None, 0),
+            popular: popularity_score(4.8, 120),
+            quiet: popularity_score(2, 0),
+            unrelated: popularity_score(5, 500),
+        },
+    )
+
+    ranked = index.rank([beach, food, beach], limit=10, seed="user:1")
+    assert ranked == [popular, both, quiet]
+    assert index.rank([beach, food], limit=1, seed="user:1") == [popular]
+    assert index.rank([uuid4()], limit=5, seed="user:1") == []
+
+
+def test_rotation_is_stable_within_a_window_and_varies_across_users():
+    interest = uuid4()
+    listings = [uuid4() for _ in range(30)]
+    index = _index({interest: tuple(listings)}, {listing: 1.0 for listing in listings})
+
+    start = 1_000 * ROTATION_PERIOD_SECONDS
+    same_window = rotation_seed("u1", start), rotation_seed("u1", start + 60)
+    assert same_window[0] == same_window[1]
+    assert rotation_seed("u1", start + ROTATION_PERIOD_SECONDS) != same_window[0]
+
+    first = index.rank([interest], limit=10, seed=same_window[0])
+    assert first == index.rank([interest], limit=10, seed=same_window[1])
+    assert first != index.rank([interest], limit=10, seed=rotation_seed("u2", start))
+
+
+def test_popularity_grows_with_reviews_and_rating():
+    assert popularity_score(None, 0) == popularity_score(3, 0)
+    assert popularity_score(4.5, 10) > popularity_score(4.5, 1) > popularity_score(2, 1)
@@ -0,0 +1,68 @@
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.modules.listings.service import search_listings_combined
+from app.shared.pagination import encode_cursor
+
+
+def _compile(statement):
+    return statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}
+    )
+
+
+def test_text_search_uses_stored_vector_then_falls_back_to_trigrams(fake_session):
+    db = fake_session()
+
+    assert search_listings_combined(db, q="beech hut", limit=5).items == []
+
+    full_text, fuzzy = (str(_compile(statement)) for statement in db.statements)
+    assert "listings.search_vector @@ plainto_tsquery(" in full_text
+    assert "to_tsvector" not in full_text
+    assert "<%% listings.title" in fuzzy  # pyformat-escaped ``<%``
+    assert "word_similarity(" in fuzzy
+
+
+def test_nearby_search_orders_by_knn_distance_and_seeks_by_cursor(fake_session):
+    db = fake_session()
+    cursor = encode_cursor("distance:asc", 1250.5, uuid4())
+
+    search_listings_combined(db, lat=13.19, lng=-59.54, limit=5)
+    search_listings_combined(db, lat=13.19, lng=-59.54, limit=5, cursor=cursor)
+
+    first_page, next_page = (str(_compile(statement)) for statement in db.statements)
+    assert "ST_Distance(" not in first_page
+    assert "AS distance_m" in first_page
+    assert "ORDER BY (listings.location <-> geography(" in first_page
+    assert "LIMIT" in first_page
+    assert "(listings.location <-> geography(" in next_page.split("WHERE", 1)[1]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="EXPLAIN checks need a migrated Postgres in TEST_DATABASE_URL",
+)
+def test_search_plans_use_gin_and_gist_indexes(fake_session):
+    db = fake_session()
+    search_listings_combined(db, q="beach", limit=5)
+    full_text, fuzzy = db.statements
+    search_listings_combined(db, lat=13.19, lng=-59.54, limit=5)
+    nearby = db.statements[-1]
+
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        for statement, index_name in [
+            (full_text, "ix_listings_search_vector"),
+            (fuzzy, "ix_listings_title_trgm"),
+            (nearby, "idx_listings_location"),
+        ]:
+            compiled = _compile(statement)
+            plan = "\n".join(
+                conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars()
+            )
+            assert index_name in plan
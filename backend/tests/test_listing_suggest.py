@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.infrastructure.database import get_db
+from app.main import create_app
+from app.modules.listings import suggest as suggest_module
+from app.modules.listings.models import Statuses
+from app.modules.listings.suggest import (
+    ListingTerms,
+    SuggestIndex,
+    listing_terms,
+    normalize_suggest_text,
+)
+
+
+def _terms(title, city=None, business_id=None, interest_ids=()):
+    return ListingTerms(
+        title=title,
+        city=city,
+        business_id=business_id,
+        interest_ids=frozenset(interest_ids),
+    )
+
+
+def _texts(index, prefix, limit=10):
+    return [(item["kind"], item["text"]) for item in index.search(prefix, limit)]
+
+
+def test_prefix_matches_any_word_start_ignoring_case_and_accents():
+    index = SuggestIndex()
+    index.put_listing(uuid4(), _terms("Crane Beach Hotel", city="Saint-Philippe"))
+
+    assert normalize_suggest_text("  Café  Crème! ") == "cafe creme"
+    assert _texts(index, "cra") == [("listing", "Crane Beach Hotel")]
+    assert _texts(index, "BEACH h") == [("listing", "Crane Beach Hotel")]
+    assert _texts(index, "philippe") == [("city", "Saint-Philippe")]
+    assert _texts(index, "saint phi") == [("city", "Saint-Philippe")]
+    assert _texts(index, "hotels") == []
+    assert _texts(index, "  ") == []
+
+
+def test_shared_terms_live_while_an_active_listing_uses_them():
+    index = SuggestIndex()
+    business_id, interest_id = uuid4(), uuid4()
+    index.set_name("business", str(business_id), "Island Tours")
+    index.set_name("interest", str(interest_id), "Snorkelling")
+    first, second = uuid4(), uuid4()
+
+    index.put_listing(first, _terms("Reef Trip", "Bridgetown", business_id, [interest_id]))
+    index.put_listing(second, _terms("Rum Walk", "Bridgetown", business_id))
+    assert _texts(index, "bridge") == [("city", "Bridgetown")]
+    assert _texts(index, "isl") == [("business", "Island Tours")]
+    assert _texts(index, "snork") == [("interest", "Snorkelling")]
+
+    index.put_listing(first, None)
+    assert _texts(index, "snork") == []
+    assert _texts(index, "reef") == []
+    assert _texts(index, "bridge") == [("city", "Bridgetown")]
+
+    index.set_name("business", str(business_id), "Isle Tours")
+    assert _texts(index, "isl") == [("business", "Isle Tours")]
+
+    index.put_listing(second, _terms("Rum Walk", "Oistins"))
+    assert _texts(index, "bridge") == []
+    assert _texts(index, "isl") == []
+    assert len(index) == len({"rum walk", "walk", "oistins"})
+
+
+def test_results_are_deduplicated_and_limited():
+    index = SuggestIndex()
+    index.add_listings(
+        (uuid4(), _terms(f"Sunset Sunset Cruise {number}")) for number in range(5)
+    )
+
+    results = index.search("sun", limit=3)
+    assert len(results) == 3
+    assert len({item["id"] for item in results}) == 3
+
+
+def test_only_active_listings_contribute_terms():
+    listing = SimpleNamespace(
+        title="Harbour Lights",
+        status=Statuses.pending,
+        address={"city": "Bridgetown"},
+        business_id=None,
+    )
+    assert listing_terms(listing) is None
+
+    listing.status = Statuses.active
+    assert listing_terms(listing, [uuid4()]).city == "Bridgetown"
+
+
+def test_suggest_endpoint_answers_from_the_index():
+    index = SuggestIndex()
+    index.put_listing(uuid4(), _terms("Harbour Lights", city="Bridgetown"))
+    suggest_module.suggest_index.set(index)
+
+    app = create_app(background_jobs_enabled=False)
+    app.dependency_overrides[get_db] = lambda: (yield object())
+    try:
+        with TestClient(app) as client:
+            response = client.get("/api/listings/suggest", params={"q": "harb"})
+    finally:
+        suggest_module.invalidate_suggest_index()
+
+    assert response.status_code == 200
+    assert [(item["kind"], item["text"]) for item in response.json()] == [
+        ("listing", "Harbour Lights")
+    ]
@@ -1,8 +1,39 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import undefer_group
+from sqlmodel import select
 
 from app.infrastructure.database import get_db
 from app.main import create_app
 import app.modules.listings.router as listings_router_module
+from app.modules.listings.facets import (
+    BUSINESS_TYPE_SET,
+    CITY_SET,
+    PRICE_SET,
+    listing_facets_cache,
+    load_listing_facets,
+)
+from app.modules.listings.models import LISTING_PAYLOAD_GROUP, Listing, Statuses
+from app.modules.listings.schemas import ListingResponse
+from app.modules.listings.service import (
+    COUNTRY_CITIES_CACHE_MAX_ENTRIES,
+    LISTING_SORT_COLUMNS,
+    LISTING_SORT_KEYS,
+    country_cities_cache,
+    get_cities_for_country,
+    invalidate_country_cities,
+    list_listings,
+    select_listing_cards,
+    serialize_listing_row,
+)
+from app.shared.pagination import NEXT_CURSOR_HEADER, Page, decode_cursor, encode_cursor
 
 
 def _override_get_db():
@@ -32,7 +63,7 @@ def test_search_listings_with_lat_lng_calls_combined_search(monkeypatch):
     app.dependency_overrides[get_db] = _override_get_db
     captured = {}
 
-    def fake_search_listings_combined(db, q, lat, lng, radius_km, limit):
+    def fake_search_listings_combined(db, q, lat, lng, radius_km, limit, cursor, facets):
         captured.update(
             {
                 "db": db,
@@ -41,9 +72,11 @@ def test_search_listings_with_lat_lng_calls_combined_search(monkeypatch):
                 "lng": lng,
                 "radius_km": radius_km,
                 "limit": limit,
+                "cursor": cursor,
+                "facets": facets,
             }
         )
-        return [{"id": "listing-1"}]
+        return Page([{"id": "listing-1"}], next_cursor="next-page")
 
     monkeypatch.setattr(
         listings_router_module,
@@ -65,8 +98,216 @@ def test_search_listings_with_lat_lng_calls_combined_search(monkeypatch):
 
     assert response.status_code == 200
     assert response.json() == [{"id": "listing-1"}]
+    assert response.headers[NEXT_CURSOR_HEADER] == "next-page"
     assert captured["q"] == "beach"
     assert captured["lat"] == 13.1939
     assert captured["lng"] == -59.5432
     assert captured["radius_km"] == 15.0
+    assert captured["facets"] is False
     assert captured["limit"] == 5
+    assert captured["cursor"] is None
+
+
+def test_list_listings_filters_availability_before_paginating(fake_session):
+    db = fake_session()
+
+    page = list_listings(db, skip=20, limit=10, availability_date=date(2026, 7, 1))
+    assert page.items == []
+
+    [statement] = db.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "EXISTS (SELECT services.service_id" in sql
+    assert "slot_occupancy" in sql
+    assert sql.index("EXISTS") < sql.index("LIMIT")
+
+
+def test_listing_cursor_round_trips_and_is_bound_to_its_ordering():
+    listing_id = uuid4()
+    created_at = datetime(2026, 7, 1, 9, 30)
+
+    token = encode_cursor("created_at:desc", created_at, listing_id)
+    assert decode_cursor(token, "created_at:desc") == (created_at, str(listing_id))
+
+    price_token = encode_cursor("base_price:asc", Decimal("12.50"), listing_id)
+    assert decode_cursor(price_token, "base_price:asc")[0] == Decimal("12.50")
+
+    for bad_token, ordering in [(token, "base_price:asc"), ("not-a-cursor", "id:asc")]:
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(bad_token, ordering)
+        assert exc_info.value.status_code == 400
+
+
+def test_list_listings_cursor_seeks_past_the_last_row_instead_of_offsetting(fake_session):
+    db = fake_session()
+    cursor = encode_cursor("base_price:desc", Decimal("80"), uuid4())
+
+    list_listings(db, limit=10, sort_by="base_price", sort_order="desc", cursor=cursor)
+
+    [statement] = db.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "(listings.base_price, listings.id) <" in sql
+    assert "ORDER BY listings.base_price DESC, listings.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_list_listings_rejects_sort_keys_a_cursor_cannot_seek_on(fake_session):
+    assert set(LISTING_SORT_COLUMNS) == set(LISTING_SORT_KEYS)
+    for sort_by in (
+        "address",
+        "details",
+        "location",
+        "embedding",
+        "embedding_content_hash",
+        "rating_sum",
+        "not_a_column",
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            list_listings(fake_session(), limit=10, sort_by=sort_by)
+        assert exc_info.value.status_code == 400
+
+
+def test_country_cities_are_aggregated_in_one_cached_statement(fake_session):
+    invalidate_country_cities()
+    db = fake_session()
+
+    result = get_cities_for_country(db, "Barbados")
+    assert result == {
+        "country": "Barbados",
+        "country_center": None,
+        "cities": [],
+        "radius_options": [],
+    }
+    assert get_cities_for_country(db, "barbados")["country"] == "barbados"
+
+    [statement] = db.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ST_Centroid(ST_Collect(" in sql
+    assert "ST_DistanceSphere(" in sql
+    assert "percentile_cont(ARRAY[" in sql
+    assert "WITHIN GROUP (ORDER BY distances.distance_km)" in sql
+
+    invalidate_country_cities()
+    assert len(country_cities_cache) == 0
+    get_cities_for_country(db, "Barbados")
+    assert len(db.statements) == 2
+
+
+def test_country_cities_cache_is_bounded(fake_session):
+    invalidate_country_cities()
+    db = fake_session()
+
+    for index in range(COUNTRY_CITIES_CACHE_MAX_ENTRIES + 10):
+        get_cities_for_country(db, f"Country {index}")
+
+    assert len(country_cities_cache) == COUNTRY_CITIES_CACHE_MAX_ENTRIES
+    invalidate_country_cities()
+
+
+def test_listing_facets_are_one_grouping_sets_statement_cached_per_filter(fake_session):
+    listing_facets_cache.invalidate()
+    db = fake_session()
+
+    page = list_listings(db, limit=10, city="Bridge", facets=True)
+    list_listings(db, limit=10, city="Bridge", facets=True)
+    list_listings(db, limit=10, city="Speights", facets=True)
+
+    assert page.facets == {"business_type": [], "price": [], "city": []}
+    sql = [str(statement.compile(dialect=postgresql.dialect())) for statement in db.statements]
+    facet_sql = [statement for statement in sql if "GROUPING SETS" in statement]
+    assert len(sql) == 5
+    assert len(facet_sql) == 2
+    assert (
+        "GROUP BY GROUPING SETS((faceted.business_type, faceted.business_type_name), "
+        "faceted.price_bucket, faceted.city)"
+    ) in facet_sql[0]
+    assert "ILIKE" in facet_sql[0]
+
+
+def _facet_row(grouping_set, count, business_type=None, name=None, bucket=None, city=None):
+    return SimpleNamespace(
+        grouping_set=grouping_set,
+        business_type=business_type,
+        business_type_name=name,
+        price_bucket=bucket,
+        city=city,
+        count=count,
+    )
+
+
+def test_listing_facet_rows_are_split_by_grouping_set(fake_session):
+    type_id = uuid4()
+    rows = [
+        _facet_row(BUSINESS_TYPE_SET, 4, business_type=type_id, name="Hotel"),
+        _facet_row(PRICE_SET, 1, bucket=4),
+        _facet_row(PRICE_SET, 3, bucket=0),
+        _facet_row(CITY_SET, 4, city="Bridgetown"),
+    ]
+
+    assert load_listing_facets(fake_session(rows), []) == {
+        "business_type": [{"value": str(type_id), "label": "Hotel", "count": 4}],
+        "price": [
+            {"min": 0, "max": 50, "count": 3},
+            {"min": 500, "max": None, "count": 1},
+        ],
+        "city": [{"value": "Bridgetown", "count": 4}],
+    }
+
+
+def test_listing_cards_are_one_projected_statement_without_embeddings():
+    sql = str(select_listing_cards().compile(dialect=postgresql.dialect()))
+
+    assert "listings.embedding" not in sql
+    assert "ST_AsBinary" not in sql
+    assert "ST_Y(geometry(listings.location))" in sql
+    assert "LEFT OUTER JOIN business_types" in sql
+    assert "LEFT OUTER JOIN businesses" in sql
+
+
+def test_serialize_listing_row_builds_the_response_from_columns(listing_card):
+    listing_id = uuid4()
+    row = listing_card(
+        listing_id,
+        "Beach hut",
+        created_at=datetime(2026, 7, 1, 9, 30),
+        status=Statuses.approved,
+        avg_rating=Decimal("4.50"),
+        review_count=2,
+        rating_histogram=[0, 0, 0, 1, 1],
+        lat=13.19,
+        lng=-59.54,
+        business_type_name="hotel",
+        business_name="Hut Co",
+    )
+
+    data = serialize_listing_row(row, [listing_id])
+
+    assert data["status"] == Statuses.active
+    assert data["avg_rating"] == 4.5
+    assert data["location"] == {"lat": 13.19, "lng": -59.54}
+    assert data["business_name"] == "Hut Co"
+    assert data["interest_ids"] == [listing_id]
+    assert ListingResponse.model_validate(data).title == "Beach hut"
+
+
+def test_every_sort_key_yields_a_next_cursor_from_card_rows(fake_session, listing_card):
+    rows = [listing_card(uuid4(), title) for title in ("Beach hut", "Reef bar")]
+
+    for sort_by in LISTING_SORT_KEYS:
+        db = fake_session(rows, [])
+        page = list_listings(db, limit=1, sort_by=sort_by)
+        assert decode_cursor(page.next_cursor, f"{sort_by}:asc")[1] == str(rows[0].id)
+
+
+def test_heavy_listing_columns_are_deferred_unless_requested():
+    default_sql = str(select(Listing).compile(dialect=postgresql.dialect()))
+    payload_sql = str(
+        select(Listing)
+        .options(undefer_group(LISTING_PAYLOAD_GROUP))
+        .compile(dialect=postgresql.dialect())
+    )
+
+    for column in ("embedding", "details", "image_urls"):
+        assert f"listings.{column}" not in default_sql
+    assert "listings.details" in payload_sql
+    assert "listings.image_urls" in payload_sql
+    assert "listings.embedding" not in payload_sql
@@ -0,0 +1,283 @@
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from app.modules.listings.models import Statuses
+from app.modules.reviews import service as review_service
+from app.modules.reviews.classification import classify_review_texts
+from app.modules.reviews.classifiers import ml_classifier
+from app.modules.reviews.classifiers.keyword_classifier import BUSINESS_TYPE_UUIDS
+from app.modules.reviews.models import ClassificationStatus, Review
+from app.modules.reviews.reclassify import (
+    InlineExecutor,
+    load_checkpoint,
+    reclassify_reviews,
+    select_review_page,
+)
+from app.modules.reviews.schemas import ReviewCreate, ReviewUpdate
+from app.modules.reviews.worker import classify_pending_reviews, select_pending_reviews
+
+HOTEL = BUSINESS_TYPE_UUIDS["hotel"]
+RESTAURANT = BUSINESS_TYPE_UUIDS["restaurant"]
+
+
+class _Classes:
+    def __init__(self, *labels):
+        self.classes_ = np.array(labels)
+
+
+class _Classifier:
+    """Scores each label by one coordinate of the embedding."""
+
+    def predict_proba(self, embeddings):
+        return np.asarray(embeddings)
+
+    def decision_function(self, embeddings):
+        return np.asarray(embeddings)
+
+
+class _Encoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(list(texts))
+        vectors = {"clean room": [0.9, 0.5, 0.1], "great food": [0.1, 0.2, 0.9]}
+        return np.array([vectors.get(text, [0.5, 0.9, 0.1]) for text in texts])
+
+
+def _install_models(monkeypatch, encoder):
+    model_info = {
+        "clf_main": _Classifier(),
+        "mlb_main": _Classes("rooms", "service", "food"),
+        "clf_all": _Classifier(),
+        "mlb_all": _Classes("rooms", "service", "food"),
+    }
+    monkeypatch.setattr(
+        ml_classifier,
+        "load_models",
+        lambda: {"models_by_type": {1: model_info, 2: model_info}},
+    )
+    monkeypatch.setattr(ml_classifier, "get_embedding_model_with_timeout", lambda timeout: encoder)
+
+
+def test_a_batch_is_translated_concurrently_and_encoded_once(monkeypatch):
+    encoder = _Encoder()
+    _install_models(monkeypatch, encoder)
+    monkeypatch.setattr(
+        ml_classifier, "detect_language", lambda text: "fr" if text == "chambre propre" else "en"
+    )
+    monkeypatch.setattr(
+        ml_classifier, "translate_to_english", lambda text, source_lang: "clean room"
+    )
+    timings = {}
+
+    results = ml_classifier.classify_reviews(
+        ["chambre propre", "great food", "friendly staff"],
+        [HOTEL, RESTAURANT, HOTEL],
+        timings,
+    )
+
+    assert len(encoder.calls) == 1
+    assert sorted(encoder.calls[0]) == ["clean room", "friendly staff", "great food"]
+    assert [
+        (result["main_label"], result["second_label"], result["third_label"])
+        for result in results
+    ] == [
+        ("rooms", "service", "food"),
+        ("food", "service", "rooms"),
+        ("service", "rooms", "food"),
+    ]
+    assert results[0]["detected_language"] == "fr"
+    assert results[0]["translated_text"] == "clean room"
+    assert {"detect", "translate", "load", "encode", "predict"} <= set(timings)
+
+
+def test_batch_falls_back_to_keywords_without_models(monkeypatch):
+    monkeypatch.setattr(ml_classifier, "load_models", lambda: None)
+    monkeypatch.setattr(ml_classifier, "detect_language", lambda text: "en")
+
+    [hotel, tour] = classify_review_texts(
+        [
+            ("The room was clean", "Hotel", HOTEL),
+            ("Great guide", "Tour Operator", BUSINESS_TYPE_UUIDS["tour_operator"]),
+        ]
+    )
+
+    assert hotel["classification_method"] == "ml_fallback"
+    assert tour["classification_method"] == "keyword"
+    assert len(json.loads(hotel["classification_labels"])) == 3
+
+
+def test_ml_reviews_are_saved_pending_without_classifying_inline(monkeypatch, fake_session):
+    def fail(*args, **kwargs):
+        raise AssertionError("classified inside the request")
+
+    monkeypatch.setattr(ml_classifier, "classify_review", fail)
+    monkeypatch.setattr(ml_classifier, "classify_reviews", fail)
+    monkeypatch.setattr(ml_classifier, "detect_language", fail)
+    listing = SimpleNamespace(id=uuid4(), status=Statuses.active, business_type=HOTEL)
+    db = fake_session([listing], [SimpleNamespace(name="Hotel")])
+
+    response = review_service.submit_review(
+        db, uuid4(), ReviewCreate(listing_id=listing.id, rating=4, comment="Lovely stay")
+    )
+
+    [review] = db.added
+    assert review.classification_status == ClassificationStatus.pending
+    assert review.classification_labels is None
+    assert response["classification_status"] == ClassificationStatus.pending
+    assert response["detail"] == "Review submitted; classification pending"
+
+
+def test_keyword_reviews_are_still_classified_inline(fake_session):
+    tour = BUSINESS_TYPE_UUIDS["tour_operator"]
+    listing = SimpleNamespace(id=uuid4(), status=Statuses.active, business_type=tour)
+    db = fake_session([listing], [SimpleNamespace(name="Tour Operator")])
+
+    response = review_service.submit_review(
+        db, uuid4(), ReviewCreate(listing_id=listing.id, rating=5, comment="Great guide")
+    )
+
+    assert db.added[0].classification_status == ClassificationStatus.classified
+    assert response["classification_method"] == "keyword"
+
+
+def test_updated_reviews_are_classified_and_censored_from_sanitized_text(
+    monkeypatch, fake_session
+):
+    queued = []
+    monkeypatch.setattr(
+        review_service,
+        "queue_review_classification",
+        lambda review, text, name, business_type: queued.append(text),
+    )
+    review = Review(id=uuid4(), listing_id=uuid4(), user_id=uuid4(), rating=4)
+    listing = SimpleNamespace(id=review.listing_id, business_type=HOTEL)
+    db = fake_session([listing], [SimpleNamespace(name="Hotel")])
+
+    review_service.update_review(
+        db, review, ReviewUpdate(comment="<b>Lovely</b> stay<script>x</script>")
+    )
+
+    assert review.comment == "Lovely stayx"
+    assert queued == [review.comment]
+    assert "<" not in review.censored_comment
+
+
+def test_worker_claims_with_skip_locked_and_writes_one_bulk_update(monkeypatch, fake_session):
+    encoder = _Encoder()
+    _install_models(monkeypatch, encoder)
+    monkeypatch.setattr(ml_classifier, "detect_language", lambda text: "en")
+    pending = [
+        SimpleNamespace(
+            id=uuid4(), comment=comment, business_type_id=uuid, business_type_name=name
+        )
+        for comment, uuid, name in [
+            ("clean room", HOTEL, "Hotel"),
+            ("great food", RESTAURANT, "Restaurant"),
+        ]
+    ]
+
+    def queue_depth(statement):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        return [(0, None)] if sql.startswith("SELECT count(*)") else None
+
+    db = fake_session(pending, [], respond=queue_depth)
+    stats = classify_pending_reviews(db, batch_size=2)
+
+    assert len(encoder.calls) == 1
+    [params] = db.bulk
+    assert [json.loads(row["classification_labels"])[0] for row in params] == ["rooms", "food"]
+    assert {row["classification_status"] for row in params} == {ClassificationStatus.classified}
+    assert db.commits == 1
+    assert stats["classified"] == 2 and stats["pending"] == 0
+    assert {"claim", "encode", "predict", "write"} <= set(stats["stage_ms"])
+
+    sql = str(select_pending_reviews(64).compile(dialect=postgresql.dialect()))
+    assert sql.endswith("FOR UPDATE OF reviews SKIP LOCKED")
+    assert "reviews.classification_status = %(classification_status_1)s" in sql
+
+
+def test_reclassification_pages_by_id_and_resumes_from_the_checkpoint(
+    monkeypatch, tmp_path, fake_session
+):
+    encoder = _Encoder()
+    _install_models(monkeypatch, encoder)
+    tour = BUSINESS_TYPE_UUIDS["tour_operator"]
+    reviews = sorted(
+        [
+            SimpleNamespace(
+                id=uuid4(),
+                text=text,
+                translated=True,
+                detected_language="en",
+                business_type_id=uuid,
+            )
+            for text, uuid in [
+                ("clean room", HOTEL),
+                ("great food", RESTAURANT),
+                ("friendly staff", HOTEL),
+                ("great guide", tour),
+            ]
+        ],
+        key=lambda row: row.id,
+    )
+
+    checkpoint = str(tmp_path / "checkpoint.json")
+    db = fake_session(reviews[:2], reviews[2:])
+    stats = reclassify_reviews(
+        db, InlineExecutor(), checkpoint_path=checkpoint, fingerprint="v1", page_size=2
+    )
+
+    assert db.commits == 2
+    labels = {row["id"]: json.loads(row["classification_labels"])[0] for row in sum(db.bulk, [])}
+    texts = {row.id: row.text for row in reviews}
+    assert {texts[review_id]: label for review_id, label in labels.items()} == {
+        "clean room": "rooms",
+        "great food": "food",
+        "friendly staff": "service",
+    }
+    # Unknown business types have no model and are left as they are
+    assert stats["updated"] == 3 and stats["skipped"] == 1
+    assert load_checkpoint(checkpoint, "v1") == reviews[-1].id
+    assert load_checkpoint(checkpoint, "v2") is None
+
+    sql = str(select_review_page(reviews[1].id, 2).compile(dialect=postgresql.dialect()))
+    assert "reviews.id > %(id_1)s" in sql
+    assert sql.endswith("ORDER BY reviews.id \n LIMIT %(param_1)s")
+
+
+def test_reclassification_skips_untranslated_reviews_not_in_english(monkeypatch, fake_session):
+    encoder = _Encoder()
+    _install_models(monkeypatch, encoder)
+    detected = {"chambre propre": "fr", "clean room": "en"}
+    monkeypatch.setattr(ml_classifier, "detect_language", detected.get)
+    # Keyword fallbacks store neither a translation nor a language
+    page = [
+        SimpleNamespace(
+            id=uuid4(),
+            text=text,
+            translated=False,
+            detected_language=language,
+            business_type_id=HOTEL,
+        )
+        for text, language in [
+            ("chambre propre", None),
+            ("clean room", None),
+            ("great food", "en"),
+            ("zimmer sauber", "de"),
+        ]
+    ]
+    db = fake_session(page)
+
+    stats = reclassify_reviews(db, InlineExecutor(), page_size=4)
+
+    assert encoder.calls == [["clean room", "great food"]]
+    assert stats["updated"] == 2 and stats["skipped"] == 2
+    sql = str(select_review_page(None, 4).compile(dialect=postgresql.dialect()))
+    assert "reviews.translated_comment IS NOT NULL AS translated" in sql
+    assert "reviews.detected_language" in sql
@@ -0,0 +1,30 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.reviews.ratings import apply_rating_deltas, record_rating_changed
+
+
+def test_rating_change_moves_one_histogram_bucket_in_a_single_update(fake_session):
+    db = fake_session()
+
+    record_rating_changed(db, uuid4(), 2, 5)
+
+    [statement] = db.statements
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert sql.startswith("UPDATE listings SET")
+    assert sql.count("rating_histogram[") == 4
+    assert "reviews" not in sql
+    # One review moved buckets: count unchanged, sum up by 3
+    assert compiled.params["review_count_1"] == 0
+    assert compiled.params["rating_sum_1"] == 3
+
+
+def test_rating_deltas_skip_no_op_writes(fake_session):
+    db = fake_session()
+
+    record_rating_changed(db, uuid4(), 4, 4)
+    apply_rating_deltas(db, uuid4(), {3: 0})
+
+    assert db.statements == []
@@ -0,0 +1,140 @@
+from uuid import uuid4
+
+from app.modules.bookings.service import calculate_display_price_for_booking
+from app.modules.pricing.service import calculate_display_price
+from app.modules.services.cache import (
+    ServiceDescriptor,
+    invalidate_service_descriptors,
+    service_descriptor_cache,
+)
+from app.modules.services.models import StatusTypes
+from app.shared.cache import RefreshingValue, VersionedTTLCache
+
+
+def _descriptor(service_id, business_type_name="hotel"):
+    return ServiceDescriptor(
+        service_id=service_id,
+        listing_id=uuid4(),
+        status=StatusTypes.active,
+        capacity=4,
+        price=10.0,
+        listing_base_price=None,
+        business_type_id=uuid4(),
+        business_type_name=business_type_name,
+        slot_days=frozenset({1}),
+    )
+
+
+def test_cache_expires_and_invalidates():
+    service_id = uuid4()
+    loads = []
+
+    def load(service_ids):
+        loads.append(list(service_ids))
+        return {sid: _descriptor(sid) for sid in service_ids}
+
+    now = [0.0]
+    cache = VersionedTTLCache(ttl_seconds=60, clock=lambda: now[0])
+
+    assert cache.get_many([service_id], load)[service_id].is_hotel
+    cache.get_many([service_id], load)
+    assert len(loads) == 1
+
+    now[0] = 61
+    cache.get_many([service_id], load)
+    assert len(loads) == 2
+
+    cache.invalidate([service_id])
+    cache.get_many([service_id], load)
+    assert len(loads) == 3
+
+    cache.get_many([service_id], load, is_fresh=lambda key, value: False)
+    assert len(loads) == 4
+
+
+def test_cache_drops_loads_that_race_an_invalidation():
+    service_id = uuid4()
+    cache = VersionedTTLCache(ttl_seconds=60)
+
+    def racing_load(service_ids):
+        cache.invalidate()
+        return {sid: _descriptor(sid) for sid in service_ids}
+
+    assert service_id in cache.get_many([service_id], racing_load)
+    assert len(cache) == 0
+
+
+def test_bounded_cache_evicts_expired_then_oldest_entries():
+    now = [0.0]
+    cache = VersionedTTLCache(ttl_seconds=10, clock=lambda: now[0], max_entries=2)
+
+    def load(keys):
+        return {key: key.upper() for key in keys}
+
+    cache.get_many(["a"], load)
+    now[0] = 5
+    cache.get_many(["b"], load)
+    cache.get_many(["c"], load)
+    assert len(cache) == 2
+    assert cache.get_many(["b"], lambda keys: {}) == {"b": "B"}
+
+    now[0] = 6
+    cache.get_many(["d"], load)
+    assert cache.get_many(["c", "d"], lambda keys: {}) == {"c": "C", "d": "D"}
+
+    now[0] = 20
+    cache.get_many(["e"], load)
+    assert len(cache) == 1
+
+
+def test_refreshing_value_rebuilds_when_old_and_drops_builds_raced_by_invalidation():
+    now = [0.0]
+    value = RefreshingValue(ttl_seconds=10, clock=lambda: now[0])
+    builds = []
+
+    def load():
+        builds.append(now[0])
+        return f"index-{len(builds)}"
+
+    assert value.current is None
+    assert value.get(load) == "index-1"
+    now[0] = 9
+    assert value.get(load) == "index-1"
+    now[0] = 10
+    assert value.get(load) == "index-2"
+
+    def racing_load():
+        value.invalidate()
+        return "stale"
+
+    value.invalidate()
+    assert value.get(racing_load) == "stale"
+    assert value.current is None
+    value.set("prebuilt")
+    assert value.get(load) == "prebuilt" and len(builds) == 2
+
+
+def test_booking_prices_come_from_the_rows_and_display_prices_from_the_cache(fake_session):
+    descriptor = _descriptor(uuid4())
+    service_id, listing_id = descriptor.service_id, descriptor.listing_id
+    service_descriptor_cache.get_many([service_id], lambda keys: {service_id: descriptor})
+    # Another worker has since raised the price from 10 to 25
+    row = (service_id, listing_id, StatusTypes.active, 4, 25.0, None, None, "hotel")
+
+    try:
+        displayed = calculate_display_price(fake_session(), listing_id, service_id)
+        charged = calculate_display_price_for_booking(
+            fake_session([row]), listing_id, service_id
+        )
+    finally:
+        invalidate_service_descriptors()
+
+    assert displayed["base_price"] == 10.0
+    assert charged["base_price"] == 25.0
+
+
+def test_descriptor_requires_slot_only_on_slot_days_for_non_hotels():
+    service_id = uuid4()
+    assert not _descriptor(service_id).requires_slot(1)
+    assert _descriptor(service_id, "restaurant").requires_slot(1)
+    assert not _descriptor(service_id, "restaurant").requires_slot(2)
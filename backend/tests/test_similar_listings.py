@@ -0,0 +1,103 @@
+import os
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.modules.recommendations import service as recommendations_service
+from app.modules.recommendations.service import get_similar_listings
+from app.modules.recommendations.vector_index import (
+    NumpyVectorIndex,
+    set_numpy_vector_index,
+)
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_numpy_index_ranks_by_cosine_and_applies_exclusion_and_radius():
+    source, close, far_but_similar, unrelated = uuid4(), uuid4(), uuid4(), uuid4()
+    index = NumpyVectorIndex(
+        [
+            (source, _unit(1, 0, 0), 13.10, -59.60),
+            (close, _unit(0.8, 0.6, 0), 13.11, -59.61),
+            (far_but_similar, _unit(0.99, 0.1, 0), 18.0, -63.0),
+            (unrelated, _unit(0, 0, 1), None, None),
+        ]
+    )
+
+    hits = index.nearest(_unit(1, 0, 0), 10, exclude=source)
+    assert [hit_id for hit_id, _ in hits] == [far_but_similar, close, unrelated]
+    assert hits[0][1] == pytest.approx(0.995, abs=1e-3)
+
+    nearby = index.nearest(
+        _unit(1, 0, 0), 10, exclude=source, center=(13.10, -59.60), radius_km=25
+    )
+    assert [hit_id for hit_id, _ in nearby] == [close]
+    assert index.nearest(_unit(1, 0, 0), 1, exclude=source)[0][0] == far_but_similar
+
+
+def test_similar_listings_fall_back_to_the_numpy_index(
+    monkeypatch, fake_session, listing_card
+):
+    source, match = uuid4(), uuid4()
+    monkeypatch.setattr(recommendations_service, "_vector_backend", "numpy")
+    set_numpy_vector_index(
+        NumpyVectorIndex(
+            [(source, _unit(1, 0), None, None), (match, _unit(1, 1), None, None)]
+        )
+    )
+    db = fake_session(
+        [SimpleNamespace(embedding=_unit(1, 0), lat=None, lng=None)],
+        [listing_card(match, "Reef Lodge")],
+    )
+
+    try:
+        cards = get_similar_listings(db, source, limit=5)
+    finally:
+        set_numpy_vector_index(None)
+
+    assert [(card["title"], card["similarity"]) for card in cards] == [
+        ("Reef Lodge", pytest.approx(0.707107, abs=1e-6))
+    ]
+
+
+def test_similar_listings_use_the_hnsw_operator_with_filters(monkeypatch, fake_session):
+    monkeypatch.setattr(recommendations_service, "_vector_backend", "pgvector")
+    source = SimpleNamespace(embedding=_unit(1, 0, 0), lat=13.1, lng=-59.6)
+    db = fake_session([source], None, [])
+
+    assert get_similar_listings(db, uuid4(), limit=5, radius_km=10) == []
+
+    sql = str(db.statements[2].compile(dialect=postgresql.dialect()))
+    assert "listings.embedding <=> %(embedding_1)s AS distance" in sql
+    assert "ORDER BY listings.embedding <=> %(embedding_1)s" in sql
+    assert "ST_DWithin(listings.location, geography(" in sql
+    assert "LIMIT" in sql
+    assert "hnsw.ef_search" in str(db.statements[1])
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="EXPLAIN checks need a migrated Postgres in TEST_DATABASE_URL",
+)
+def test_similar_listings_plan_uses_the_hnsw_index(monkeypatch, fake_session):
+    monkeypatch.setattr(recommendations_service, "_vector_backend", "pgvector")
+    db = fake_session([SimpleNamespace(embedding=_unit(*range(1, 385)), lat=None, lng=None)])
+    get_similar_listings(db, uuid4(), limit=10)
+    compiled = db.statements[2].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}
+    )
+
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(
+            conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars()
+        )
+    assert "ix_listings_embedding_hnsw" in plan
@@ -0,0 +1,230 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.bookings.models import Booking, BookingStatus
+from app.modules.listings.models import EMBEDDING_DIMENSIONS
+from app.modules.listings.service import get_personalized_listings
+from app.modules.recommendations import service as recommendations_service
+from app.modules.recommendations.models import UserTasteSignal, UserTasteVector
+from app.modules.recommendations import taste as taste_module
+from app.modules.recommendations.taste import (
+    BOOKING_WEIGHT,
+    FAVOURITE_SIGNAL,
+    TASTE_HALF_LIFE_SECONDS,
+    TasteState,
+    apply_taste_signal,
+    rebuild_user_tastes,
+    record_booking_status_changed,
+    review_weight,
+    select_taste_signals,
+)
+from app.modules.recommendations.vector_index import (
+    NumpyVectorIndex,
+    set_numpy_vector_index,
+)
+
+
+def _unit(*values):
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+    vector[: len(values)] = values
+    return vector / np.linalg.norm(vector)
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _taste_row(user_id, taste, weight):
+    return UserTasteVector(
+        user_id=user_id,
+        taste=taste.astype(np.float16).tobytes(),
+        weight=weight,
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+def _signal(user_id, embedding, weight=1.0):
+    return UserTasteSignal(
+        user_id=user_id,
+        source=FAVOURITE_SIGNAL,
+        source_id=uuid4(),
+        embedding=embedding.astype(np.float16).tobytes(),
+        weight=weight,
+        made_at=datetime.now(timezone.utc),
+    )
+
+
+def test_taste_is_a_decayed_mean():
+    now = 1_000_000_000.0
+    beach, museum = _unit(1, 0), _unit(0, 1)
+    state = TasteState(at=now)
+
+    state.add(beach, 1.0, now - TASTE_HALF_LIFE_SECONDS, now)
+    state.add(museum, 1.0, now, now)
+    # The beach favourite is one half-life old, so it counts half as much
+    assert state.weight == pytest.approx(1.5)
+    assert state.taste[:2] == pytest.approx([1 / 3, 2 / 3])
+    assert state.weight_at(now + TASTE_HALF_LIFE_SECONDS) == pytest.approx(0.75)
+
+
+def test_only_reviews_above_three_stars_shape_taste():
+    assert [review_weight(rating) for rating in (1, 3, 4, 5, None)] == [0, 0, 0.75, 1.5, 0]
+
+
+def test_signals_update_the_locked_row_as_float16(fake_session):
+    row = UserTasteVector(
+        user_id=uuid4(),
+        taste=b"",
+        weight=0.0,
+        updated_at=datetime.now(timezone.utc),
+    )
+    db = fake_session([_unit(1, 1)], [], [row], [])
+    listing_id = uuid4()
+
+    apply_taste_signal(db, row.user_id, listing_id, FAVOURITE_SIGNAL, listing_id, 2.0, None)
+
+    sql = db.sql()
+    assert "ON CONFLICT DO NOTHING" in sql[1]
+    assert sql[2].endswith("FOR UPDATE")
+    signal, stored = db.added
+    assert stored is row
+    assert (signal.source, signal.source_id, signal.weight) == (FAVOURITE_SIGNAL, listing_id, 2.0)
+    assert signal.embedding == _unit(1, 1).astype(np.float16).tobytes()
+    assert len(row.taste) == EMBEDDING_DIMENSIONS * 2
+    assert row.weight == pytest.approx(2.0)
+    assert np.frombuffer(row.taste, dtype=np.float16)[:2] == pytest.approx(
+        [0.7071, 0.7071], abs=1e-3
+    )
+
+
+def test_signals_on_listings_without_embeddings_are_skipped(fake_session):
+    db = fake_session([None])
+    apply_taste_signal(db, uuid4(), uuid4(), FAVOURITE_SIGNAL, uuid4(), 1.0, None)
+    assert len(db.statements) == 1 and db.added == []
+
+
+def test_retracting_a_skipped_signal_leaves_the_taste_alone(fake_session):
+    row = _taste_row(uuid4(), _unit(1, 0), 1.0)
+    taste = row.taste
+    # The add found no embedding, so no signal was recorded
+    db = fake_session([row], [])
+
+    apply_taste_signal(db, row.user_id, uuid4(), FAVOURITE_SIGNAL, uuid4(), 0.0, None)
+
+    assert row.taste == taste and row.weight == 1.0
+    assert db.added == [] and db.deleted == []
+
+
+def test_retraction_recomputes_from_the_vectors_that_went_in(fake_session):
+    user_id = uuid4()
+    beach, museum = _signal(user_id, _unit(1, 0)), _signal(user_id, _unit(0, 1))
+    row = _taste_row(user_id, _unit(1, 1), 2.0)
+    db = fake_session([row], [museum], [beach])
+
+    # The museum listing has been re-encoded since; its embedding is never read
+    apply_taste_signal(db, user_id, uuid4(), FAVOURITE_SIGNAL, museum.source_id, 0.0, None)
+
+    assert db.deleted == [museum]
+    assert not any("listings.embedding" in sql for sql in db.sql())
+    assert row.weight == pytest.approx(1.0)
+    assert np.frombuffer(row.taste, dtype=np.float16)[:2] == pytest.approx([1, 0])
+
+
+def test_bookings_shape_taste_from_approval_until_cancellation(monkeypatch, fake_session):
+    signals = []
+    monkeypatch.setattr(
+        taste_module,
+        "apply_taste_signal",
+        lambda db, user_id, listing_id, source, source_id, weight, made_at: signals.append(
+            (listing_id, source_id, weight, made_at)
+        ),
+    )
+    listing_id = uuid4()
+    booking = Booking(id=uuid4(), user_id=uuid4(), service_id=uuid4())
+    created_at = booking.created_at
+    transitions = [
+        (None, BookingStatus.pending),
+        (BookingStatus.pending, BookingStatus.cancelled),
+        (None, BookingStatus.approved),
+        (BookingStatus.pending, BookingStatus.approved),
+        (BookingStatus.approved, BookingStatus.completed),
+        (BookingStatus.approved, BookingStatus.cancelled),
+    ]
+
+    for previous_status, status in transitions:
+        booking.status = status
+        record_booking_status_changed(fake_session(), booking, previous_status, listing_id)
+
+    assert signals == [
+        (listing_id, booking.id, BOOKING_WEIGHT, created_at),
+        (listing_id, booking.id, BOOKING_WEIGHT, created_at),
+        (listing_id, booking.id, 0.0, created_at),
+    ]
+
+
+def test_rebuild_reads_favourites_live_bookings_and_good_reviews():
+    sql = _sql(select_taste_signals())
+    assert "FROM favourites" in sql
+    assert "bookings.status IN (__[POSTCOMPILE_status_1])" in sql
+    assert "WHERE reviews.rating > %(rating_2)s" in sql
+    assert "UNION ALL" in sql
+    assert "listings.embedding IS NOT NULL" in sql
+
+
+def test_rebuild_replaces_tastes_and_the_signals_behind_them(fake_session):
+    user_id, listing_id = uuid4(), uuid4()
+    db = fake_session(
+        [
+            SimpleNamespace(
+                user_id=user_id,
+                source=FAVOURITE_SIGNAL,
+                source_id=listing_id,
+                created_at=datetime.now(timezone.utc),
+                weight=1.0,
+                embedding=_unit(1, 0),
+            )
+        ]
+    )
+
+    assert rebuild_user_tastes(db, [user_id]) == {"users": 1, "signals": 1}
+
+    sql = db.sql()
+    assert sql[1].startswith("DELETE FROM user_taste_signals")
+    assert sql[2].startswith("DELETE FROM user_taste_vectors")
+    [tastes], [signals] = db.bulk
+    assert tastes["weight"] == pytest.approx(1.0)
+    assert signals["source_id"] == listing_id
+    assert signals["embedding"] == _unit(1, 0).astype(np.float16).tobytes()
+    assert db.commits == 1
+
+
+def test_personalized_feed_is_a_taste_vector_probe(monkeypatch, fake_session, listing_card):
+    user_id, beach, museum = uuid4(), uuid4(), uuid4()
+    taste = UserTasteVector(
+        user_id=user_id,
+        taste=_unit(1, 0.2).astype(np.float16).tobytes(),
+        weight=3.0,
+        updated_at=datetime.now(timezone.utc),
+    )
+    monkeypatch.setattr(recommendations_service, "_vector_backend", "numpy")
+    set_numpy_vector_index(
+        NumpyVectorIndex([(museum, _unit(0, 1), None, None), (beach, _unit(1, 0), None, None)])
+    )
+    rows = [listing_card(museum, "Museum"), listing_card(beach, "Beach Bar")]
+    db = fake_session(
+        respond=lambda statement: [] if "listing_interests" in _sql(statement) else rows
+    )
+    db.objects[(UserTasteVector, user_id)] = taste
+
+    try:
+        cards = get_personalized_listings(db, user_id, limit=2)
+    finally:
+        set_numpy_vector_index(None)
+
+    assert [card["title"] for card in cards] == ["Beach Bar", "Museum"]
+    assert not any("user_interests" in sql for sql in db.sql())